@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from pydantic import BaseModel
 from typing import List, Optional
 from app.core.database import db
+from app.services.report_counters import fetch_claim_details, get_report_counters
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,58 +23,46 @@ class ReportedClaim(BaseModel):
 
 
 @router.get("/reported", response_model=List[ReportedClaim])
-async def get_reported_claims():
+async def get_reported_claims(
+    limit: int = Query(50, ge=1, le=200, description="Number of claims to return"),
+    offset: int = Query(0, ge=0, description="Claims to skip, for paging"),
+):
     """
-    Get list of claims reported by users.
+    Get list of claims reported by users, most reported first.
     Requires moderator or admin role.
+
+    The page of (claim, count) comes from the Redis report counters and is
+    hydrated with one batched claims lookup. Without the counters, reports
+    are counted and paged by the reported_claims RPC, so only the requested
+    page leaves the database either way.
     """
     try:
         client = db.get_client()
 
-        response = (
-            client.table("reports")
-            .select(
-                """
-                claim_id,
-                claims!inner(
-                    id,
-                    claim_text,
-                    claim_reports(cred_score, label)
-                )
-                """
-            )
-            .execute()
-        )
-
-        claim_counts = {}
-        for report in response.data:
-            claim_id = report["claim_id"]
-            if claim_id not in claim_counts:
-                claim = report.get("claims", {})
-                claim_report = claim.get("claim_reports", [{}])[0] if claim.get("claim_reports") else {}
-                claim_counts[claim_id] = {
-                    "id": claim_id,
-                    "claim_text": claim.get("claim_text", ""),
-                    "cred_score": claim_report.get("cred_score", 0),
-                    "label": claim_report.get("label", "unknown"),
-                    "count": 0,
-                }
-            claim_counts[claim_id]["count"] += 1
-
-        results = [
+        ranked = get_report_counters().top(limit, offset)
+        if ranked is None:
+            rows = client.rpc(
+                "reported_claims", {"page_size": limit, "page_offset": offset}
+            ).execute().data
+        else:
+            details = fetch_claim_details(client, [claim_id for claim_id, _ in ranked])
+            rows = [
+                {"id": claim_id, "report_count": count, **details[claim_id]}
+                for claim_id, count in ranked
+                if claim_id in details
+            ]
+
+        return [
             ReportedClaim(
-                id=data["id"],
-                claim_text=data["claim_text"],
-                report_count=data["count"],
-                cred_score=data["cred_score"],
-                label=data["label"],
+                id=row["id"],
+                claim_text=row["claim_text"],
+                report_count=row["report_count"],
+                cred_score=row.get("cred_score") or 0,
+                label=row.get("label") or "unknown",
             )
-            for data in claim_counts.values()
+            for row in rows
         ]
 
-        results.sort(key=lambda x: x.report_count, reverse=True)
-        return results
-
     except Exception as e:
         logger.error(f"Error fetching reported claims: {e}")
         raise HTTPException(
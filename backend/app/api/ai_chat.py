@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from typing import Optional, List
+from app.core.model_registry import ModelRegistry, get_model_registry
 from app.services.ai_chat import AIChatService
 import logging
 
@@ -27,14 +28,22 @@ class ChatResponse(BaseModel):
     chats_remaining: int
 
 
+def get_ai_chat_service(
+    registry: ModelRegistry = Depends(get_model_registry),
+) -> AIChatService:
+    return AIChatService(registry)
+
+
 @router.post("", response_model=ChatResponse)
-async def ai_chat(request: ChatRequest):
+async def ai_chat(
+    request: ChatRequest,
+    service: AIChatService = Depends(get_ai_chat_service),
+):
     """
     Ask AI questions based on verified information only.
     Rate-limited for free users.
     """
     try:
-        service = AIChatService()
         result = await service.process_chat(
             user_id=request.user_id,
             prompt=request.prompt,
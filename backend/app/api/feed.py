@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
+import base64
+import binascii
+import json
+import uuid
+from app.core.config import settings
 from app.core.database import db
+from app.services.feed_cache import FEED_NOT_MODIFIED, etag_matches, get_feed_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,14 +27,73 @@ class FeedItem(BaseModel):
     confidence: int
 
 
+FEED_COLUMNS = ",".join([*FeedItem.model_fields, "created_at"])
+
+
 class FeedResponse(BaseModel):
     items: List[FeedItem]
     cursor: Optional[str] = None
     total: int
 
 
+def encode_cursor(created_at: str, report_id: str) -> str:
+    """Opaque cursor for the feed position just after the given report"""
+    raw = json.dumps([created_at, report_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """(created_at, id) of the last report on the previous page, validated before it reaches a filter"""
+    try:
+        created_at, report_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        datetime.fromisoformat(created_at)
+        uuid.UUID(report_id)
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return created_at, report_id
+
+
+def fetch_feed_page(
+    topic: Optional[str], min_confidence: int, limit: int, position: Optional[Tuple[str, str]]
+) -> FeedResponse:
+    """One keyset page of feed_items, newest first"""
+    client = db.get_client()
+
+    query = (
+        client.table("feed_items")
+        .select(FEED_COLUMNS)
+        .gte("cred_score", min_confidence)
+    )
+
+    if topic:
+        query = query.eq("category", topic)
+
+    if position:
+        created_at, report_id = position
+        query = query.or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.lt.{report_id})'
+        )
+
+    response = (
+        query.order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(limit + 1)
+        .execute()
+    )
+
+    rows = response.data[:limit]
+    next_cursor = None
+    if len(response.data) > limit:
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+    items = [FeedItem(**row) for row in rows]
+    return FeedResponse(items=items, cursor=next_cursor, total=len(items))
+
+
 @router.get("", response_model=FeedResponse)
 async def get_feed(
+    request: Request,
     topic: Optional[str] = Query(None, description="Filter by topic/category"),
     min_confidence: int = Query(70, ge=0, le=100, description="Minimum confidence score"),
     limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
@@ -38,70 +103,31 @@ async def get_feed(
     Get verified news feed with optional filtering.
 
     Returns news items with credibility scores, sources, and metadata.
-    Items are sorted by published date (newest first) and filtered by confidence.
+    Items are sorted by report time (newest first) and filtered by confidence.
+    Pages are keyset-paginated on (created_at, id): pass the returned cursor
+    to fetch the next page; it is None on the last page. Rows come from the
+    feed_items read model, so each page is one index range scan.
+
+    Serialised pages are cached until claim reports are next written.
+    Responses carry an ETag; send it back in If-None-Match to get an empty
+    304 while the page is unchanged.
     """
-    try:
-        client = db.get_client()
-
-        query = (
-            client.table("claim_reports")
-            .select(
-                """
-                id,
-                cred_score,
-                label,
-                explain_text,
-                created_at,
-                claims!inner(
-                    id,
-                    claim_text,
-                    raw_items!inner(
-                        id,
-                        title,
-                        url,
-                        published_at,
-                        sources!inner(
-                            name,
-                            domain
-                        )
-                    )
-                )
-                """
-            )
-            .gte("cred_score", min_confidence)
-            .order("created_at", desc=True)
-            .limit(limit)
-        )
+    position = decode_cursor(cursor) if cursor else None
 
-        if topic:
-            pass
-
-        response = query.execute()
-
-        items = []
-        for report in response.data:
-            claim = report.get("claims", {})
-            raw_item = claim.get("raw_items", {})
-            source = raw_item.get("sources", {})
-
-            items.append(FeedItem(
-                id=report["id"],
-                title=raw_item.get("title", "Untitled"),
-                summary=claim.get("claim_text", "")[:200],
-                cred_score=report["cred_score"],
-                label=report["label"],
-                source=source.get("name", "Unknown"),
-                published_at=raw_item.get("published_at"),
-                category=topic or "General",
-                confidence=int(report["cred_score"]),
-            ))
-
-        return FeedResponse(
-            items=items,
-            cursor=None,
-            total=len(items),
-        )
+    feed_cache = get_feed_cache()
+    key = feed_cache.key(topic, min_confidence, limit, cursor)
+    page = feed_cache.get(key)
+    if page is None:
+        try:
+            feed_page = fetch_feed_page(topic, min_confidence, limit, position)
+        except Exception as e:
+            logger.error(f"Error fetching feed: {e}")
+            return FeedResponse(items=[], cursor=None, total=0)
+        page = feed_cache.set(key, feed_page.model_dump_json().encode())
 
-    except Exception as e:
-        logger.error(f"Error fetching feed: {e}")
-        return FeedResponse(items=[], cursor=None, total=0)
+    body, etag = page
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.FEED_CACHE_MAX_AGE}"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        FEED_NOT_MODIFIED.inc()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, Request, status
 from pydantic import BaseModel
+from typing import Any, Dict
 from app.core.config import settings
 from app.core.database import db
+from app.core.model_registry import ModelRegistry, get_model_registry
 import redis
 from datetime import datetime
 
@@ -15,10 +17,11 @@ class HealthResponse(BaseModel):
     demo_mode: bool
     database: str
     cache: str
+    models: Dict[str, str]
 
 
 @router.get("/health", response_model=HealthResponse, status_code=status.HTTP_200_OK)
-async def health_check():
+async def health_check(request: Request):
     db_status = "ok"
     try:
         client = db.get_client()
@@ -33,6 +36,13 @@ async def health_check():
     except Exception as e:
         cache_status = f"error: {str(e)}"
 
+    registry = getattr(request.app.state, "model_registry", None)
+    models = {}
+    if registry is not None:
+        models = {
+            name: info["state"] for name, info in registry.status()["models"].items()
+        }
+
     return HealthResponse(
         status="healthy" if db_status == "ok" and cache_status == "ok" else "degraded",
         timestamp=datetime.utcnow(),
@@ -40,4 +50,13 @@ async def health_check():
         demo_mode=settings.DEMO_MODE,
         database=db_status,
         cache=cache_status,
+        models=models,
     )
+
+
+@router.get("/health/models", status_code=status.HTTP_200_OK)
+async def model_status(
+    registry: ModelRegistry = Depends(get_model_registry),
+) -> Dict[str, Any]:
+    """Load state, load time and memory use of shared ML models"""
+    return registry.status()
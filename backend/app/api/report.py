@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
+from app.core.auth import get_current_user_id
+from app.core.database import db
+from app.services.report_counters import get_report_counters
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+class ReportRequest(BaseModel):
+    claim_id: str
+    reason: str
+
+
+class ReportResponse(BaseModel):
+    status: str
+    message: str
+
+
+@router.post("", response_model=ReportResponse, status_code=status.HTTP_201_CREATED)
+async def report_claim(request: ReportRequest, user_id: str = Depends(get_current_user_id)):
+    """
+    Report a claim for moderator review.
+
+    Requires a Supabase access token; the reporter is the token's user, not
+    anything in the body. The report is stored with the service client and
+    counted in the moderation queue's Redis sorted set.
+    """
+    if not request.reason.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A reason is required"
+        )
+
+    try:
+        client = db.get_service_client()
+        client.table("reports").insert({
+            "claim_id": request.claim_id,
+            "user_id": user_id,
+            "reason": request.reason,
+        }).execute()
+    except Exception as e:
+        logger.error(f"Error storing report: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to report claim"
+        )
+
+    get_report_counters().increment(request.claim_id)
+    return ReportResponse(status="success", message="Claim reported")
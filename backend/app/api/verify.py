@@ -1,6 +1,11 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, HttpUrl
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
+import json
+from app.core.cache import get_redis
+from app.core.config import settings
+from app.core.model_registry import ModelRegistry, get_model_registry
 from app.services.verification import VerificationService
 import logging
 
@@ -18,9 +23,15 @@ class EvidenceItem(BaseModel):
     source: str
     stance: str
     nli_conf: float
+    nli_tier: Optional[str] = None
     url: Optional[str] = None
 
 
+class NearDuplicateMatch(BaseModel):
+    claim_id: str
+    similarity: float
+
+
 class ClaimResult(BaseModel):
     id: str
     claim_text: str
@@ -28,6 +39,7 @@ class ClaimResult(BaseModel):
     label: str
     explain_text: str
     evidence: List[EvidenceItem]
+    near_duplicate_of: Optional[NearDuplicateMatch] = None
 
 
 class VerifyResponse(BaseModel):
@@ -36,22 +48,57 @@ class VerifyResponse(BaseModel):
     checked_sources: int
 
 
-@router.post("", response_model=VerifyResponse)
-async def verify_content(request: VerifyRequest):
-    """
-    Verify a URL or text content for factual claims.
+class BatchVerifyRequest(BaseModel):
+    documents: List[VerifyRequest]
 
-    Returns credibility scores, evidence, and explanations for detected claims.
-    """
+
+class DocumentResult(BaseModel):
+    claims: List[ClaimResult]
+    checked_sources: int
+
+
+class BatchVerifyResponse(BaseModel):
+    results: Dict[str, DocumentResult]
+    unique_claims: int
+    processing_time: float
+
+
+def _require_content(request: VerifyRequest):
     if not request.url and not request.text:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Either 'url' or 'text' must be provided"
         )
 
-    try:
-        service = VerificationService()
 
+def _encode_frame(frame: Dict[str, Any], sse: bool) -> str:
+    if frame["type"] == "claim":
+        frame = dict(frame, claim=ClaimResult(**frame["claim"]).model_dump())
+    if sse:
+        return f"event: {frame['type']}\ndata: {json.dumps(frame)}\n\n"
+    return json.dumps(frame) + "\n"
+
+
+def get_verification_service(
+    registry: ModelRegistry = Depends(get_model_registry),
+    redis_client=Depends(get_redis),
+) -> VerificationService:
+    return VerificationService(registry, redis_client=redis_client)
+
+
+@router.post("", response_model=VerifyResponse)
+async def verify_content(
+    request: VerifyRequest,
+    service: VerificationService = Depends(get_verification_service),
+):
+    """
+    Verify a URL or text content for factual claims.
+
+    Returns credibility scores, evidence, and explanations for detected claims.
+    """
+    _require_content(request)
+
+    try:
         if request.url:
             result = await service.verify_url(str(request.url))
         else:
@@ -65,3 +112,84 @@ async def verify_content(request: VerifyRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Verification failed: {str(e)}"
         )
+
+
+@router.post("/stream")
+async def verify_content_stream(
+    request: VerifyRequest,
+    accept: Optional[str] = Header(None),
+    service: VerificationService = Depends(get_verification_service),
+):
+    """
+    Streaming variant of /verify.
+
+    Emits a `claims` frame with the extracted claims, a `claim` frame with
+    each ClaimResult as soon as it is verified, then a `summary` frame with
+    processing_time and checked_sources. Responds with Server-Sent Events
+    when the client accepts text/event-stream, NDJSON otherwise.
+    """
+    _require_content(request)
+    sse = "text/event-stream" in (accept or "")
+
+    if request.url:
+        frames = service.verify_url_stream(str(request.url))
+    else:
+        frames = service.verify_text_stream(request.text)
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            async for frame in frames:
+                yield _encode_frame(frame, sse)
+        except Exception as e:
+            logger.error(f"Streaming verification error: {e}")
+            yield _encode_frame({"type": "error", "detail": f"Verification failed: {str(e)}"}, sse)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/batch", response_model=BatchVerifyResponse)
+async def verify_batch(
+    request: BatchVerifyRequest,
+    service: VerificationService = Depends(get_verification_service),
+):
+    """
+    Verify many URLs and/or texts in one call.
+
+    Claims repeated across documents are verified once. `results` is keyed
+    by each document's position in the request.
+    """
+    if not request.documents:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one document must be provided"
+        )
+    if len(request.documents) > settings.VERIFY_BATCH_MAX_DOCUMENTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.VERIFY_BATCH_MAX_DOCUMENTS} documents per batch"
+        )
+    for document in request.documents:
+        _require_content(document)
+
+    try:
+        result = await service.verify_batch([
+            {"url": str(document.url) if document.url else None, "text": document.text}
+            for document in request.documents
+        ])
+
+        return BatchVerifyResponse(
+            results={str(index): document for index, document in enumerate(result["results"])},
+            unique_claims=result["unique_claims"],
+            processing_time=result["processing_time"],
+        )
+
+    except Exception as e:
+        logger.error(f"Batch verification error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Verification failed: {str(e)}"
+        )
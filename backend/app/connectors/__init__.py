@@ -1,4 +1,13 @@
 from .newsapi_connector import NewsAPIConnector
-from .base import BaseConnector, ConnectorError
+from .base import BaseConnector, AsyncBaseConnector, ConnectorError
+from .http import HTTPClient, get_http_client, close_http_client
 
-__all__ = ["NewsAPIConnector", "BaseConnector", "ConnectorError"]
+__all__ = [
+    "NewsAPIConnector",
+    "BaseConnector",
+    "AsyncBaseConnector",
+    "ConnectorError",
+    "HTTPClient",
+    "get_http_client",
+    "close_http_client",
+]
@@ -1,16 +1,52 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+from datetime import date, datetime, timedelta
+import asyncio
 import hashlib
 import json
 import logging
+from prometheus_client import Counter, Gauge
 from tenacity import retry, stop_after_attempt, wait_exponential
 import httpx
 from app.core.config import settings
+from .http import get_http_client
 
 logger = logging.getLogger(__name__)
 
 
+CONNECTOR_CACHE_REQUESTS = Counter(
+    "truthverse_connector_cache_requests_total",
+    "Connector cache lookups",
+    ["connector", "result"],
+)
+CONNECTOR_CACHE_HIT_RATIO = Gauge(
+    "truthverse_connector_cache_hit_ratio",
+    "Share of connector cache lookups served from cache since start",
+    ["connector"],
+)
+CONNECTOR_COALESCED = Counter(
+    "truthverse_connector_coalesced_total",
+    "Connector calls that joined an identical in-flight upstream fetch",
+    ["connector"],
+)
+
+_cache_stats: Dict[str, List[int]] = {}
+
+
+def _record_cache_lookup(connector: str, hit: bool):
+    stats = _cache_stats.setdefault(connector, [0, 0])
+    stats[0] += int(hit)
+    stats[1] += 1
+    CONNECTOR_CACHE_REQUESTS.labels(connector=connector, result="hit" if hit else "miss").inc()
+    CONNECTOR_CACHE_HIT_RATIO.labels(connector=connector).set(stats[0] / stats[1])
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialise {type(value).__name__} for cache key")
+
+
 class ConnectorError(Exception):
     pass
 
@@ -23,23 +59,27 @@ class BaseConnector(ABC):
         self.disabled = False
 
     def _get_cache_key(self, method: str, **kwargs) -> str:
-        key_data = f"{self.__class__.__name__}:{method}:{json.dumps(kwargs, sort_keys=True)}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        arguments = json.dumps(kwargs, sort_keys=True, separators=(",", ":"), default=_json_default)
+        key_data = f"{self.__class__.__name__}:{method}:{arguments}"
+        return f"connector:{hashlib.md5(key_data.encode()).hexdigest()}"
 
-    def _get_cached(self, cache_key: str) -> Optional[Dict[str, Any]]:
+    def _get_cached(self, cache_key: str) -> Optional[Any]:
+        """Cached payload, or None on a miss; empty results are cached too"""
         if not self.cache_client:
             return None
+        cached = None
         try:
             cached = self.cache_client.get(cache_key)
-            if cached:
-                return json.loads(cached)
         except Exception as e:
             logger.warning(f"Cache get error: {e}")
-        return None
+        _record_cache_lookup(self.__class__.__name__, cached is not None)
+        return json.loads(cached) if cached is not None else None
 
     def _set_cache(self, cache_key: str, data: Any, ttl: int):
         if not self.cache_client:
             return
+        if not data:
+            ttl = min(ttl, settings.CACHE_TTL_NEGATIVE)
         try:
             self.cache_client.setex(cache_key, ttl, json.dumps(data))
         except Exception as e:
@@ -92,3 +132,72 @@ class BaseConnector(ABC):
     @abstractmethod
     def fetch_by_url(self, url: str) -> Optional[Dict[str, Any]]:
         pass
+
+
+class AsyncBaseConnector(BaseConnector):
+    """Async connector contract: fetches go through the shared pooled HTTP client"""
+
+    _inflight: Dict[str, "asyncio.Future"] = {}
+
+    def __init__(self, cache_client=None, http_client=None):
+        super().__init__(cache_client)
+        self._http_client = http_client
+
+    @property
+    def http(self):
+        if self._http_client is None:
+            return get_http_client()
+        return self._http_client
+
+    async def _get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self.http.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def _cached_fetch(
+        self, cache_key: str, ttl: int, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Serve from cache, or run `fetch` once for all identical concurrent calls
+
+        The shared fetch result (including an empty list) is written to cache.
+        """
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        inflight = AsyncBaseConnector._inflight.get(cache_key)
+        if inflight is not None:
+            CONNECTOR_COALESCED.labels(connector=self.__class__.__name__).inc()
+            return await asyncio.shield(inflight)
+
+        async def fetch_and_store():
+            data = await fetch()
+            self._set_cache(cache_key, data, ttl)
+            return data
+
+        task = asyncio.ensure_future(fetch_and_store())
+        AsyncBaseConnector._inflight[cache_key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if AsyncBaseConnector._inflight.get(cache_key) is task:
+                del AsyncBaseConnector._inflight[cache_key]
+
+    @abstractmethod
+    async def fetch_recent(self, window_days: int = 1, page: int = 1) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        query: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        page: int = 1,
+    ) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def fetch_by_url(self, url: str) -> Optional[Dict[str, Any]]:
+        pass
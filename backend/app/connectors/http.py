@@ -0,0 +1,96 @@
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import asyncio
+import httpx
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPClient:
+    """Long-lived pooled async HTTP client shared by connectors
+
+    Wraps one httpx.AsyncClient (keep-alive pool, HTTP/2 when `h2` is
+    installed, separate connect and read timeouts) and caps concurrent
+    requests per host so one slow vendor cannot take the whole pool.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_per_host: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        http2: Optional[bool] = None,
+    ):
+        http2 = settings.HTTP2_ENABLED if http2 is None else http2
+        if http2 and not _http2_available():
+            logger.warning("h2 package not installed, falling back to HTTP/1.1")
+            http2 = False
+
+        connect_timeout = connect_timeout or settings.HTTP_CONNECT_TIMEOUT
+        read_timeout = read_timeout or settings.HTTP_READ_TIMEOUT
+        max_connections = max_connections or settings.HTTP_MAX_CONNECTIONS
+
+        self.max_per_host = max_per_host or settings.HTTP_MAX_CONNECTIONS_PER_HOST
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                connect=connect_timeout,
+                read=read_timeout,
+                write=read_timeout,
+                pool=connect_timeout,
+            ),
+        )
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the shared pool, bounded per host"""
+        host = urlparse(url).netloc
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+
+        async with slots:
+            return await self.client.get(url, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    @property
+    def is_closed(self) -> bool:
+        return self.client.is_closed
+
+
+_shared_client: Optional[HTTPClient] = None
+
+
+def get_http_client() -> HTTPClient:
+    """Process-wide HTTP client, created on first use"""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = HTTPClient()
+        logger.info("Shared HTTP client initialized")
+    return _shared_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client; called on app shutdown"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
@@ -0,0 +1,45 @@
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+from .config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+bearer = HTTPBearer(auto_error=False)
+
+
+def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(bearer)) -> str:
+    """FastAPI dependency returning the user id from a Supabase access token"""
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not settings.SUPABASE_JWT_SECRET:
+        logger.error("SUPABASE_JWT_SECRET is not configured")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is not configured",
+        )
+
+    try:
+        claims = jwt.decode(
+            credentials.credentials,
+            settings.SUPABASE_JWT_SECRET,
+            algorithms=[settings.JWT_ALGORITHM],
+            audience="authenticated",
+        )
+    except JWTError as e:
+        logger.info(f"Rejected access token: {e}")
+        claims = {}
+
+    user_id = claims.get("sub")
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid access token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user_id
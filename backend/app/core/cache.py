@@ -0,0 +1,76 @@
+from typing import Any, Callable, Optional
+from fastapi import Request
+import time
+import redis
+from .config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Cache:
+    _pool: Optional[redis.ConnectionPool] = None
+    _client: Optional[redis.Redis] = None
+
+    @classmethod
+    def get_client(cls) -> redis.Redis:
+        if cls._client is None:
+            cls._pool = redis.ConnectionPool.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=1.0,
+                socket_timeout=1.0,
+            )
+            cls._client = redis.Redis(connection_pool=cls._pool)
+            logger.info("Redis connection pool initialized")
+        return cls._client
+
+    @classmethod
+    def close(cls):
+        if cls._pool is not None:
+            cls._pool.disconnect()
+        cls._pool = None
+        cls._client = None
+
+
+cache = Cache()
+
+
+class RedisTier:
+    """Optional Redis client for a cache tier whose calls fail soft
+
+    A failing call is logged and returns the caller's default, and the tier
+    is then skipped for RETRY_AFTER seconds so an outage does not add a
+    socket timeout to every request.
+    """
+
+    RETRY_AFTER = 30.0
+
+    def __init__(self, client: Optional[redis.Redis], name: str):
+        self.client = client
+        self.name = name
+        self._retry_at = 0.0
+
+    def call(self, operation: str, fn: Callable[[redis.Redis], Any], default: Any = None) -> Any:
+        """Run `fn` with the client, or return `default` if it fails or the tier is skipped"""
+        if self.client is None or time.monotonic() < self._retry_at:
+            return default
+        try:
+            return fn(self.client)
+        except Exception as e:
+            logger.warning(f"{self.name} {operation} error: {e}")
+            self._retry_at = time.monotonic() + self.RETRY_AFTER
+            return default
+
+
+def optional_redis_client(purpose: str) -> Optional[redis.Redis]:
+    """The shared Redis client, or None (logged) if it cannot be created"""
+    try:
+        return cache.get_client()
+    except Exception as e:
+        logger.warning(f"Redis unavailable for {purpose}: {e}")
+        return None
+
+
+def get_redis(request: Request) -> Optional[redis.Redis]:
+    """FastAPI dependency returning the Redis client opened at startup"""
+    return getattr(request.app.state, "redis", None)
@@ -16,6 +16,7 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
     SUPABASE_SERVICE_KEY: str = ""
+    SUPABASE_JWT_SECRET: str = ""
     DATABASE_URL: str = "sqlite:///./truthverse.db"
 
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -24,6 +25,25 @@ class Settings(BaseSettings):
     ES_INDEX_NAME: str = "truthverse_snippets"
     USE_FTS_FALLBACK: bool = True
 
+    RETRIEVAL_FUSION: str = "rrf"
+    RETRIEVAL_RRF_K: int = 60
+    RETRIEVAL_DENSE_WEIGHT: float = 0.5
+    RETRIEVAL_LEXICAL_CANDIDATES: int = 50
+    RETRIEVAL_DENSE_CANDIDATES: int = 50
+
+    LOCAL_BM25_INDEX_DIR: str = "./data/bm25_index"
+    LOCAL_BM25_SEED_FILE: str = "./scripts/demo_snippets.jsonl"
+
+    DENSE_INDEX_DIR: str = "./data/dense_index"
+    DENSE_NPROBE: int = 16
+    EMBEDDING_BATCH_SIZE: int = 64
+
+    NEAR_DUP_INDEX_DIR: str = "./data/near_dup_index"
+    NEAR_DUP_THRESHOLD: float = 0.8
+    NEAR_DUP_NUM_PERM: int = 64
+    NEAR_DUP_BANDS: int = 16
+    NEAR_DUP_INDEX_INTERVAL_SECONDS: int = 600
+
     NEWSAPI_KEY: Optional[str] = None
     NEWSCATCHER_KEY: Optional[str] = None
     MEDIASTACK_KEY: Optional[str] = None
@@ -32,17 +52,57 @@ class Settings(BaseSettings):
     OPENFDA_KEY: Optional[str] = None
     NCBI_KEY: Optional[str] = None
 
+    HTTP2_ENABLED: bool = True
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 15.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+
     HF_API_KEY: Optional[str] = None
     USE_HF_INFERENCE: bool = False
 
-    CLAIM_DETECTOR_MODEL: str = "microsoft/deberta-v3-small"
+    CLAIM_DETECTOR_MODEL: Optional[str] = None
     EMBEDDING_MODEL: str = "sentence-transformers/all-mpnet-base-v2"
     NLI_MODEL: str = "facebook/bart-large-mnli"
     EXPLANATION_MODEL: str = "google/flan-t5-base"
 
+    PRELOAD_MODELS: bool = True
+    VERIFY_EXECUTOR_WORKERS: int = 4
+    VERIFY_MAX_CLAIMS_IN_FLIGHT: int = 3
+    VERIFY_BATCH_MAX_DOCUMENTS: int = 200
+    NLI_BATCH_SIZE: int = 16
+    NLI_MAX_LENGTH: int = 512
+    NLI_BACKEND: str = "transformers"
+    NLI_ONNX_DIR: str = "./data/onnx_nli"
+    NLI_ONNX_INTRA_OP_THREADS: int = 0
+    NLI_ONNX_INTER_OP_THREADS: int = 1
+    NLI_SCHEDULER_ENABLED: bool = True
+    NLI_SCHEDULER_MAX_BATCH: int = 64
+    NLI_SCHEDULER_MAX_WAIT_MS: float = 5.0
+    NLI_FAST_MODEL: str = ""
+    NLI_CASCADE_SUPPORT_THRESHOLD: float = 0.9
+    NLI_CASCADE_NEUTRAL_THRESHOLD: float = 0.9
+    NLI_CASCADE_CONTRADICT_THRESHOLD: float = 0.95
+
+    CLAIM_RULE_ACCEPT_SCORE: float = 0.5
+    CLAIM_DETECTOR_THRESHOLD: float = 0.5
+    CLAIM_DETECTOR_POSITIVE_LABEL: str = "LABEL_1"
+    CLAIM_DETECTOR_BATCH_SIZE: int = 32
+
     CACHE_TTL_NEWS: int = 3600
     CACHE_TTL_FACTCHECK: int = 86400
     CACHE_TTL_VERIFY: int = 86400
+    CACHE_TTL_NEGATIVE: int = 300
+    VERIFY_CACHE_LOCAL_SIZE: int = 2048
+    VERIFY_CACHE_LOCK_TTL: int = 60
+    NLI_CACHE_LOCAL_SIZE: int = 50000
+    NLI_CACHE_TTL: int = 604800
+    NLI_CACHE_EVIDENCE_LOOKUP: bool = True
+    FEED_CACHE_TTL: int = 300
+    FEED_CACHE_LOCAL_SIZE: int = 1024
+    FEED_CACHE_VERSION_REFRESH: float = 1.0
+    FEED_CACHE_MAX_AGE: int = 15
 
     RATE_LIMIT_PUBLIC: int = 60
     RATE_LIMIT_VERIFY: int = 10
@@ -59,6 +119,12 @@ class Settings(BaseSettings):
 
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
+    CELERY_TASK_ALWAYS_EAGER: bool = False
+    INGEST_INTERVAL_SECONDS: int = 900
+    INGEST_MAX_PAGES: int = 3
+    INGEST_EMBED_BATCH_SIZE: int = 256
+    WORKER_METRICS_PORT: int = 9100
+    REPORT_COUNTS_RECONCILE_SECONDS: int = 300
 
     CORS_ORIGINS: str = "http://localhost:8080,http://localhost:3000"
 
@@ -69,6 +135,21 @@ class Settings(BaseSettings):
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def nli_model_id(self) -> str:
+        """NLI model name plus the backend and cascade settings that change its outputs"""
+        model_id = self.NLI_MODEL
+        if self.NLI_BACKEND == "onnx":
+            model_id = f"{model_id}@onnx-int8"
+        if self.NLI_FAST_MODEL:
+            thresholds = "/".join(str(t) for t in (
+                self.NLI_CASCADE_SUPPORT_THRESHOLD,
+                self.NLI_CASCADE_NEUTRAL_THRESHOLD,
+                self.NLI_CASCADE_CONTRADICT_THRESHOLD,
+            ))
+            model_id = f"{model_id}+cascade:{self.NLI_FAST_MODEL}@{thresholds}"
+        return model_id
+
     class Config:
         env_file = ".env"
         case_sensitive = True
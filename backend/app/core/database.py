@@ -8,6 +8,7 @@ logger = logging.getLogger(__name__)
 
 class Database:
     _client: Optional[Client] = None
+    _service_client: Optional[Client] = None
 
     @classmethod
     def get_client(cls) -> Client:
@@ -20,9 +21,12 @@ class Database:
 
     @classmethod
     def get_service_client(cls) -> Client:
-        if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_KEY:
-            raise ValueError("Supabase service credentials not configured")
-        return create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
+        if cls._service_client is None:
+            if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_KEY:
+                raise ValueError("Supabase service credentials not configured")
+            cls._service_client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
+            logger.info("Supabase service client initialized")
+        return cls._service_client
 
 
 db = Database()
@@ -0,0 +1,138 @@
+from typing import Any, Callable, Dict, Optional
+import resource
+import threading
+import time
+from fastapi import Request
+from prometheus_client import Gauge
+from .config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+MODEL_MEMORY_BYTES = Gauge(
+    "truthverse_model_memory_bytes",
+    "Parameter memory held by a loaded model",
+    ["model"],
+)
+MODEL_LOAD_SECONDS = Gauge(
+    "truthverse_model_load_seconds",
+    "Time spent loading a model",
+    ["model"],
+)
+
+
+def _load_nli() -> Optional[Any]:
+    if settings.USE_HF_INFERENCE:
+        logger.info("Using HuggingFace Inference API for NLI")
+        return None
+    if settings.NLI_BACKEND == "onnx":
+        from app.services.onnx_nli import load_onnx_nli
+        try:
+            return load_onnx_nli()
+        except Exception as e:
+            logger.warning(f"ONNX NLI backend unavailable, using transformers: {e}")
+    from transformers import pipeline
+    return pipeline("text-classification", model=settings.NLI_MODEL, device=-1)
+
+
+def _load_nli_fast() -> Any:
+    from transformers import pipeline
+    return pipeline("text-classification", model=settings.NLI_FAST_MODEL, device=-1)
+
+
+def _load_embedding() -> Any:
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(settings.EMBEDDING_MODEL, device="cpu")
+
+
+def _load_claim_detector() -> Any:
+    from transformers import pipeline
+    return pipeline("text-classification", model=settings.CLAIM_DETECTOR_MODEL, device=-1)
+
+
+class ModelRegistry:
+    """Process-wide holder for ML models, loaded once and shared by all requests"""
+
+    def __init__(self, loaders: Optional[Dict[str, Callable[[], Any]]] = None):
+        if loaders is None:
+            loaders = {
+                "nli": _load_nli,
+                "embedding": _load_embedding,
+            }
+            if settings.CLAIM_DETECTOR_MODEL:
+                loaders["claim_detector"] = _load_claim_detector
+            if settings.NLI_FAST_MODEL:
+                loaders["nli_fast"] = _load_nli_fast
+        self._loaders = loaders
+        self._models: Dict[str, Any] = {}
+        self._status: Dict[str, Dict[str, Any]] = {
+            name: {"state": "not_loaded"} for name in self._loaders
+        }
+        self._lock = threading.Lock()
+
+    def load_all(self):
+        """Load every registered model; failures are recorded, not raised"""
+        for name in self._loaders:
+            self.load(name)
+
+    def load(self, name: str) -> Optional[Any]:
+        """Load a model if it has not been attempted yet"""
+        with self._lock:
+            if self._status[name]["state"] in ("loaded", "failed"):
+                return self._models.get(name)
+
+            logger.info(f"Loading model: {name}")
+            start = time.time()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                logger.warning(f"Failed to load model {name}: {e}")
+                self._status[name] = {"state": "failed", "error": str(e)}
+                return None
+
+            load_time = time.time() - start
+            memory = self._estimate_memory(model)
+            self._models[name] = model
+            self._status[name] = {
+                "state": "loaded" if model is not None else "remote",
+                "load_time": round(load_time, 3),
+                "memory_bytes": memory,
+            }
+            MODEL_LOAD_SECONDS.labels(model=name).set(load_time)
+            MODEL_MEMORY_BYTES.labels(model=name).set(memory)
+            logger.info(f"Loaded model {name} in {load_time:.1f}s ({memory / 1e6:.0f} MB)")
+            return model
+
+    def get(self, name: str) -> Optional[Any]:
+        """Return a loaded model, loading it lazily on first use; None if unregistered"""
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            return None
+        return self.load(name)
+
+    def status(self) -> Dict[str, Any]:
+        """Load state and memory use of every model plus process peak RSS"""
+        return {
+            "models": {name: dict(info) for name, info in self._status.items()},
+            "process_max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        }
+
+    def _estimate_memory(self, model: Any) -> int:
+        """Sum parameter sizes of a torch-backed model or pipeline"""
+        model_bytes = getattr(model, "model_bytes", None)
+        if model_bytes is not None:
+            return model_bytes
+        module = getattr(model, "model", model)
+        parameters = getattr(module, "parameters", None)
+        if not callable(parameters):
+            return 0
+        try:
+            return sum(p.numel() * p.element_size() for p in parameters())
+        except Exception:
+            return 0
+
+
+def get_model_registry(request: Request) -> ModelRegistry:
+    """FastAPI dependency returning the registry created at startup"""
+    return request.app.state.model_registry
@@ -0,0 +1,33 @@
+from contextlib import contextmanager
+import os
+import numpy as np
+
+
+@contextmanager
+def replacing(path: str):
+    """Yield a temp path next to `path`, moved over it once the block succeeds
+
+    os.replace swaps the directory entry atomically, so readers open either
+    the old file or the complete new one, and processes that have the old
+    file memory-mapped keep reading its unchanged inode.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w"):
+    """open() whose contents replace `path` only once fully written"""
+    with replacing(path) as tmp_path, open(tmp_path, mode) as f:
+        yield f
+
+
+def save_array(path: str, array: np.ndarray):
+    """np.save that atomically replaces `path`"""
+    with atomic_open(path, "wb") as f:
+        np.save(f, array)
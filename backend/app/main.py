@@ -2,9 +2,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from prometheus_client import make_asgi_app
+import asyncio
 import logging
 from app.core.config import settings
-from app.api import health, feed, verify, admin, ai_chat
+from app.core.model_registry import ModelRegistry
+from app.core.cache import cache
+from app.services.verification import get_executor
+from app.services.nli import close_nli_schedulers
+from app.connectors.http import close_http_client
+from app.api import health, feed, verify, report, admin, ai_chat
 
 logging.basicConfig(
     level=logging.INFO if not settings.DEBUG else logging.DEBUG,
@@ -32,6 +38,7 @@ app.add_middleware(
 app.include_router(health.router, tags=["Health"])
 app.include_router(feed.router, prefix="/feed", tags=["Feed"])
 app.include_router(verify.router, prefix="/verify", tags=["Verification"])
+app.include_router(report.router, prefix="/report", tags=["Reports"])
 app.include_router(ai_chat.router, prefix="/ai_chat", tags=["AI Chat"])
 app.include_router(admin.router, prefix="/admin", tags=["Admin"])
 
@@ -46,10 +53,23 @@ async def startup_event():
     if settings.DEMO_MODE:
         logger.warning("Running in DEMO MODE - using seeded data only")
 
+    app.state.redis = cache.get_client()
+    app.state.model_registry = ModelRegistry()
+    if settings.PRELOAD_MODELS:
+        await asyncio.get_running_loop().run_in_executor(
+            None, app.state.model_registry.load_all
+        )
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down application")
+    await close_nli_schedulers()
+    if get_executor.cache_info().currsize:
+        get_executor().shutdown(wait=False)
+        get_executor.cache_clear()
+    await close_http_client()
+    cache.close()
 
 
 @app.exception_handler(Exception)
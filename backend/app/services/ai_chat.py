@@ -10,8 +10,8 @@ logger = logging.getLogger(__name__)
 class AIChatService:
     """AI chat service using verified information only"""
 
-    def __init__(self):
-        self.retriever = HybridRetriever()
+    def __init__(self, registry=None):
+        self.retriever = HybridRetriever(registry)
 
     async def process_chat(
         self, user_id: str, prompt: str, max_tokens: int = 500
@@ -0,0 +1,258 @@
+from typing import Any, Dict, Iterable, List, Optional
+from collections import Counter, defaultdict
+from functools import lru_cache
+import json
+import math
+import mmap
+import os
+import re
+import numpy as np
+from app.core.config import settings
+from app.core.storage import atomic_open, save_array
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords"""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """In-process BM25 inverted index over snippets
+
+    Postings live in flat numpy arrays (CSR layout: per-term offsets into
+    parallel doc-id and term-frequency arrays) that are memory-mapped from
+    disk. Appended documents go to an in-memory delta segment that is
+    searched alongside the base arrays and merged into them on save().
+    """
+
+    META_FILE = "meta.json"
+    OFFSETS_FILE = "offsets.npy"
+    DOC_IDS_FILE = "postings_docs.npy"
+    TFS_FILE = "postings_tfs.npy"
+    LENGTHS_FILE = "doc_lengths.npy"
+    DOCS_FILE = "docs.jsonl"
+    DOC_OFFSETS_FILE = "doc_offsets.npy"
+
+    def __init__(self, index_dir: Optional[str] = None, k1: float = 1.2, b: float = 0.75):
+        self.index_dir = index_dir
+        self.k1 = k1
+        self.b = b
+
+        self.vocab: Dict[str, int] = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.postings_docs = np.zeros(0, dtype=np.int32)
+        self.postings_tfs = np.zeros(0, dtype=np.uint16)
+        self.doc_lengths = np.zeros(0, dtype=np.int32)
+        self._docs_map: Optional[mmap.mmap] = None
+        self._doc_offsets = np.zeros(1, dtype=np.int64)
+
+        self._delta_postings: Dict[str, List[tuple]] = defaultdict(list)
+        self._delta_docs: List[Dict[str, Any]] = []
+        self._delta_lengths: List[int] = []
+        self._lengths_cache: Optional[np.ndarray] = None
+        self._snippet_lookup: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths) + len(self._delta_docs)
+
+    @property
+    def base_size(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, docs: Iterable[Dict[str, Any]]):
+        """Append snippet documents; they are searchable immediately"""
+        for doc in docs:
+            doc_id = len(self)
+            counts = Counter(tokenize(doc["sentence_text"]))
+            for term, tf in counts.items():
+                self._delta_postings[term].append((doc_id, min(tf, 65535)))
+            self._delta_docs.append(doc)
+            self._delta_lengths.append(sum(counts.values()))
+            if self._snippet_lookup is not None:
+                self._snippet_lookup[doc["snippet_id"]] = doc_id
+        self._lengths_cache = None
+
+    def search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """Return up to top_k documents ranked by BM25 with `bm25_score` set"""
+        n_docs = len(self)
+        terms = set(tokenize(query))
+        if not n_docs or not terms:
+            return []
+
+        lengths = self._all_lengths()
+        avgdl = float(lengths.mean()) or 1.0
+
+        id_parts, score_parts = [], []
+        for term in terms:
+            doc_ids, tfs = self._postings(term)
+            if not len(doc_ids):
+                continue
+            df = len(doc_ids)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            tfs = tfs.astype(np.float32)
+            norm = self.k1 * (1 - self.b + self.b * lengths[doc_ids] / avgdl)
+            id_parts.append(doc_ids)
+            score_parts.append(idf * tfs * (self.k1 + 1) / (tfs + norm))
+
+        if not id_parts:
+            return []
+
+        unique_ids, inverse = np.unique(np.concatenate(id_parts), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+
+        k = min(top_k, len(unique_ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        results = []
+        for position in top:
+            doc = dict(self.get(int(unique_ids[position])))
+            doc["bm25_score"] = float(scores[position])
+            results.append(doc)
+        return results
+
+    def get(self, doc_id: int) -> Dict[str, Any]:
+        """Stored snippet document for an internal doc id"""
+        if doc_id >= self.base_size:
+            return self._delta_docs[doc_id - self.base_size]
+        start, end = self._doc_offsets[doc_id], self._doc_offsets[doc_id + 1]
+        return json.loads(self._docs_map[start:end])
+
+    def get_by_snippet_id(self, snippet_id: str) -> Optional[Dict[str, Any]]:
+        """Stored snippet document by snippets.id"""
+        if self._snippet_lookup is None:
+            self._snippet_lookup = {self.get(i)["snippet_id"]: i for i in range(len(self))}
+        doc_id = self._snippet_lookup.get(snippet_id)
+        return self.get(doc_id) if doc_id is not None else None
+
+    def save(self, index_dir: Optional[str] = None):
+        """Merge the delta segment into the base arrays and write them to disk"""
+        index_dir = index_dir or self.index_dir
+        os.makedirs(index_dir, exist_ok=True)
+
+        vocab = dict(self.vocab)
+        for term in self._delta_postings:
+            vocab.setdefault(term, len(vocab))
+
+        base_terms = np.repeat(
+            np.arange(len(self.offsets) - 1, dtype=np.int64), np.diff(self.offsets)
+        )
+        delta_terms, delta_docs, delta_tfs = [], [], []
+        for term, postings in self._delta_postings.items():
+            term_id = vocab[term]
+            for doc_id, tf in postings:
+                delta_terms.append(term_id)
+                delta_docs.append(doc_id)
+                delta_tfs.append(tf)
+
+        term_ids = np.concatenate([base_terms, np.asarray(delta_terms, dtype=np.int64)])
+        doc_ids = np.concatenate([self.postings_docs, np.asarray(delta_docs, dtype=np.int32)])
+        tfs = np.concatenate([self.postings_tfs, np.asarray(delta_tfs, dtype=np.uint16)])
+        order = np.lexsort((doc_ids, term_ids))
+
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(vocab)), out=offsets[1:])
+
+        save_array(os.path.join(index_dir, self.OFFSETS_FILE), offsets)
+        save_array(os.path.join(index_dir, self.DOC_IDS_FILE), doc_ids[order].astype(np.int32))
+        save_array(os.path.join(index_dir, self.TFS_FILE), tfs[order].astype(np.uint16))
+        save_array(os.path.join(index_dir, self.LENGTHS_FILE), self._all_lengths().astype(np.int32))
+        self._write_docs(index_dir)
+
+        with atomic_open(os.path.join(index_dir, self.META_FILE)) as f:
+            json.dump({"k1": self.k1, "b": self.b, "n_docs": len(self), "vocab": vocab}, f)
+
+        loaded = BM25Index.load(index_dir)
+        self.__dict__.update(loaded.__dict__)
+        logger.info(f"Saved BM25 index with {len(self)} docs and {len(vocab)} terms to {index_dir}")
+
+    @classmethod
+    def load(cls, index_dir: str) -> Optional["BM25Index"]:
+        """Load a saved index with postings and documents memory-mapped"""
+        meta_path = os.path.join(index_dir, cls.META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        index = cls(index_dir, k1=meta["k1"], b=meta["b"])
+        index.vocab = meta["vocab"]
+        index.offsets = np.load(os.path.join(index_dir, cls.OFFSETS_FILE), mmap_mode="r")
+        index.postings_docs = np.load(os.path.join(index_dir, cls.DOC_IDS_FILE), mmap_mode="r")
+        index.postings_tfs = np.load(os.path.join(index_dir, cls.TFS_FILE), mmap_mode="r")
+        index.doc_lengths = np.load(os.path.join(index_dir, cls.LENGTHS_FILE), mmap_mode="r")
+        index._doc_offsets = np.load(os.path.join(index_dir, cls.DOC_OFFSETS_FILE), mmap_mode="r")
+
+        with open(os.path.join(index_dir, cls.DOCS_FILE), "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                index._docs_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return index
+
+    @classmethod
+    def from_seed_file(cls, path: str, index_dir: Optional[str] = None) -> "BM25Index":
+        """Build an index from a JSONL file of snippet documents"""
+        index = cls(index_dir)
+        with open(path) as f:
+            index.add(json.loads(line) for line in f if line.strip())
+        return index
+
+    def _postings(self, term: str):
+        doc_ids = np.zeros(0, dtype=np.int32)
+        tfs = np.zeros(0, dtype=np.uint16)
+
+        term_id = self.vocab.get(term)
+        if term_id is not None:
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            doc_ids = self.postings_docs[start:end]
+            tfs = self.postings_tfs[start:end]
+
+        delta = self._delta_postings.get(term)
+        if delta:
+            delta_array = np.asarray(delta)
+            doc_ids = np.concatenate([doc_ids, delta_array[:, 0].astype(np.int32)])
+            tfs = np.concatenate([tfs, delta_array[:, 1].astype(np.uint16)])
+
+        return doc_ids, tfs
+
+    def _all_lengths(self) -> np.ndarray:
+        if self._lengths_cache is None:
+            self._lengths_cache = np.concatenate(
+                [self.doc_lengths, np.asarray(self._delta_lengths, dtype=np.int32)]
+            ).astype(np.float32)
+        return self._lengths_cache
+
+    def _write_docs(self, index_dir: str):
+        offsets = [0]
+        with atomic_open(os.path.join(index_dir, self.DOCS_FILE), "wb") as f:
+            for doc_id in range(len(self)):
+                line = json.dumps(self.get(doc_id)).encode() + b"\n"
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+        save_array(os.path.join(index_dir, self.DOC_OFFSETS_FILE), np.asarray(offsets, dtype=np.int64))
+
+
+@lru_cache()
+def get_local_bm25_index() -> Optional[BM25Index]:
+    """Process-wide local BM25 index, built from the seed file if none is saved"""
+    try:
+        index = BM25Index.load(settings.LOCAL_BM25_INDEX_DIR)
+        if index is None and settings.LOCAL_BM25_SEED_FILE and os.path.exists(settings.LOCAL_BM25_SEED_FILE):
+            logger.info(f"Building local BM25 index from {settings.LOCAL_BM25_SEED_FILE}")
+            index = BM25Index.from_seed_file(
+                settings.LOCAL_BM25_SEED_FILE, settings.LOCAL_BM25_INDEX_DIR
+            )
+        return index
+    except Exception as e:
+        logger.warning(f"Failed to load local BM25 index: {e}")
+        return None
@@ -1,66 +1,232 @@
 import re
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 import hashlib
+import os
+from prometheus_client import Counter
+from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Sentences are the maximal runs between [.!?] with surrounding whitespace
+# trimmed, so spans match `s.strip()` over `re.split(r'[.!?]+', text)`.
+SENTENCE_SPAN_RE = re.compile(r"[^.!?\s](?:[^.!?]*[^.!?\s])?")
+
+# All claim rules in one pattern, matched against the original text. Keyword
+# alternatives are ASCII case-insensitive, which equals matching the
+# lowercased text; the entity names stay case-sensitive. Each named group is
+# one kind of cue, weighted by RULE_WEIGHTS for check-worthiness.
+CLAIM_RE = re.compile(
+    r"(?P<statistic>\b\d+%|\b\d+\s+(?ai:percent|million|billion|thousand))"
+    r"|\b(?:(?P<evidence>(?ai:proven|shows|demonstrates|reveals|indicates|suggests|found))"
+    r"|(?P<causal>(?ai:increases|decreases|reduces|improves|causes|prevents))"
+    r"|(?P<attribution>(?ai:according[ \n]to|study|research|report|data)))\b"
+    r"|(?P<entity>COVID|WHO|FDA|UN)"
+)
+
+RULE_WEIGHTS = {
+    "statistic": 0.5,
+    "evidence": 0.3,
+    "causal": 0.3,
+    "attribution": 0.2,
+    "entity": 0.2,
+}
+
+CLAIM_DECISIONS = Counter(
+    "truthverse_claim_cascade_total",
+    "Candidate sentences by the cascade stage that decided them",
+    ["decision"],
+)
+
+# The one character whose lowercase form is two characters long; spans
+# containing it are matched on their expanded form to keep offsets exact.
+_EXPANDING_CHAR = "İ"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_DIGITS_RE = re.compile(r"\d+")
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+MIN_SENTENCE_LENGTH = 20
+BULK_INLINE_THRESHOLD = 1_000_000
+
 
 class ClaimExtractor:
-    """Extract factual claims from text using rule-based and pattern matching"""
+    """Extract factual claims from text using rule-based and pattern matching
 
-    def __init__(self):
-        self.claim_patterns = [
-            r'\b\d+%',
-            r'\b\d+\s+(percent|million|billion|thousand)',
-            r'\b(proven|shows|demonstrates|reveals|indicates|suggests|found)\b',
-            r'\b(increases|decreases|reduces|improves|causes|prevents)\b',
-            r'\b(according to|study|research|report|data)\b',
-        ]
+    extract_claims applies the rules alone. rank_claims runs the cascade:
+    sentences whose rule score reaches CLAIM_RULE_ACCEPT_SCORE are kept,
+    sentences with no cue are dropped, and only the ones in between are
+    sent, in batches, to the claim detector model from `registry`.
+    """
+
+    def __init__(self, registry=None):
+        self.matcher = CLAIM_RE
+        self.registry = registry
 
     def extract_claims(self, text: str, max_claims: int = 10) -> List[str]:
         """Extract potential claims from text"""
-        sentences = self._split_sentences(text)
         claims = []
 
-        for sentence in sentences:
-            if self._is_potential_claim(sentence):
-                canonical = self._canonicalize(sentence)
-                claims.append(canonical)
+        for start, end in self.iter_claim_spans(text):
+            claims.append(self._canonicalize(text[start:end]))
 
             if len(claims) >= max_claims:
                 break
 
         return claims
 
+    def extract_claims_bulk(
+        self,
+        docs: Sequence[str],
+        max_claims: int = 10,
+        processes: Optional[int] = None,
+    ) -> List[List[str]]:
+        """
+        Extract claims from many documents, in document order
+
+        Corpora larger than BULK_INLINE_THRESHOLD characters are spread over
+        a process pool; smaller ones run inline, where pool startup would
+        cost more than it saves.
+        """
+        processes = processes or os.cpu_count() or 1
+        if processes == 1 or sum(len(doc) for doc in docs) < BULK_INLINE_THRESHOLD:
+            return [self.extract_claims(doc, max_claims) for doc in docs]
+
+        chunksize = max(1, len(docs) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            return list(pool.map(
+                _extract_claims_worker, docs, [max_claims] * len(docs), chunksize=chunksize
+            ))
+
+    def rank_claims(self, text: str, max_claims: int = 10) -> List[Dict[str, Any]]:
+        """Claims in text ranked by check-worthiness, best first"""
+        return self.rank_claims_many([text], max_claims)[0]
+
+    def rank_claims_many(self, texts: Sequence[str], max_claims: int = 10) -> List[List[Dict[str, Any]]]:
+        """
+        Cascade claim detection over many texts, with one detector pass
+
+        Returns, per text, up to `max_claims` entries of ``claim_text``,
+        ``score`` (check-worthiness in [0, 1]) and ``stage`` (``rules`` or
+        ``detector``), sorted by score with ties kept in document order.
+        """
+        candidates: List[List[Dict[str, Any]]] = []
+        ambiguous: List[Dict[str, Any]] = []
+        for text in texts:
+            doc_candidates = []
+            for start, end in self.iter_sentence_spans(text):
+                sentence = text[start:end]
+                score = self.rule_score(sentence)
+                if score <= 0:
+                    CLAIM_DECISIONS.labels(decision="rule_reject").inc()
+                    continue
+                candidate = {"claim_text": self._canonicalize(sentence), "score": score, "stage": "rules"}
+                if score >= settings.CLAIM_RULE_ACCEPT_SCORE:
+                    CLAIM_DECISIONS.labels(decision="rule_accept").inc()
+                else:
+                    candidate["sentence"] = sentence
+                    ambiguous.append(candidate)
+                doc_candidates.append(candidate)
+            candidates.append(doc_candidates)
+
+        rejected = set()
+        detector_scores = self._detect(ambiguous) if ambiguous else None
+        if ambiguous and detector_scores is None:
+            CLAIM_DECISIONS.labels(decision="detector_unavailable").inc(len(ambiguous))
+        for candidate, detector_score in zip(ambiguous, detector_scores or []):
+            if detector_score >= settings.CLAIM_DETECTOR_THRESHOLD:
+                CLAIM_DECISIONS.labels(decision="detector_accept").inc()
+                candidate.update(score=detector_score, stage="detector")
+            else:
+                CLAIM_DECISIONS.labels(decision="detector_reject").inc()
+                rejected.add(id(candidate))
+
+        ranked = []
+        for doc_candidates in candidates:
+            kept = [
+                {key: c[key] for key in ("claim_text", "score", "stage")}
+                for c in doc_candidates if id(c) not in rejected
+            ]
+            kept.sort(key=lambda c: c["score"], reverse=True)
+            ranked.append(kept[:max_claims])
+        return ranked
+
+    def rule_score(self, sentence: str) -> float:
+        """Check-worthiness from the distinct kinds of rule cues in a sentence"""
+        if _EXPANDING_CHAR in sentence:
+            sentence = sentence.replace(_EXPANDING_CHAR, _EXPANDING_CHAR.lower())
+        cues = {match.lastgroup for match in self.matcher.finditer(sentence)}
+        return min(1.0, sum(RULE_WEIGHTS[cue] for cue in cues))
+
+    def _detect(self, candidates: List[Dict[str, Any]]) -> Optional[List[float]]:
+        """Positive-class probabilities from the claim detector, or None if unavailable"""
+        detector = self.registry.get("claim_detector") if self.registry else None
+        if detector is None:
+            return None
+
+        try:
+            outputs = detector(
+                [c["sentence"] for c in candidates],
+                batch_size=settings.CLAIM_DETECTOR_BATCH_SIZE,
+                truncation=True,
+                top_k=None,
+            )
+        except Exception as e:
+            logger.error(f"Claim detector error: {e}")
+            return None
+
+        scores = []
+        for output in outputs:
+            labels = output if isinstance(output, list) else [output]
+            scores.append(next(
+                (item["score"] for item in labels if item["label"] == settings.CLAIM_DETECTOR_POSITIVE_LABEL),
+                0.0,
+            ))
+        return scores
+
+    def iter_sentence_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Lazily yield (start, end) offsets of sentences long enough to check"""
+        for match in SENTENCE_SPAN_RE.finditer(text):
+            start, end = match.span()
+            if end - start > MIN_SENTENCE_LENGTH:
+                yield start, end
+
+    def iter_claim_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Lazily yield (start, end) offsets of sentences that look like claims"""
+        search = self.matcher.search
+        expanding = _EXPANDING_CHAR in text
+
+        for start, end in self.iter_sentence_spans(text):
+            if expanding:
+                if self._is_potential_claim(text[start:end]):
+                    yield start, end
+            elif search(text, start, end):
+                yield start, end
+
     def _split_sentences(self, text: str) -> List[str]:
         """Split text into sentences"""
-        text = text.replace('\n', ' ').strip()
-        sentences = re.split(r'[.!?]+', text)
-        return [s.strip() for s in sentences if len(s.strip()) > 20]
+        return [text[start:end].replace('\n', ' ') for start, end in self.iter_sentence_spans(text)]
 
     def _is_potential_claim(self, sentence: str) -> bool:
         """Check if sentence is likely to be a factual claim"""
-        sentence_lower = sentence.lower()
-
-        for pattern in self.claim_patterns:
-            if re.search(pattern, sentence_lower):
-                return True
-
-        if any(entity in sentence for entity in ['COVID', 'WHO', 'FDA', 'UN']):
-            return True
-
-        return False
+        if _EXPANDING_CHAR in sentence:
+            sentence = sentence.replace(_EXPANDING_CHAR, _EXPANDING_CHAR.lower())
+        return self.matcher.search(sentence) is not None
 
     def _canonicalize(self, text: str) -> str:
         """Normalize text for deduplication"""
         text = text.lower().strip()
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         return text
 
     def compute_canonical_hash(self, text: str) -> str:
         """Compute hash for claim deduplication"""
         canonical = self._canonicalize(text)
-        canonical = re.sub(r'\d+', '#NUM#', canonical)
-        canonical = re.sub(r'[^\w\s]', '', canonical)
+        canonical = _DIGITS_RE.sub('#NUM#', canonical)
+        canonical = _PUNCTUATION_RE.sub('', canonical)
         return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _extract_claims_worker(doc: str, max_claims: int) -> List[str]:
+    return ClaimExtractor().extract_claims(doc, max_claims)
@@ -0,0 +1,182 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import os
+import math
+import threading
+import faiss
+import numpy as np
+from app.core.config import settings
+from app.core.storage import replacing, save_array
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DenseIndex:
+    """On-disk FAISS index of snippet embeddings
+
+    Vectors are L2-normalised so inner product equals cosine similarity.
+    FAISS ids are positions in a parallel array of snippet UUIDs stored next
+    to the index, and both files are memory-mapped on load.
+    """
+
+    INDEX_FILE = "snippets.faiss"
+    IDS_FILE = "snippet_ids.npy"
+    IVF_MIN_VECTORS = 10_000
+
+    def __init__(
+        self,
+        index: faiss.Index,
+        snippet_ids: np.ndarray,
+        index_dir: str,
+        read_only: bool = False,
+    ):
+        self.index = index
+        self.snippet_ids = snippet_ids
+        self.index_dir = index_dir
+        self.read_only = read_only
+        self._apply_nprobe()
+
+    def __len__(self) -> int:
+        return int(self.index.ntotal)
+
+    @classmethod
+    def build(
+        cls, index_dir: str, snippet_ids: Sequence[str], vectors: np.ndarray
+    ) -> "DenseIndex":
+        """Build a new index from snippet ids and their embeddings"""
+        vectors = cls._prepare(vectors)
+        n, dim = vectors.shape
+
+        if n >= cls.IVF_MIN_VECTORS:
+            nlist = int(4 * math.sqrt(n))
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            sample = vectors[np.random.default_rng(0).permutation(n)[: nlist * 64]]
+            index.train(sample)
+        else:
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+        index.add_with_ids(vectors, np.arange(n, dtype=np.int64))
+        dense_index = cls(index, np.asarray(snippet_ids, dtype="S36"), index_dir)
+        dense_index.save()
+        logger.info(f"Built dense index with {n} vectors ({type(index).__name__})")
+        return dense_index
+
+    @classmethod
+    def load(cls, index_dir: str, mmap: bool = True) -> Optional["DenseIndex"]:
+        """Load an index from disk, memory-mapped by default"""
+        index_path = os.path.join(index_dir, cls.INDEX_FILE)
+        ids_path = os.path.join(index_dir, cls.IDS_FILE)
+        if not os.path.exists(index_path) or not os.path.exists(ids_path):
+            return None
+
+        flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+        index = faiss.read_index(index_path, flags)
+        snippet_ids = np.load(ids_path, mmap_mode="r" if mmap else None)
+        logger.info(f"Loaded dense index with {index.ntotal} vectors from {index_dir}")
+        return cls(index, snippet_ids, index_dir, read_only=mmap)
+
+    def add(self, snippet_ids: Sequence[str], vectors: np.ndarray):
+        """Append vectors for new snippets and persist the index"""
+        if not len(snippet_ids):
+            return
+        vectors = self._prepare(vectors)
+        writable = DenseIndex.load(self.index_dir, mmap=False) if self.read_only else self
+
+        start = len(writable)
+        writable.index.add_with_ids(
+            vectors, np.arange(start, start + len(vectors), dtype=np.int64)
+        )
+        writable.snippet_ids = np.concatenate(
+            [np.asarray(writable.snippet_ids), np.asarray(snippet_ids, dtype="S36")]
+        )
+        writable.save()
+
+        self.index = writable.index
+        self.snippet_ids = writable.snippet_ids
+        self.read_only = False
+        self._apply_nprobe()
+
+    def positions(self, snippet_ids: Sequence[str]) -> Dict[str, int]:
+        """FAISS position of each of `snippet_ids` already in the index"""
+        found = np.flatnonzero(np.isin(self.snippet_ids, np.asarray(snippet_ids, dtype="S36")))
+        return {self.snippet_ids[position].decode(): int(position) for position in found}
+
+    def save(self):
+        """Atomically replace the id map, then the index
+
+        Ids go first: they only ever grow, so a reader that loads between the
+        two swaps still has an id for every vector in the older index.
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        save_array(os.path.join(self.index_dir, self.IDS_FILE), np.asarray(self.snippet_ids))
+        with replacing(os.path.join(self.index_dir, self.INDEX_FILE)) as tmp_path:
+            faiss.write_index(self.index, tmp_path)
+
+    def search(self, query_vectors: np.ndarray, top_k: int) -> List[List[Tuple[str, float]]]:
+        """Return (snippet_id, cosine similarity) hits for each query vector"""
+        if not len(self):
+            return [[] for _ in range(len(query_vectors))]
+
+        scores, ids = self.index.search(self._prepare(query_vectors), top_k)
+
+        results = []
+        for row_scores, row_ids in zip(scores, ids):
+            hits = []
+            for score, faiss_id in zip(row_scores, row_ids):
+                if faiss_id < 0:
+                    continue
+                hits.append((self.snippet_ids[faiss_id].decode(), float(score)))
+            results.append(hits)
+        return results
+
+    def vector_path(self, position: int) -> str:
+        """Locator stored in the embeddings table for a vector"""
+        return f"{os.path.join(self.index_dir, self.INDEX_FILE)}#{position}"
+
+    def _apply_nprobe(self):
+        if isinstance(self.index, faiss.IndexIVF):
+            self.index.nprobe = settings.DENSE_NPROBE
+
+    @staticmethod
+    def _prepare(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.array(np.atleast_2d(vectors), dtype=np.float32, order="C")
+        faiss.normalize_L2(vectors)
+        return vectors
+
+
+_index: Optional[DenseIndex] = None
+_index_mtime: Optional[float] = None
+_index_lock = threading.Lock()
+
+
+def get_dense_index() -> Optional[DenseIndex]:
+    """Process-wide index from DENSE_INDEX_DIR, reloaded when it is rewritten"""
+    global _index, _index_mtime
+    index_path = os.path.join(settings.DENSE_INDEX_DIR, DenseIndex.INDEX_FILE)
+    try:
+        mtime = os.stat(index_path).st_mtime
+    except OSError:
+        return None
+
+    if mtime != _index_mtime:
+        with _index_lock:
+            if mtime != _index_mtime:
+                try:
+                    _index = DenseIndex.load(settings.DENSE_INDEX_DIR)
+                except Exception as e:
+                    logger.warning(f"Failed to load dense index: {e}")
+                    _index = None
+                _index_mtime = mtime
+    return _index
+
+
+def encode_texts(model, texts: Sequence[str]) -> np.ndarray:
+    """Embed texts with a sentence-transformers model"""
+    return model.encode(
+        list(texts),
+        batch_size=settings.EMBEDDING_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    ).astype(np.float32)
@@ -0,0 +1,118 @@
+from typing import Optional, Tuple
+from functools import lru_cache
+import hashlib
+import json
+import time
+from prometheus_client import Counter
+from app.core.cache import RedisTier, optional_redis_client
+from app.core.config import settings
+from app.services.verify_cache import LocalLRU
+import logging
+
+logger = logging.getLogger(__name__)
+
+FEED_VERSION_KEY = "feed:version"
+
+FEED_CACHE_HITS = Counter(
+    "truthverse_feed_cache_hits_total",
+    "Feed pages served from cache",
+    ["tier"],
+)
+FEED_CACHE_MISSES = Counter(
+    "truthverse_feed_cache_misses_total",
+    "Feed pages that had to query the database",
+)
+FEED_NOT_MODIFIED = Counter(
+    "truthverse_feed_not_modified_total",
+    "Feed requests answered 304 from If-None-Match",
+)
+
+CachedPage = Tuple[bytes, str]
+
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag of a serialised response"""
+    return f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names `etag` (weak comparison, as for GET)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag.removeprefix("W/") for tag in candidates]
+
+
+class FeedCache:
+    """Two-tier (in-process LRU, then Redis) cache of serialised feed pages
+
+    Entries are the response bytes plus their ETag, keyed by the feed
+    version and the request's (topic, min_confidence, limit, cursor). The
+    version is a Redis counter, so a bump orphans every cached page at once;
+    processes re-read it at most every FEED_CACHE_VERSION_REFRESH seconds.
+    Only writers that call bump_feed_version (the seed and rebuild_feed
+    scripts) bump it: the feed_items trigger cannot reach Redis, so reports
+    written any other way, or any write without Redis, show up once pages
+    expire after FEED_CACHE_TTL.
+    """
+
+    def __init__(self, redis_client=None, local_size: Optional[int] = None, ttl: Optional[int] = None):
+        self.redis = RedisTier(redis_client, "Feed cache")
+        self.ttl = ttl or settings.FEED_CACHE_TTL
+        self.local = LocalLRU(local_size or settings.FEED_CACHE_LOCAL_SIZE, self.ttl)
+        self._remote_version = 0
+        self._local_version = 0
+        self._version_checked_at: Optional[float] = None
+
+    def version(self) -> str:
+        """Current feed version, from Redis at most every FEED_CACHE_VERSION_REFRESH seconds"""
+        now = time.monotonic()
+        if self._version_checked_at is None or now - self._version_checked_at >= settings.FEED_CACHE_VERSION_REFRESH:
+            self._remote_version = self.redis.call(
+                "version", lambda r: int(r.get(FEED_VERSION_KEY) or 0), default=self._remote_version
+            )
+            self._version_checked_at = now
+        return f"{self._remote_version}.{self._local_version}"
+
+    def bump_version(self):
+        """Invalidate every cached page, here and in every process sharing Redis"""
+        self._local_version += 1
+        self.redis.call("bump", lambda r: r.incr(FEED_VERSION_KEY))
+        self._version_checked_at = None
+
+    def key(self, topic: Optional[str], min_confidence: int, limit: int, cursor: Optional[str]) -> str:
+        params = json.dumps([topic, min_confidence, limit, cursor])
+        return f"feed:{self.version()}:{hashlib.sha1(params.encode()).hexdigest()}"
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        """Cached (body, etag) from the local tier, then Redis"""
+        page = self.local.get(key)
+        if page is not None:
+            FEED_CACHE_HITS.labels(tier="local").inc()
+            return page
+
+        body = self.redis.call("get", lambda r: r.get(key))
+        if body is None:
+            FEED_CACHE_MISSES.inc()
+            return None
+        FEED_CACHE_HITS.labels(tier="redis").inc()
+        page = (body, etag_for(body))
+        self.local.set(key, page)
+        return page
+
+    def set(self, key: str, body: bytes) -> CachedPage:
+        page = (body, etag_for(body))
+        self.local.set(key, page)
+        self.redis.call("set", lambda r: r.setex(key, self.ttl, body))
+        return page
+
+
+@lru_cache()
+def get_feed_cache() -> FeedCache:
+    """Process-wide feed response cache"""
+    return FeedCache(optional_redis_client("feed cache"))
+
+
+def bump_feed_version():
+    """Call after writing claim reports so cached feed pages are not served stale for FEED_CACHE_TTL"""
+    get_feed_cache().bump_version()
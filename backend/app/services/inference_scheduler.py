@@ -0,0 +1,161 @@
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+from prometheus_client import Gauge, Histogram
+import logging
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_QUEUE_DEPTH = Gauge(
+    "truthverse_inference_queue_depth",
+    "Items waiting for the next model batch",
+    ["model"],
+)
+INFERENCE_BATCH_SIZE = Histogram(
+    "truthverse_inference_batch_size",
+    "Items per model batch formed by the inference scheduler",
+    ["model"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+INFERENCE_QUEUE_DELAY = Histogram(
+    "truthverse_inference_queue_delay_seconds",
+    "Time an item waited in the scheduler queue before its batch started",
+    ["model"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+Pending = Tuple[Any, asyncio.Future, float]
+
+
+class InferenceScheduler:
+    """Micro-batches model calls across concurrent requests
+
+    Coroutines submit items and await their results. A collector task on the
+    event loop flushes queued items as one batch once `max_batch_size` items
+    are waiting or the oldest has waited `max_wait` seconds, runs `run_batch`
+    on a dedicated worker thread and resolves each caller's future. Items
+    arriving while a batch runs form the next one, so batches grow with load.
+    `run_batch` takes a list of items and returns one result per item.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int,
+        max_wait: float,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}-batch")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: "deque[Pending]" = deque()
+        self._has_items: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Result for one item"""
+        return (await self.submit_many([item]))[0]
+
+    async def submit_many(self, items: Sequence[Any]) -> List[Any]:
+        """Results for several items, in order; they may be split across batches"""
+        if not items:
+            return []
+        self._ensure_running()
+
+        enqueued = time.perf_counter()
+        futures = []
+        for item in items:
+            future = self._loop.create_future()
+            self._pending.append((item, future, enqueued))
+            futures.append(future)
+        self._signal()
+        return list(await asyncio.gather(*futures))
+
+    async def close(self):
+        """Stop the collector; queued callers get a cancellation"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._pending:
+            self._pending.popleft()[1].cancel()
+        INFERENCE_QUEUE_DEPTH.labels(model=self.name).set(0)
+
+    def _ensure_running(self):
+        """Start the collector on the running loop, rebinding if the loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        if self._loop is not loop:
+            self._pending = deque()
+            self._has_items = asyncio.Event()
+            self._full = asyncio.Event()
+            self._loop = loop
+        self._task = loop.create_task(self._collect())
+
+    def _signal(self):
+        INFERENCE_QUEUE_DEPTH.labels(model=self.name).set(len(self._pending))
+        if self._pending:
+            self._has_items.set()
+        else:
+            self._has_items.clear()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        else:
+            self._full.clear()
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._has_items.wait()
+            remaining = self._pending[0][2] + self.max_wait - time.perf_counter()
+            if remaining > 0 and not self._full.is_set():
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = [
+                self._pending.popleft()
+                for _ in range(min(self.max_batch_size, len(self._pending)))
+            ]
+            self._signal()
+            batch = [entry for entry in batch if not entry[1].done()]
+            if batch:
+                await self._dispatch(loop, batch)
+
+    async def _dispatch(self, loop: asyncio.AbstractEventLoop, batch: List[Pending]):
+        started = time.perf_counter()
+        INFERENCE_BATCH_SIZE.labels(model=self.name).observe(len(batch))
+        delay = INFERENCE_QUEUE_DELAY.labels(model=self.name)
+        for _, _, enqueued in batch:
+            delay.observe(started - enqueued)
+
+        try:
+            results = await loop.run_in_executor(self.executor, self.run_batch, [item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"{self.name} batch returned {len(results)} results for {len(batch)} items")
+        except asyncio.CancelledError:
+            for _, future, _ in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"{self.name} batch of {len(batch)} failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,278 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+from urllib.parse import urlparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from app.core.database import db
+import logging
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_RE = re.compile(r"\S.*?(?:[.!?]+(?=\s|$)|$)", re.DOTALL)
+
+
+def split_sentences(text: str, min_length: int = 20) -> Iterator[str]:
+    """Lazily yield sentences longer than `min_length` characters"""
+    for match in SENTENCE_RE.finditer(text):
+        sentence = " ".join(match.group().split())
+        if len(sentence) > min_length:
+            yield sentence
+
+
+def chunked(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class IngestionWriter:
+    """Batched, idempotent writes of normalised connector items
+
+    Sources are upserted by domain, raw_items by url and snippets by
+    (raw_item_id, sentence_idx), all ignoring duplicates, so replaying a
+    batch after a partial failure writes nothing twice.
+    """
+
+    def __init__(self, client=None, batch_size: int = 500):
+        self.client = client or db.get_service_client()
+        self.batch_size = batch_size
+
+    def existing_urls(self, urls: Iterable[str]) -> Set[str]:
+        """URLs already stored with their snippets"""
+        urls = list(dict.fromkeys(urls))
+        existing = set()
+        for batch in chunked(urls, self.batch_size):
+            response = (
+                self.client.table("raw_items")
+                .select("url, snippets(count)")
+                .in_("url", list(batch))
+                .execute()
+            )
+            for row in response.data:
+                counts = row.get("snippets") or [{}]
+                if counts[0].get("count", 0) > 0:
+                    existing.add(row["url"])
+        return existing
+
+    def upsert_sources(self, items: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+        """Ensure a sources row per domain; returns domain -> source id"""
+        rows = {}
+        for item in items:
+            rows.setdefault(item["source_domain"], {
+                "name": item["source_name"],
+                "domain": item["source_domain"],
+                "trust_score": item.get("trust_score", 0.5),
+            })
+        if not rows:
+            return {}
+
+        names = list(rows)
+        rows = list(rows.values())
+        for batch in chunked(rows, self.batch_size):
+            self.client.table("sources").upsert(
+                list(batch), on_conflict="domain", ignore_duplicates=True
+            ).execute()
+
+        source_ids = {}
+        for batch in chunked(names, self.batch_size):
+            response = (
+                self.client.table("sources").select("id, domain").in_("domain", list(batch)).execute()
+            )
+            source_ids.update({row["domain"]: row["id"] for row in response.data})
+        return source_ids
+
+    def write_items(self, items: List[Dict[str, Any]]) -> List[str]:
+        """Store new items with their sentence snippets; returns snippet ids"""
+        items = list({item["url"]: item for item in items if item.get("url")}.values())
+        existing = self.existing_urls(item["url"] for item in items)
+        items = [item for item in items if item["url"] not in existing]
+        if not items:
+            return []
+
+        source_ids = self.upsert_sources(items)
+        raw_rows = [
+            {
+                "source_id": source_ids[item["source_domain"]],
+                "url": item["url"],
+                "title": item["title"],
+                "body_text": item.get("body_text") or "",
+                "published_at": item.get("published_at"),
+                "category": item.get("category"),
+                "raw_json": item.get("raw_json"),
+            }
+            for item in items
+            if item["source_domain"] in source_ids
+        ]
+        for batch in chunked(raw_rows, self.batch_size):
+            self.client.table("raw_items").upsert(
+                list(batch), on_conflict="url", ignore_duplicates=True
+            ).execute()
+
+        raw_ids = self._raw_item_ids([row["url"] for row in raw_rows])
+        snippet_rows = []
+        for row in raw_rows:
+            text = f"{row['title']}. {row['body_text']}"
+            for idx, sentence in enumerate(split_sentences(text)):
+                snippet_rows.append({
+                    "raw_item_id": raw_ids[row["url"]],
+                    "sentence_text": sentence,
+                    "sentence_idx": idx,
+                })
+        self.write_snippets(snippet_rows)
+
+        return self._snippet_ids(list(raw_ids.values()))
+
+    def write_snippets(self, rows: List[Dict[str, Any]]):
+        for batch in chunked(rows, self.batch_size):
+            self.client.table("snippets").upsert(
+                list(batch), on_conflict="raw_item_id,sentence_idx", ignore_duplicates=True
+            ).execute()
+
+    def _raw_item_ids(self, urls: List[str]) -> Dict[str, str]:
+        ids = {}
+        for batch in chunked(urls, self.batch_size):
+            response = self.client.table("raw_items").select("id, url").in_("url", list(batch)).execute()
+            ids.update({row["url"]: row["id"] for row in response.data})
+        return ids
+
+    def _snippet_ids(self, raw_item_ids: List[str]) -> List[str]:
+        ids = []
+        for batch in chunked(raw_item_ids, self.batch_size):
+            response = (
+                self.client.table("snippets").select("id").in_("raw_item_id", list(batch)).execute()
+            )
+            ids.extend(row["id"] for row in response.data)
+        return ids
+
+
+def normalize_article(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map a bulk input record onto the connector item shape; None if unusable"""
+    url = (record.get("url") or "").strip()
+    title = (record.get("title") or "").strip()
+    if not url or not title:
+        return None
+
+    domain = (record.get("source_domain") or urlparse(url).netloc).lower()
+    if domain.startswith("www."):
+        domain = domain[4:]
+
+    item = {
+        "source_name": record.get("source_name") or domain,
+        "source_domain": domain,
+        "url": url,
+        "title": title,
+        "body_text": record.get("body_text") or record.get("content") or record.get("description") or "",
+        "published_at": record.get("published_at") or None,
+        "category": (record.get("category") or "").strip() or None,
+        "raw_json": None,
+    }
+    if record.get("trust_score") not in (None, ""):
+        item["trust_score"] = float(record["trust_score"])
+    return item
+
+
+def read_articles(path: str) -> Iterator[Optional[Dict[str, Any]]]:
+    """Stream normalised articles from a .jsonl or .csv file
+
+    Yields one entry per input record, None for records that cannot be
+    used, so positions line up with the checkpoint.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            csv.field_size_limit(sys.maxsize)
+            for record in csv.DictReader(f):
+                yield normalize_article(record)
+            return
+
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield normalize_article(json.loads(line))
+            except (ValueError, AttributeError):
+                yield None
+
+
+class Checkpoint:
+    """Number of input records already written for one input file"""
+
+    def __init__(self, path: str, source: str):
+        self.path = path
+        self.source = os.path.abspath(source)
+
+    def load(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get("source") != self.source:
+            logger.warning(f"Checkpoint {self.path} is for {state.get('source')}, starting over")
+            return 0
+        return state.get("position", 0)
+
+    def save(self, position: int):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"source": self.source, "position": position}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def bulk_ingest(
+    articles: Iterable[Optional[Dict[str, Any]]],
+    writer: IngestionWriter,
+    batch_size: int = 1000,
+    checkpoint: Optional[Checkpoint] = None,
+) -> Dict[str, Any]:
+    """
+    Write a stream of articles in batches, resuming from `checkpoint`
+
+    The checkpoint advances only after a batch is written; since writes are
+    idempotent upserts, a crash mid-batch at worst replays that batch.
+    """
+    start_position = checkpoint.load() if checkpoint else 0
+    if start_position:
+        logger.info(f"Resuming after {start_position} records")
+
+    stats = {"articles": 0, "snippets": 0, "skipped": 0, "seconds": 0.0}
+    position = 0
+    batch: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+
+    def flush():
+        snippet_ids = writer.write_items(batch)
+        stats["articles"] += len(batch)
+        stats["snippets"] += len(snippet_ids)
+        batch.clear()
+        if checkpoint:
+            checkpoint.save(position)
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Processed {position} records: {stats['articles']} articles, "
+            f"{stats['snippets']} new snippets ({stats['articles'] / elapsed:.1f} articles/s)"
+        )
+
+    for article in articles:
+        position += 1
+        if position <= start_position:
+            continue
+        if article is None:
+            stats["skipped"] += 1
+            continue
+        batch.append(article)
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+    elif checkpoint and position > start_position:
+        checkpoint.save(position)
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["articles_per_second"] = stats["articles"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
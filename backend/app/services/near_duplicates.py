@@ -0,0 +1,264 @@
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+from collections import defaultdict
+import json
+import os
+import re
+import threading
+import zlib
+import numpy as np
+from prometheus_client import Counter
+from app.core.config import settings
+from app.core.storage import atomic_open, save_array
+from app.services.bm25_index import STOPWORDS, TOKEN_RE
+import logging
+
+logger = logging.getLogger(__name__)
+
+NEAR_DUP_LOOKUPS = Counter(
+    "truthverse_near_duplicate_lookups_total",
+    "Near-duplicate index lookups for claims missing from the verification cache",
+    ["result"],
+)
+
+HASH_MODULUS = (1 << 31) - 1
+
+CLAIM_STOPWORDS = STOPWORDS | frozenset("been being do does did than then these those".split())
+SUFFIXES = ("ing", "ed", "es", "s")
+DIGITS_RE = re.compile(r"\d+")
+CONTRACTION_RE = re.compile(r"n['’]t\b")
+NEGATIONS = frozenset("not no never without nor cannot".split())
+NEGATION_TOKEN = "not"
+
+
+def claim_tokens(text: str) -> FrozenSet[str]:
+    """
+    Order-free token set used to compare claims
+
+    Numbers are masked as in compute_canonical_hash, stopwords dropped and
+    common inflections stripped, so "vaccine causes X" and "X is caused by
+    the vaccine" reduce to the same set. Negations (including "n't") are
+    kept as a single "not" token so a claim and its denial stay distinct.
+    """
+    tokens = set()
+    text = CONTRACTION_RE.sub(" not", DIGITS_RE.sub("0", text.lower()))
+    for token in TOKEN_RE.findall(text):
+        if token in NEGATIONS:
+            tokens.add(NEGATION_TOKEN)
+            continue
+        if token in CLAIM_STOPWORDS:
+            continue
+        for suffix in SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+                token = token[:-len(suffix)]
+                break
+        tokens.add(token)
+    return frozenset(tokens)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """MinHash LSH index over the token sets of verified claims
+
+    Each claim gets a `num_perm` MinHash signature split into `bands`; claims
+    sharing any band bucket are candidates, and candidates are confirmed by
+    exact Jaccard similarity on their stored token sets. Signatures, claim
+    ids and token sets are kept on disk; buckets are rebuilt on load.
+    """
+
+    META_FILE = "meta.json"
+    SIGNATURES_FILE = "signatures.npy"
+    IDS_FILE = "claim_ids.npy"
+    TOKENS_FILE = "tokens.jsonl"
+
+    def __init__(
+        self,
+        index_dir: Optional[str] = None,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        threshold: Optional[float] = None,
+        seed: int = 1,
+    ):
+        self.index_dir = index_dir
+        self.num_perm = num_perm or settings.NEAR_DUP_NUM_PERM
+        self.bands = bands or settings.NEAR_DUP_BANDS
+        self.threshold = settings.NEAR_DUP_THRESHOLD if threshold is None else threshold
+        self.seed = seed
+        if self.num_perm % self.bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.rows = self.num_perm // self.bands
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, HASH_MODULUS, size=self.num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, HASH_MODULUS, size=self.num_perm, dtype=np.uint64)
+        self._band_width = self.rows * np.dtype(np.uint32).itemsize
+
+        self.signatures = np.zeros((0, self.num_perm), dtype=np.uint32)
+        self.claim_ids: List[str] = []
+        self.token_sets: List[FrozenSet[str]] = []
+        self._positions: Dict[str, int] = {}
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(self.bands)]
+        self._pending: List[np.ndarray] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.claim_ids)
+
+    def __contains__(self, claim_id: str) -> bool:
+        return claim_id in self._positions
+
+    def signature(self, tokens: FrozenSet[str]) -> np.ndarray:
+        """MinHash signature of a token set"""
+        hashes = np.array([zlib.crc32(token.encode()) for token in tokens], dtype=np.uint64) % HASH_MODULUS
+        permuted = (np.outer(hashes, self._a) + self._b) % HASH_MODULUS
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def add(self, claim_ids: Sequence[str], texts: Sequence[str]) -> int:
+        """Index new claims; ids already present or without tokens are skipped"""
+        added = 0
+        with self._lock:
+            for claim_id, text in zip(claim_ids, texts):
+                tokens = claim_tokens(text)
+                if not tokens or claim_id in self._positions:
+                    continue
+                signature = self.signature(tokens)
+                position = len(self.claim_ids)
+                self.claim_ids.append(claim_id)
+                self.token_sets.append(tokens)
+                self._positions[claim_id] = position
+                self._pending.append(signature)
+                for band, key in enumerate(self._band_keys(signature)):
+                    self._buckets[band][key].append(position)
+                added += 1
+        return added
+
+    def query(self, text: str) -> Optional[Tuple[str, float]]:
+        """Most similar indexed claim at or above the threshold, as (claim_id, jaccard)"""
+        tokens = claim_tokens(text)
+        if not tokens or not self.claim_ids:
+            return None
+
+        candidates = set()
+        for band, key in enumerate(self._band_keys(self.signature(tokens))):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        negated = NEGATION_TOKEN in tokens
+        best = None
+        for position in candidates:
+            if (NEGATION_TOKEN in self.token_sets[position]) != negated:
+                continue
+            similarity = jaccard(tokens, self.token_sets[position])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (self.claim_ids[position], similarity)
+        return best
+
+    @classmethod
+    def build(cls, index_dir: str, claim_ids: Sequence[str], texts: Sequence[str], **kwargs) -> "NearDuplicateIndex":
+        """Build a new index from claims and persist it"""
+        index = cls(index_dir, **kwargs)
+        index.add(claim_ids, texts)
+        index.save()
+        logger.info(f"Built near-duplicate index with {len(index)} claims")
+        return index
+
+    def save(self):
+        """Atomically replace signatures, ids and token sets, then the meta that loads them"""
+        with self._lock:
+            if self._pending:
+                self.signatures = np.vstack([self.signatures, *self._pending])
+                self._pending = []
+            os.makedirs(self.index_dir, exist_ok=True)
+            save_array(os.path.join(self.index_dir, self.SIGNATURES_FILE), self.signatures)
+            save_array(os.path.join(self.index_dir, self.IDS_FILE), np.asarray(self.claim_ids, dtype="S36"))
+            with atomic_open(os.path.join(self.index_dir, self.TOKENS_FILE)) as f:
+                for tokens in self.token_sets:
+                    f.write(json.dumps(sorted(tokens)) + "\n")
+
+            with atomic_open(os.path.join(self.index_dir, self.META_FILE)) as f:
+                json.dump({
+                    "num_perm": self.num_perm,
+                    "bands": self.bands,
+                    "seed": self.seed,
+                    "count": len(self.claim_ids),
+                }, f)
+
+    @classmethod
+    def load(cls, index_dir: str, threshold: Optional[float] = None) -> Optional["NearDuplicateIndex"]:
+        """Load a saved index and rebuild its band buckets"""
+        meta_path = os.path.join(index_dir, cls.META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        index = cls(index_dir, num_perm=meta["num_perm"], bands=meta["bands"], threshold=threshold, seed=meta["seed"])
+        count = meta["count"]
+        index.signatures = np.load(os.path.join(index_dir, cls.SIGNATURES_FILE))[:count]
+        index.claim_ids = [claim_id.decode() for claim_id in np.load(os.path.join(index_dir, cls.IDS_FILE))[:count]]
+        with open(os.path.join(index_dir, cls.TOKENS_FILE)) as f:
+            index.token_sets = [frozenset(json.loads(line)) for line, _ in zip(f, range(count))]
+        index._positions = {claim_id: position for position, claim_id in enumerate(index.claim_ids)}
+
+        raw = np.ascontiguousarray(index.signatures).tobytes()
+        width = index._band_width
+        for position, row_start in enumerate(range(0, len(raw), width * index.bands)):
+            for band in range(index.bands):
+                start = row_start + band * width
+                index._buckets[band][raw[start:start + width]].append(position)
+
+        logger.info(f"Loaded near-duplicate index with {count} claims from {index_dir}")
+        return index
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Bucket key per band: the raw bytes of that band's rows"""
+        raw = signature.tobytes()
+        width = self._band_width
+        return [raw[start:start + width] for start in range(0, len(raw), width)]
+
+
+_index: Optional[NearDuplicateIndex] = None
+_index_mtime: Optional[float] = None
+_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """Process-wide index from NEAR_DUP_INDEX_DIR, reloaded when it is rewritten"""
+    global _index, _index_mtime
+    meta_path = os.path.join(settings.NEAR_DUP_INDEX_DIR, NearDuplicateIndex.META_FILE)
+    try:
+        mtime = os.stat(meta_path).st_mtime
+    except OSError:
+        return None
+
+    if mtime != _index_mtime:
+        with _index_lock:
+            if mtime != _index_mtime:
+                try:
+                    _index = NearDuplicateIndex.load(settings.NEAR_DUP_INDEX_DIR)
+                except Exception as e:
+                    logger.warning(f"Failed to load near-duplicate index: {e}")
+                    _index = None
+                _index_mtime = mtime
+    return _index
+
+
+def fetch_claim_reports(client, claim_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Latest claim_reports row per claim id"""
+    if not claim_ids:
+        return {}
+    response = (
+        client.table("claim_reports")
+        .select("*")
+        .in_("claim_id", list(claim_ids))
+        .order("created_at", desc=True)
+        .execute()
+    )
+    reports = {}
+    for row in response.data:
+        reports.setdefault(row["claim_id"], row)
+    return reports
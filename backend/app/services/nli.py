@@ -1,30 +1,75 @@
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Executor
+import asyncio
+from prometheus_client import Counter
 from transformers import pipeline
 from app.core.config import settings
+from app.services.inference_scheduler import InferenceScheduler
+from app.services.nli_cache import NLI_CACHE_MISSES
+from app.services.onnx_nli import load_onnx_nli
 import logging
 
 logger = logging.getLogger(__name__)
 
+NLI_CASCADE_DECISIONS = Counter(
+    "truthverse_nli_cascade_total",
+    "NLI pairs by the cascade tier that decided their stance",
+    ["tier"],
+)
+
 
 class NLIService:
-    """Natural Language Inference for stance detection"""
+    """Natural Language Inference for stance detection
+
+    With a fast model (`nli_fast` in the registry, from NLI_FAST_MODEL) the
+    service runs a two-tier cascade: the fast model scores every pair, and
+    only pairs whose top stance falls below that stance's
+    NLI_CASCADE_*_THRESHOLD are escalated to the full model. Each result's
+    ``tier`` records what decided it: ``fast``, ``full`` or ``fallback``.
+    """
 
-    def __init__(self):
+    def __init__(self, registry=None, cache=None, scheduler: Optional[InferenceScheduler] = None):
         self.model = None
-        self._initialize_model()
+        self.fast_model = None
+        self.cache = cache
+        self.scheduler = scheduler
+        if registry is not None:
+            self.model = registry.get("nli")
+            if self.model:
+                self.fast_model = registry.get("nli_fast")
+        else:
+            self._initialize_model()
+            if self.model and settings.NLI_FAST_MODEL:
+                self._initialize_fast_model()
+
+    def _initialize_fast_model(self):
+        """Initialize the fast first-tier NLI model"""
+        try:
+            logger.info(f"Loading fast NLI model: {settings.NLI_FAST_MODEL}")
+            self.fast_model = pipeline("text-classification", model=settings.NLI_FAST_MODEL, device=-1)
+        except Exception as e:
+            logger.warning(f"Failed to load fast NLI model, cascade disabled: {e}")
 
     def _initialize_model(self):
         """Initialize NLI model"""
         try:
             if settings.USE_HF_INFERENCE:
                 logger.info("Using HuggingFace Inference API for NLI")
-            else:
-                logger.info(f"Loading local NLI model: {settings.NLI_MODEL}")
-                self.model = pipeline(
-                    "text-classification",
-                    model=settings.NLI_MODEL,
-                    device=-1,
-                )
+                return
+            if settings.NLI_BACKEND == "onnx":
+                try:
+                    self.model = load_onnx_nli()
+                    logger.info(f"Loaded int8 ONNX NLI model from {settings.NLI_ONNX_DIR}")
+                    return
+                except Exception as e:
+                    logger.warning(f"ONNX NLI backend unavailable, using transformers: {e}")
+
+            logger.info(f"Loading local NLI model: {settings.NLI_MODEL}")
+            self.model = pipeline(
+                "text-classification",
+                model=settings.NLI_MODEL,
+                device=-1,
+            )
         except Exception as e:
             logger.warning(f"Failed to load NLI model: {e}")
             self.model = None
@@ -32,37 +77,221 @@ class NLIService:
     def get_stance(self, claim: str, evidence: str) -> Dict[str, any]:
         """
         Determine stance of evidence toward claim
-        Returns: {"stance": "support|contradict|neutral", "score": float, "explanation": str}
+        Returns: {"stance": "support|contradict|neutral", "score": float, "explanation": str, "tier": str}
+        """
+        return self._infer_batch([(claim, evidence)], 1)[0][0]
+
+    def get_stance_batch(
+        self,
+        pairs: List[Tuple[str, str]],
+        batch_size: Optional[int] = None,
+        keys: Optional[List[Tuple[str, str]]] = None,
+    ) -> List[Dict[str, any]]:
         """
+        Determine stance for many (claim, evidence) pairs at once
+
+        Pairs are sorted by length so each padded batch holds inputs of similar
+        size, run through the model in chunks of at most `batch_size`, and
+        returned in the original order. Results match get_stance() per pair.
+
+        With a stance cache and `keys` (a (claim canonical hash, snippet id)
+        per pair), cached stances are looked up in bulk and only the misses
+        reach the model.
+        """
+        if not pairs:
+            return []
+
+        if self.cache is not None and keys is not None and self.model:
+            return self._get_stance_batch_cached(pairs, keys, batch_size)
+
+        return [result for result, _ in self._infer_batch(pairs, batch_size)]
+
+    def _infer_batch(
+        self, pairs: List[Tuple[str, str]], batch_size: Optional[int]
+    ) -> List[Tuple[Dict[str, any], bool]]:
+        """Cascaded model inference; each result is flagged if it came from a model"""
+        if not pairs:
+            return []
+
         if not self.model:
-            return self._fallback_stance(claim, evidence)
+            return [(self._fallback_stance(claim, evidence), False) for claim, evidence in pairs]
 
-        try:
-            input_text = f"{claim} [SEP] {evidence}"
+        batch_size = batch_size or settings.NLI_BATCH_SIZE
+        inputs = [self._format_pair(claim, evidence) for claim, evidence in pairs]
+        results: List[Optional[Tuple[Dict[str, any], bool]]] = [None] * len(pairs)
+        pending = list(range(len(pairs)))
 
-            result = self.model(input_text, truncation=True, max_length=512)[0]
+        if self.fast_model is not None:
+            escalated = []
+            for i, output in zip(pending, self._classify(self.fast_model, inputs, pending, batch_size)):
+                claim, evidence = pairs[i]
+                stance = self._to_stance(claim, evidence, output, "fast") if output else None
+                if stance and stance["score"] >= self._accept_threshold(stance["stance"]):
+                    results[i] = (stance, True)
+                else:
+                    escalated.append(i)
+            NLI_CASCADE_DECISIONS.labels(tier="fast").inc(len(pending) - len(escalated))
+            pending = escalated
 
-            label = result["label"].lower()
-            score = result["score"]
+        for i, output in zip(pending, self._classify(self.model, inputs, pending, batch_size)):
+            claim, evidence = pairs[i]
+            if output is None:
+                results[i] = (self._fallback_stance(claim, evidence), False)
+            else:
+                results[i] = (self._to_stance(claim, evidence, output, "full"), True)
+        NLI_CASCADE_DECISIONS.labels(tier="full").inc(len(pending))
+
+        return results
+
+    def _classify(
+        self, model, inputs: List[str], indices: List[int], batch_size: int
+    ) -> List[Optional[Dict[str, any]]]:
+        """
+        Top prediction per input in `indices`, None where the model failed
 
-            if "entailment" in label or "support" in label:
-                stance = "support"
-            elif "contradiction" in label or "contradict" in label:
-                stance = "contradict"
+        Inputs are sorted by length so each padded batch holds inputs of
+        similar size; outputs come back in the order of `indices`.
+        """
+        order = sorted(indices, key=lambda i: len(inputs[i]))
+        outputs: Dict[int, Optional[Dict[str, any]]] = {}
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            try:
+                predictions = model(
+                    [inputs[i] for i in bucket],
+                    batch_size=len(bucket),
+                    truncation=True,
+                    max_length=settings.NLI_MAX_LENGTH,
+                )
+            except Exception as e:
+                logger.error(f"NLI batch inference error: {e}")
+                predictions = [None] * len(bucket)
+
+            for i, prediction in zip(bucket, predictions):
+                outputs[i] = prediction[0] if isinstance(prediction, list) else prediction
+        return [outputs[i] for i in indices]
+
+    def _accept_threshold(self, stance: str) -> float:
+        """Fast-tier confidence needed to keep a stance without escalating"""
+        return {
+            "support": settings.NLI_CASCADE_SUPPORT_THRESHOLD,
+            "contradict": settings.NLI_CASCADE_CONTRADICT_THRESHOLD,
+        }.get(stance, settings.NLI_CASCADE_NEUTRAL_THRESHOLD)
+
+    async def get_stance_batch_async(
+        self,
+        pairs: List[Tuple[str, str]],
+        keys: Optional[List[Tuple[str, str]]] = None,
+        executor: Optional[Executor] = None,
+    ) -> List[Dict[str, any]]:
+        """
+        get_stance_batch for coroutines
+
+        Cache lookups and writes run on `executor`. Model inference for the
+        misses goes through the shared scheduler, if set, so pairs from
+        concurrent requests are classified in the same batches.
+        """
+        if not pairs:
+            return []
+
+        loop = asyncio.get_running_loop()
+        if self.scheduler is None or not self.model:
+            return await loop.run_in_executor(executor, self.get_stance_batch, pairs, None, keys)
+
+        if self.cache is None or keys is None:
+            computed = await self.scheduler.submit_many(pairs)
+            return [result for result, _ in computed]
+
+        cached = await loop.run_in_executor(executor, self.cache.get_many, keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        computed = await self.scheduler.submit_many([pairs[i] for i in missing])
+        NLI_CACHE_MISSES.inc(len(missing))
+
+        fresh = self._fresh_stances(keys, missing, computed)
+        if fresh:
+            await loop.run_in_executor(executor, self.cache.set_many, fresh)
+        return self._merge_cached(pairs, keys, cached, missing, computed)
+
+    def _get_stance_batch_cached(
+        self,
+        pairs: List[Tuple[str, str]],
+        keys: List[Tuple[str, str]],
+        batch_size: Optional[int],
+    ) -> List[Dict[str, any]]:
+        cached = self.cache.get_many(keys)
+
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        computed = self._infer_batch([pairs[i] for i in missing], batch_size)
+        NLI_CACHE_MISSES.inc(len(missing))
+
+        self.cache.set_many(self._fresh_stances(keys, missing, computed))
+        return self._merge_cached(pairs, keys, cached, missing, computed)
+
+    def _fresh_stances(
+        self,
+        keys: List[Tuple[str, str]],
+        missing: List[int],
+        computed: List[Tuple[Dict[str, any], bool]],
+    ) -> Dict[Tuple[str, str], Dict[str, any]]:
+        """Cache entries for the computed stances that came from the model"""
+        return {
+            keys[i]: {"stance": result["stance"], "score": result["score"], "tier": result["tier"]}
+            for i, (result, from_model) in zip(missing, computed)
+            if from_model
+        }
+
+    def _merge_cached(
+        self,
+        pairs: List[Tuple[str, str]],
+        keys: List[Tuple[str, str]],
+        cached: Dict[Tuple[str, str], Dict[str, any]],
+        missing: List[int],
+        computed: List[Tuple[Dict[str, any], bool]],
+    ) -> List[Dict[str, any]]:
+        """Results in pair order from cached and freshly computed stances"""
+        results = []
+        computed_by_index = dict(zip(missing, computed))
+        for i, (claim, evidence) in enumerate(pairs):
+            if i in computed_by_index:
+                results.append(computed_by_index[i][0])
             else:
-                stance = "neutral"
+                stance = cached[keys[i]]
+                results.append({
+                    "stance": stance["stance"],
+                    "score": stance["score"],
+                    "explanation": self._generate_explanation(
+                        claim, evidence, stance["stance"], stance["score"]
+                    ),
+                    "tier": stance.get("tier"),
+                })
+        return results
 
-            explanation = self._generate_explanation(claim, evidence, stance, score)
+    def _format_pair(self, claim: str, evidence: str) -> str:
+        """Build the model input for a claim/evidence pair"""
+        return f"{claim} [SEP] {evidence}"
 
-            return {
-                "stance": stance,
-                "score": score,
-                "explanation": explanation,
-            }
+    def _to_stance(
+        self, claim: str, evidence: str, result: Dict[str, any], tier: str = "full"
+    ) -> Dict[str, any]:
+        """Map a raw classifier prediction to a stance result"""
+        label = result["label"].lower()
+        score = result["score"]
 
-        except Exception as e:
-            logger.error(f"NLI inference error: {e}")
-            return self._fallback_stance(claim, evidence)
+        if "entailment" in label or "support" in label:
+            stance = "support"
+        elif "contradiction" in label or "contradict" in label:
+            stance = "contradict"
+        else:
+            stance = "neutral"
+
+        explanation = self._generate_explanation(claim, evidence, stance, score)
+
+        return {
+            "stance": stance,
+            "score": score,
+            "explanation": explanation,
+            "tier": tier,
+        }
 
     def _fallback_stance(self, claim: str, evidence: str) -> Dict[str, any]:
         """Simple keyword-based fallback"""
@@ -84,6 +313,7 @@ class NLIService:
             "stance": stance,
             "score": score,
             "explanation": "Fallback stance detection based on keyword overlap",
+            "tier": "fallback",
         }
 
     def _generate_explanation(
@@ -96,3 +326,28 @@ class NLIService:
             return f"Evidence contradicts the claim with {score:.1%} confidence"
         else:
             return f"Evidence is neutral to the claim"
+
+
+_schedulers: Dict[object, InferenceScheduler] = {}
+
+
+def get_nli_scheduler(registry) -> InferenceScheduler:
+    """Process-wide micro-batching scheduler for the registry's NLI model"""
+    scheduler = _schedulers.get(registry)
+    if scheduler is None:
+        service = NLIService(registry)
+        scheduler = _schedulers[registry] = InferenceScheduler(
+            "nli",
+            lambda pairs: service._infer_batch(pairs, None),
+            max_batch_size=settings.NLI_SCHEDULER_MAX_BATCH,
+            max_wait=settings.NLI_SCHEDULER_MAX_WAIT_MS / 1000,
+        )
+    return scheduler
+
+
+async def close_nli_schedulers():
+    """Close the schedulers created so far; later calls get fresh ones"""
+    schedulers = list(_schedulers.values())
+    _schedulers.clear()
+    for scheduler in schedulers:
+        await scheduler.close()
@@ -0,0 +1,147 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from functools import lru_cache
+import json
+from prometheus_client import Counter
+from app.core.cache import RedisTier, optional_redis_client
+from app.core.config import settings
+from app.core.database import db
+from app.services.verify_cache import LocalLRU
+import logging
+
+logger = logging.getLogger(__name__)
+
+PairKey = Tuple[str, str]
+
+NLI_CACHE_HITS = Counter(
+    "truthverse_nli_cache_hits_total",
+    "NLI stances served from cache",
+    ["tier"],
+)
+NLI_CACHE_MISSES = Counter(
+    "truthverse_nli_cache_misses_total",
+    "NLI stances that had to run the model",
+)
+
+
+class StanceCache:
+    """Three-tier cache of NLI stances per (claim canonical hash, snippet id)
+
+    Lookups go to the in-process LRU, then Redis (one MGET), then stored
+    rows in the evidence table, each tier only for the previous tier's
+    misses. Keys include the NLI model id, so switching models or the
+    int8 backend starts from an empty cache; evidence rows are matched on
+    their nli_model column. New stances are written back to the LRU and Redis.
+    """
+
+    EVIDENCE_CHUNK = 100
+
+    def __init__(
+        self,
+        redis_client=None,
+        client=None,
+        local_size: Optional[int] = None,
+        ttl: Optional[int] = None,
+        model_name: Optional[str] = None,
+    ):
+        self.redis = RedisTier(redis_client, "NLI cache")
+        self.client = client
+        self.ttl = ttl or settings.NLI_CACHE_TTL
+        self.local = LocalLRU(local_size or settings.NLI_CACHE_LOCAL_SIZE, self.ttl)
+        self.model_name = model_name or settings.nli_model_id
+
+    def _key(self, pair_key: PairKey) -> str:
+        claim_hash, snippet_id = pair_key
+        return f"nli:{self.model_name}:{claim_hash}:{snippet_id}"
+
+    def get_many(self, pair_keys: Sequence[PairKey]) -> Dict[PairKey, Dict[str, Any]]:
+        """Cached stances for as many pairs as possible, each as {stance, score}"""
+        found: Dict[PairKey, Dict[str, Any]] = {}
+        missing: List[PairKey] = []
+        for pair_key in dict.fromkeys(pair_keys):
+            value = self.local.get(self._key(pair_key))
+            if value is not None:
+                found[pair_key] = value
+            else:
+                missing.append(pair_key)
+        NLI_CACHE_HITS.labels(tier="local").inc(len(found))
+
+        if missing:
+            remote = self._redis_get_many(missing)
+            NLI_CACHE_HITS.labels(tier="redis").inc(len(remote))
+            found.update(remote)
+            missing = [k for k in missing if k not in remote]
+
+        if missing:
+            stored = self._evidence_get_many(missing)
+            NLI_CACHE_HITS.labels(tier="evidence").inc(len(stored))
+            if stored:
+                self.set_many(stored)
+            found.update(stored)
+
+        for pair_key, value in found.items():
+            self.local.set(self._key(pair_key), value)
+        return found
+
+    def set_many(self, stances: Dict[PairKey, Dict[str, Any]]):
+        """Store model stances in the LRU and Redis"""
+        if not stances:
+            return
+        for pair_key, value in stances.items():
+            self.local.set(self._key(pair_key), value)
+
+        def write(r):
+            pipe = r.pipeline(transaction=False)
+            for pair_key, value in stances.items():
+                pipe.setex(self._key(pair_key), self.ttl, json.dumps(value))
+            pipe.execute()
+
+        self.redis.call("set", write)
+
+    def _redis_get_many(self, pair_keys: List[PairKey]) -> Dict[PairKey, Dict[str, Any]]:
+        values = self.redis.call("get", lambda r: r.mget([self._key(k) for k in pair_keys]), default=[])
+        return {
+            pair_key: json.loads(value)
+            for pair_key, value in zip(pair_keys, values or [])
+            if value
+        }
+
+    def _evidence_get_many(self, pair_keys: List[PairKey]) -> Dict[PairKey, Dict[str, Any]]:
+        """Stances recorded in the evidence table for this model"""
+        if self.client is None or settings.DEMO_MODE or not settings.NLI_CACHE_EVIDENCE_LOOKUP:
+            return {}
+
+        wanted = set(pair_keys)
+        claim_hashes = list({claim_hash for claim_hash, _ in pair_keys})
+        snippet_ids = list({snippet_id for _, snippet_id in pair_keys})
+        found = {}
+        try:
+            for start in range(0, len(snippet_ids), self.EVIDENCE_CHUNK):
+                response = (
+                    self.client.table("evidence")
+                    .select("snippet_id, stance, nli_conf, claims!inner(canonical_hash)")
+                    .eq("nli_model", self.model_name)
+                    .in_("claims.canonical_hash", claim_hashes)
+                    .in_("snippet_id", snippet_ids[start:start + self.EVIDENCE_CHUNK])
+                    .execute()
+                )
+                for row in response.data:
+                    pair_key = (row["claims"]["canonical_hash"], row["snippet_id"])
+                    if pair_key in wanted:
+                        found[pair_key] = {"stance": row["stance"], "score": row["nli_conf"]}
+        except Exception as e:
+            logger.warning(f"Evidence stance lookup error: {e}")
+        return found
+
+
+@lru_cache()
+def get_stance_cache() -> StanceCache:
+    """Process-wide NLI stance cache"""
+    redis_client = optional_redis_client("NLI cache")
+
+    try:
+        client = db.get_client()
+    except Exception as e:
+        logger.warning(f"Supabase unavailable for NLI cache: {e}")
+        client = None
+
+    return StanceCache(redis_client, client)
@@ -0,0 +1,122 @@
+from typing import Any, Dict, List, Optional, Union
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXPORT_META_FILE = "export.json"
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+
+def export_quantized_nli(model_name: str, output_dir: str) -> str:
+    """
+    Export a sequence-classification model to ONNX with int8 weights
+
+    The model is exported in fp32 with optimum, then its MatMul/Gemm weights
+    are quantized to int8 with onnxruntime dynamic quantization (activations
+    are quantized per batch at run time). Only the quantized graph, config
+    and tokenizer are kept in `output_dir`. Needs torch and optimum, which
+    serving the exported model does not.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=output_dir) as fp32_dir:
+        logger.info(f"Exporting {model_name} to ONNX")
+        ORTModelForSequenceClassification.from_pretrained(model_name, export=True).save_pretrained(fp32_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+        shutil.copy(os.path.join(fp32_dir, "config.json"), output_dir)
+
+        logger.info(f"Quantizing {model_name} weights to int8")
+        quantize_dynamic(
+            os.path.join(fp32_dir, "model.onnx"),
+            os.path.join(output_dir, QUANTIZED_MODEL_FILE),
+            weight_type=QuantType.QInt8,
+        )
+
+    with open(os.path.join(output_dir, EXPORT_META_FILE), "w") as f:
+        json.dump({"model": model_name, "weights": "int8"}, f)
+    return os.path.join(output_dir, QUANTIZED_MODEL_FILE)
+
+
+class OnnxNLIPipeline:
+    """onnxruntime stand-in for the transformers text-classification pipeline
+
+    Called the same way NLIService calls the pipeline: one string gives a
+    one-element list, a list of strings gives one top-label prediction
+    ({label, score}) per input, run in padded chunks of `batch_size`.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None,
+    ):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        model_path = os.path.join(model_dir, QUANTIZED_MODEL_FILE)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads if intra_op_threads is not None else settings.NLI_ONNX_INTRA_OP_THREADS
+        options.inter_op_num_threads = inter_op_threads if inter_op_threads is not None else settings.NLI_ONNX_INTER_OP_THREADS
+        if options.inter_op_num_threads > 1:
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.id2label = AutoConfig.from_pretrained(model_dir).id2label
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        self.model_bytes = os.path.getsize(model_path)
+
+    def __call__(
+        self,
+        inputs: Union[str, List[str]],
+        batch_size: Optional[int] = None,
+        truncation: bool = True,
+        max_length: Optional[int] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        batch_size = batch_size or len(texts) or 1
+        results = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=truncation,
+                max_length=max_length or settings.NLI_MAX_LENGTH,
+                return_tensors="np",
+            )
+            feed = {name: value for name, value in encoded.items() if name in self.input_names}
+            logits = self.session.run(None, feed)[0]
+            probabilities = np.exp(logits - logits.max(axis=-1, keepdims=True))
+            probabilities /= probabilities.sum(axis=-1, keepdims=True)
+            for row in probabilities:
+                best = int(row.argmax())
+                results.append({"label": self.id2label[best], "score": float(row[best])})
+        return results
+
+
+def load_onnx_nli(model_dir: Optional[str] = None, model_name: Optional[str] = None) -> OnnxNLIPipeline:
+    """Quantized NLI model exported for `model_name`; raises if it is missing or stale"""
+    model_dir = model_dir or settings.NLI_ONNX_DIR
+    model_name = model_name or settings.NLI_MODEL
+    meta_path = os.path.join(model_dir, EXPORT_META_FILE)
+    if not os.path.exists(meta_path):
+        raise FileNotFoundError(f"No ONNX export in {model_dir}; run scripts/ensure_models.py")
+
+    with open(meta_path) as f:
+        exported = json.load(f)["model"]
+    if exported != model_name:
+        raise ValueError(f"ONNX export in {model_dir} is for {exported}, not {model_name}")
+
+    return OnnxNLIPipeline(model_dir)
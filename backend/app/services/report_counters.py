@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from functools import lru_cache
+from app.core.cache import RedisTier, optional_redis_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+REPORT_COUNTS_KEY = "reports:counts"
+REPORT_COUNTS_READY_KEY = "reports:counts:ready"
+
+
+class ReportCounters:
+    """Redis sorted set of claim id -> user report count for the moderation queue
+
+    Report submissions ZINCRBY their claim (O(log n)) and the queue reads a
+    page with ZREVRANGE (O(log n + k)), so neither touches the reports
+    table. reconcile() rebuilds the set from the table, correcting drift
+    from missed increments or deleted reports; it is swapped in with RENAME
+    so readers never see a partial set, and marks the set ready. Until that
+    marker exists (a cold or flushed Redis) increments are skipped and reads
+    return None, as they do when Redis is unavailable, so callers fall back
+    to counting in the database rather than serving a partial queue.
+    """
+
+    RECONCILE_PAGE_SIZE = 10000
+
+    def __init__(self, redis_client=None):
+        self.redis = RedisTier(redis_client, "Report counters")
+
+    def increment(self, claim_id: str):
+        """Count one report; skipped until the set has been reconciled"""
+        def incr(r):
+            if r.exists(REPORT_COUNTS_READY_KEY):
+                r.zincrby(REPORT_COUNTS_KEY, 1, claim_id)
+
+        self.redis.call("increment", incr)
+
+    def top(self, limit: int, offset: int = 0) -> Optional[List[Tuple[str, int]]]:
+        """(claim id, report count) for one page of the most reported claims, None if not ready"""
+        def read(r):
+            if not r.exists(REPORT_COUNTS_READY_KEY):
+                return None
+            ranked = r.zrevrange(REPORT_COUNTS_KEY, offset, offset + limit - 1, withscores=True)
+            return [(claim_id.decode(), int(count)) for claim_id, count in ranked]
+
+        return self.redis.call("read", read)
+
+    def reconcile(self, client) -> int:
+        """Replace the set with counts from the reports table; returns the claims counted"""
+        r = self.redis.client
+        if r is None:
+            return 0
+
+        staging_key = f"{REPORT_COUNTS_KEY}:rebuild"
+        r.delete(staging_key)
+        counted = 0
+        for counts in self._iter_table_counts(client):
+            r.zadd(staging_key, counts)
+            counted += len(counts)
+
+        if counted:
+            r.rename(staging_key, REPORT_COUNTS_KEY)
+        else:
+            r.delete(REPORT_COUNTS_KEY)
+        r.set(REPORT_COUNTS_READY_KEY, 1)
+        return counted
+
+    def _iter_table_counts(self, client):
+        """Pages of {claim id: count}, keyset-paged on claim id by the report_counts RPC"""
+        after = None
+        while True:
+            rows = client.rpc(
+                "report_counts", {"page_size": self.RECONCILE_PAGE_SIZE, "after_claim_id": after}
+            ).execute().data
+            if not rows:
+                return
+            yield {row["claim_id"]: row["report_count"] for row in rows}
+            if len(rows) < self.RECONCILE_PAGE_SIZE:
+                return
+            after = rows[-1]["claim_id"]
+
+
+def fetch_claim_details(client, claim_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Claim text and latest claim report per claim id, in one query"""
+    if not claim_ids:
+        return {}
+    response = (
+        client.table("claims")
+        .select("id, claim_text, claim_reports(cred_score, label, created_at)")
+        .in_("id", list(claim_ids))
+        .execute()
+    )
+    details = {}
+    for row in response.data:
+        reports = sorted(row.get("claim_reports") or [], key=lambda r: r.get("created_at") or "", reverse=True)
+        latest = reports[0] if reports else {}
+        details[row["id"]] = {
+            "claim_text": row.get("claim_text", ""),
+            "cred_score": latest.get("cred_score"),
+            "label": latest.get("label"),
+        }
+    return details
+
+
+@lru_cache()
+def get_report_counters() -> ReportCounters:
+    """Process-wide report counters"""
+    return ReportCounters(optional_redis_client("report counters"))
@@ -1,80 +1,156 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import re
 from app.core.database import db
 from app.core.config import settings
+from app.services.dense_index import get_dense_index, encode_texts
+from app.services.bm25_index import get_local_bm25_index
 import logging
 
 logger = logging.getLogger(__name__)
 
+SNIPPET_SELECT = """
+    id,
+    sentence_text,
+    raw_items!inner(
+        id,
+        title,
+        url,
+        sources!inner(
+            id,
+            name,
+            domain,
+            trust_score
+        )
+    )
+"""
+
+
+def flatten_snippet_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a snippet row with its article and source"""
+    raw_item = item.get("raw_items", {})
+    source = raw_item.get("sources", {})
+
+    return {
+        "snippet_id": item["id"],
+        "sentence_text": item["sentence_text"],
+        "raw_item_id": raw_item.get("id"),
+        "title": raw_item.get("title"),
+        "url": raw_item.get("url"),
+        "source_id": source.get("id"),
+        "source_name": source.get("name"),
+        "source_domain": source.get("domain"),
+        "source_trust": source.get("trust_score", 0.5),
+    }
+
 
 class HybridRetriever:
     """Hybrid retrieval combining BM25 and dense search"""
 
-    def __init__(self):
+    def __init__(self, registry=None):
         self.use_fts = settings.USE_FTS_FALLBACK
-
-    def retrieve_hybrid(self, query: str, top_k: int = 50) -> List[Dict[str, Any]]:
+        self.use_local_index = settings.DEMO_MODE or not self.use_fts
+        self.registry = registry
+
+    def retrieve_hybrid(
+        self,
+        query: str,
+        top_k: int = 50,
+        lexical_k: Optional[int] = None,
+        dense_k: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Perform hybrid retrieval using BM25 + dense vectors
 
+        Each stage fetches its own candidate depth, then the ranked lists are
+        fused (reciprocal-rank or weighted min-max, per RETRIEVAL_FUSION) and
+        the best `top_k` are returned ordered by `retrieval_score`.
+
         Returns list of snippets with metadata
         """
         try:
-            bm25_results = self._bm25_search(query, top_k=top_k)
-
-            for result in bm25_results:
-                result["retrieval_score"] = result.get("bm25_score", 0.5)
+            bm25_results = self._bm25_search(
+                query, top_k=lexical_k or settings.RETRIEVAL_LEXICAL_CANDIDATES
+            )
+            dense_results = self._dense_search(
+                query, top_k=dense_k or settings.RETRIEVAL_DENSE_CANDIDATES
+            )
 
-            return bm25_results[:top_k]
+            return self._fuse(
+                [(bm25_results, "bm25_score"), (dense_results, "dense_score")],
+                top_k=top_k,
+            )
 
         except Exception as e:
             logger.error(f"Retrieval error: {e}")
             return []
 
+    def _fuse(self, ranked_lists, top_k: int) -> List[Dict[str, Any]]:
+        """Merge per-stage ranked lists into one list sorted by fused score"""
+        fused: Dict[str, Dict[str, Any]] = {}
+        weights = {
+            "bm25_score": 1.0 - settings.RETRIEVAL_DENSE_WEIGHT,
+            "dense_score": settings.RETRIEVAL_DENSE_WEIGHT,
+        }
+
+        for results, score_key in ranked_lists:
+            if not results:
+                continue
+
+            if settings.RETRIEVAL_FUSION == "weighted":
+                scores = [r[score_key] for r in results]
+                low, high = min(scores), max(scores)
+                span = high - low
+                contributions = [
+                    weights[score_key] * ((score - low) / span if span else 1.0)
+                    for score in scores
+                ]
+            else:
+                contributions = [
+                    1.0 / (settings.RETRIEVAL_RRF_K + rank)
+                    for rank in range(1, len(results) + 1)
+                ]
+
+            for result, contribution in zip(results, contributions):
+                entry = fused.get(result["snippet_id"])
+                if entry is None:
+                    entry = dict(result, retrieval_score=0.0)
+                    fused[result["snippet_id"]] = entry
+                else:
+                    entry[score_key] = result[score_key]
+                entry["retrieval_score"] += contribution
+
+        ranked = sorted(fused.values(), key=lambda r: r["retrieval_score"], reverse=True)
+        return ranked[:top_k]
+
     def _bm25_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
-        """Full-text search using PostgreSQL FTS"""
+        """Full-text search ranked by ts_rank_cd via the search_snippets RPC"""
+        if self.use_local_index:
+            return self._local_bm25_search(query, top_k)
+
         try:
             client = db.get_client()
 
-            response = (
-                client.table("snippets")
-                .select(
-                    """
-                    id,
-                    sentence_text,
-                    raw_items!inner(
-                        id,
-                        title,
-                        url,
-                        sources!inner(
-                            id,
-                            name,
-                            domain,
-                            trust_score
-                        )
-                    )
-                    """
-                )
-                .text_search("sentence_text", query, config="english")
-                .limit(top_k)
-                .execute()
-            )
+            try:
+                response = client.rpc(
+                    "search_snippets", {"query_text": query, "match_count": top_k}
+                ).execute()
+            except Exception as e:
+                logger.warning(f"search_snippets RPC unavailable, scoring locally: {e}")
+                return self._bm25_search_local_rank(client, query, top_k)
 
             results = []
-            for item in response.data:
-                raw_item = item.get("raw_items", {})
-                source = raw_item.get("sources", {})
-
+            for row in response.data:
                 results.append({
-                    "snippet_id": item["id"],
-                    "sentence_text": item["sentence_text"],
-                    "raw_item_id": raw_item.get("id"),
-                    "title": raw_item.get("title"),
-                    "url": raw_item.get("url"),
-                    "source_id": source.get("id"),
-                    "source_name": source.get("name"),
-                    "source_domain": source.get("domain"),
-                    "source_trust": source.get("trust_score", 0.5),
-                    "bm25_score": 0.7,
+                    "snippet_id": row["id"],
+                    "sentence_text": row["sentence_text"],
+                    "raw_item_id": row.get("raw_item_id"),
+                    "title": row.get("title"),
+                    "url": row.get("url"),
+                    "source_id": row.get("source_id"),
+                    "source_name": row.get("source_name"),
+                    "source_domain": row.get("source_domain"),
+                    "source_trust": row.get("trust_score", 0.5),
+                    "bm25_score": float(row["rank"]),
                 })
 
             return results
@@ -83,7 +159,92 @@ class HybridRetriever:
             logger.error(f"BM25 search error: {e}")
             return []
 
+    def _local_bm25_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """BM25 search over the embedded in-process index"""
+        index = get_local_bm25_index()
+        if index is None:
+            logger.warning("Local BM25 index unavailable, returning empty results")
+            return []
+        return index.search(query, top_k)
+
+    def _hydrate_local(self, hits) -> List[Dict[str, Any]]:
+        """Attach snippet metadata to dense hits from the local index"""
+        local_index = get_local_bm25_index()
+        if local_index is None:
+            return []
+
+        results = []
+        for snippet_id, score in hits:
+            doc = local_index.get_by_snippet_id(snippet_id)
+            if doc is None:
+                continue
+            result = dict(doc)
+            result["dense_score"] = score
+            results.append(result)
+        return results
+
+    def _bm25_search_local_rank(self, client, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """FTS match through PostgREST, ranked by query-term coverage"""
+        response = (
+            client.table("snippets")
+            .select(SNIPPET_SELECT)
+            .text_search("sentence_text", query, config="english")
+            .limit(top_k)
+            .execute()
+        )
+
+        results = []
+        for item in response.data:
+            result = flatten_snippet_row(item)
+            result["bm25_score"] = self._term_coverage(query, item["sentence_text"])
+            results.append(result)
+
+        results.sort(key=lambda r: r["bm25_score"], reverse=True)
+        return results
+
+    def _term_coverage(self, query: str, text: str) -> float:
+        """Fraction of query terms present in text"""
+        query_terms = set(re.findall(r"\w+", query.lower()))
+        if not query_terms:
+            return 0.0
+        text_terms = set(re.findall(r"\w+", text.lower()))
+        return len(query_terms & text_terms) / len(query_terms)
+
     def _dense_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
-        """Dense retrieval using embeddings"""
-        logger.warning("Dense search not yet implemented, returning empty results")
-        return []
+        """Dense retrieval using embeddings in the FAISS index"""
+        index = get_dense_index()
+        model = self.registry.get("embedding") if self.registry else None
+        if index is None or model is None:
+            logger.debug("Dense index or embedding model unavailable, skipping dense search")
+            return []
+
+        try:
+            hits = index.search(encode_texts(model, [query]), top_k)[0]
+            if not hits:
+                return []
+
+            if self.use_local_index:
+                return self._hydrate_local(hits)
+
+            client = db.get_client()
+            response = (
+                client.table("snippets")
+                .select(SNIPPET_SELECT)
+                .in_("id", [snippet_id for snippet_id, _ in hits])
+                .execute()
+            )
+            rows = {item["id"]: item for item in response.data}
+
+            results = []
+            for snippet_id, score in hits:
+                if snippet_id not in rows:
+                    continue
+                result = flatten_snippet_row(rows[snippet_id])
+                result["dense_score"] = score
+                results.append(result)
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Dense search error: {e}")
+            return []
@@ -1,44 +1,63 @@
 import time
+import asyncio
 import hashlib
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Any, Optional
+from prometheus_client import Histogram
+from app.core.config import settings
 from app.core.database import db
 from app.services.claim_extraction import ClaimExtractor
 from app.services.retrieval import HybridRetriever
-from app.services.nli import NLIService
+from app.services.nli import NLIService, get_nli_scheduler
 from app.services.scoring import ScoringService
+from app.services.verify_cache import get_verification_cache
+from app.services.nli_cache import get_stance_cache
+from app.services.near_duplicates import NEAR_DUP_LOOKUPS, fetch_claim_reports, get_near_duplicate_index
 from app.connectors.newsapi_connector import NewsAPIConnector
 import logging
 
 logger = logging.getLogger(__name__)
 
+VERIFY_FIRST_RESULT_SECONDS = Histogram(
+    "truthverse_verify_first_result_seconds",
+    "Time from request start to the first verified claim",
+)
+
+
+@lru_cache()
+def get_executor() -> ThreadPoolExecutor:
+    """Bounded pool for blocking retrieval and inference work"""
+    return ThreadPoolExecutor(
+        max_workers=settings.VERIFY_EXECUTOR_WORKERS, thread_name_prefix="verify"
+    )
+
 
 class VerificationService:
-    def __init__(self):
-        self.claim_extractor = ClaimExtractor()
-        self.retriever = HybridRetriever()
-        self.nli_service = NLIService()
+    def __init__(self, registry=None, cache=None, redis_client=None, stance_cache=None, scheduler=None):
+        self.claim_extractor = ClaimExtractor(registry)
+        self.retriever = HybridRetriever(registry)
+        if scheduler is None and registry is not None and settings.NLI_SCHEDULER_ENABLED:
+            scheduler = get_nli_scheduler(registry)
+        self.nli_service = NLIService(registry, cache=stance_cache or get_stance_cache(), scheduler=scheduler)
         self.scoring_service = ScoringService()
-        self.news_connector = NewsAPIConnector()
+        self.news_connector = NewsAPIConnector(cache_client=redis_client)
+        self.cache = cache or get_verification_cache()
+        self.near_duplicates = None
 
     async def verify_url(self, url: str) -> Dict[str, Any]:
         """Verify claims in a URL"""
         start_time = time.time()
 
         try:
-            item = self.news_connector.fetch_by_url(url)
-            if not item:
-                items = self.news_connector.search(url, page=1)
-                if items:
-                    item = items[0]
-
-            if not item:
+            text = await self._fetch_url_text(url)
+            if text is None:
                 return {
                     "claims": [],
                     "processing_time": time.time() - start_time,
                     "checked_sources": 0,
                 }
 
-            text = f"{item['title']} {item['body_text']}"
             return await self.verify_text(text)
 
         except Exception as e:
@@ -51,67 +70,396 @@ class VerificationService:
 
     async def verify_text(self, text: str) -> Dict[str, Any]:
         """Verify claims in text"""
+        results = {}
+        summary = {}
+        async for frame in self.verify_text_stream(text):
+            if frame["type"] == "claim":
+                results[frame["index"]] = frame["claim"]
+            elif frame["type"] == "summary":
+                summary = frame
+
+        return {
+            "claims": [results[index] for index in sorted(results)],
+            "processing_time": summary["processing_time"],
+            "checked_sources": summary["checked_sources"],
+        }
+
+    async def verify_url_stream(self, url: str) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming counterpart of verify_url"""
         start_time = time.time()
+        try:
+            text = await self._fetch_url_text(url)
+        except Exception as e:
+            logger.error(f"URL verification error: {e}")
+            text = None
+
+        if text is None:
+            yield {"type": "claims", "claims": []}
+            yield {"type": "summary", "processing_time": time.time() - start_time, "checked_sources": 0}
+            return
+
+        async for frame in self.verify_text_stream(text, start_time=start_time):
+            yield frame
+
+    async def verify_text_stream(
+        self, text: str, start_time: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Verify claims in text, yielding frames as work completes
+
+        Frames are, in order: one ``claims`` frame listing the extracted
+        claims, one ``claim`` frame per verified claim in completion order
+        (``index`` is its position in the claims frame), and a ``summary``
+        frame. Claims whose verification failed get no ``claim`` frame.
+        """
+        start_time = start_time or time.time()
+
+        loop = asyncio.get_running_loop()
+        ranked = await loop.run_in_executor(get_executor(), self.claim_extractor.rank_claims, text, 5)
+        claims = [candidate["claim_text"] for candidate in ranked]
+        hashes = [self.claim_extractor.compute_canonical_hash(c) for c in claims]
+        claim_by_hash = dict(zip(hashes, claims))
+        yield {
+            "type": "claims",
+            "claims": [
+                {
+                    "id": hashlib.md5(candidate["claim_text"].encode()).hexdigest(),
+                    "claim_text": candidate["claim_text"],
+                    "score": candidate["score"],
+                }
+                for candidate in ranked
+            ],
+        }
+
+        semaphore = asyncio.Semaphore(settings.VERIFY_MAX_CLAIMS_IN_FLIGHT)
+
+        async def compute(missing: List[str]) -> Dict[str, Dict[str, Any]]:
+            return await self._verify_claims(missing, claim_by_hash, semaphore)
+
+        async def resolve(canonical_hash: str):
+            entries = await self.cache.get_or_compute_many([canonical_hash], compute, executor=get_executor())
+            return canonical_hash, entries.get(canonical_hash)
+
+        indexes: Dict[str, List[int]] = {}
+        for index, canonical_hash in enumerate(hashes):
+            indexes.setdefault(canonical_hash, []).append(index)
+
+        entries: Dict[str, Dict[str, Any]] = {}
+        pending = [asyncio.ensure_future(resolve(h)) for h in indexes]
+        try:
+            for next_done in asyncio.as_completed(pending):
+                canonical_hash, entry = await next_done
+                if entry is None:
+                    continue
+                if not entries:
+                    VERIFY_FIRST_RESULT_SECONDS.observe(time.time() - start_time)
+                entries[canonical_hash] = entry
+                for index in indexes[canonical_hash]:
+                    claim_text = claims[index]
+                    yield {
+                        "type": "claim",
+                        "index": index,
+                        "claim": dict(
+                            entry["result"],
+                            id=hashlib.md5(claim_text.encode()).hexdigest(),
+                            claim_text=claim_text,
+                        ),
+                    }
+        finally:
+            for task in pending:
+                task.cancel()
+
         checked_sources = 0
+        for canonical_hash in hashes:
+            if canonical_hash in entries:
+                checked_sources = entries[canonical_hash]["checked_sources"]
 
-        claims = self.claim_extractor.extract_claims(text)
+        yield {
+            "type": "summary",
+            "processing_time": time.time() - start_time,
+            "checked_sources": checked_sources,
+        }
 
-        results = []
-        for claim_text in claims[:5]:
+    async def verify_batch(self, documents: List[Dict[str, Optional[str]]]) -> Dict[str, Any]:
+        """
+        Verify many documents in one pass
+
+        Each document is ``{"url": ..., "text": ...}``. Claim detection runs
+        one cascade over all documents, claims are deduplicated by canonical
+        hash across the whole batch, and NLI for every uncached
+        claim runs as one pooled get_stance_batch call. Results are returned
+        in document order.
+        """
+        start_time = time.time()
+
+        async def document_text(document) -> Optional[str]:
+            if document.get("text"):
+                return document["text"]
             try:
-                snippets = self.retriever.retrieve_hybrid(claim_text, top_k=20)
-                checked_sources = len(set(s.get("source_id") for s in snippets))
-
-                evidence_items = []
-                supporting = []
-                contradicting = []
-
-                for snippet in snippets[:10]:
-                    stance_result = self.nli_service.get_stance(
-                        claim_text, snippet["sentence_text"]
-                    )
-
-                    evidence_items.append({
-                        "snippet": snippet["sentence_text"],
-                        "source": snippet.get("source_name", "Unknown"),
-                        "stance": stance_result["stance"],
-                        "nli_conf": stance_result["score"],
-                        "url": snippet.get("url"),
-                    })
-
-                    if stance_result["stance"] == "support":
-                        supporting.append({
-                            "stance": stance_result["stance"],
-                            "nli_conf": stance_result["score"],
-                            "source_trust": snippet.get("source_trust", 0.5),
-                        })
-                    elif stance_result["stance"] == "contradict":
-                        contradicting.append({
-                            "stance": stance_result["stance"],
-                            "nli_conf": stance_result["score"],
-                            "source_trust": snippet.get("source_trust", 0.5),
-                        })
-
-                score_result = self.scoring_service.compute_score(
-                    supporting=supporting,
-                    contradicting=contradicting,
+                return await self._fetch_url_text(document["url"])
+            except Exception as e:
+                logger.error(f"URL verification error: {e}")
+                return None
+
+        texts = await asyncio.gather(*(document_text(d) for d in documents))
+
+        ranked = await asyncio.get_running_loop().run_in_executor(
+            get_executor(), self.claim_extractor.rank_claims_many, [text or "" for text in texts], 5
+        )
+
+        document_claims: List[List[str]] = []
+        claim_by_hash: Dict[str, str] = {}
+        for candidates in ranked:
+            claims = [candidate["claim_text"] for candidate in candidates]
+            document_claims.append(claims)
+            for claim_text in claims:
+                claim_by_hash.setdefault(self.claim_extractor.compute_canonical_hash(claim_text), claim_text)
+
+        async def compute(missing: List[str]) -> Dict[str, Dict[str, Any]]:
+            return await self._verify_claims_pooled(missing, claim_by_hash)
+
+        entries = await self.cache.get_or_compute_many(list(claim_by_hash), compute, executor=get_executor())
+
+        results = []
+        for claims in document_claims:
+            claim_results = []
+            checked_sources = 0
+            for claim_text in claims:
+                entry = entries.get(self.claim_extractor.compute_canonical_hash(claim_text))
+                if entry is None:
+                    continue
+                checked_sources = entry["checked_sources"]
+                claim_results.append(dict(
+                    entry["result"],
+                    id=hashlib.md5(claim_text.encode()).hexdigest(),
+                    claim_text=claim_text,
+                ))
+            results.append({"claims": claim_results, "checked_sources": checked_sources})
+
+        return {
+            "results": results,
+            "unique_claims": len(claim_by_hash),
+            "processing_time": time.time() - start_time,
+        }
+
+    async def _fetch_url_text(self, url: str) -> Optional[str]:
+        """Article text for a URL via the news connector, or None"""
+        item = await self.news_connector.fetch_by_url(url)
+        if not item:
+            items = await self.news_connector.search(url, page=1)
+            if items:
+                item = items[0]
+
+        if not item:
+            return None
+        return f"{item['title']} {item['body_text']}"
+
+    async def _verify_claims(
+        self,
+        hashes: List[str],
+        claim_by_hash: Dict[str, str],
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Verify claims missing from cache concurrently
+
+        Each claim's retrieval runs on the shared executor so the event loop
+        stays free, with at most VERIFY_MAX_CLAIMS_IN_FLIGHT retrievals per
+        request at once; its NLI pairs then join the cross-request scheduler.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = semaphore or asyncio.Semaphore(settings.VERIFY_MAX_CLAIMS_IN_FLIGHT)
+
+        entries = await loop.run_in_executor(
+            get_executor(), self._reuse_near_duplicates, hashes, claim_by_hash
+        )
+        hashes = [h for h in hashes if h not in entries]
+
+        async def run(canonical_hash: str) -> Dict[str, Any]:
+            claim_text = claim_by_hash[canonical_hash]
+            async with semaphore:
+                snippets, checked = await loop.run_in_executor(
+                    get_executor(), self._retrieve_evidence, claim_text
                 )
+            stances = await self.nli_service.get_stance_batch_async(
+                [(claim_text, snippet["sentence_text"]) for snippet in snippets],
+                keys=self._stance_keys(claim_text, snippets),
+                executor=get_executor(),
+            )
+            return {
+                "result": self._build_claim_result(claim_text, snippets, stances),
+                "checked_sources": checked,
+            }
 
-                results.append({
-                    "id": hashlib.md5(claim_text.encode()).hexdigest(),
-                    "claim_text": claim_text,
-                    "cred_score": score_result["cred_score"],
-                    "label": score_result["label"],
-                    "explain_text": score_result["explanation"],
-                    "evidence": evidence_items[:5],
-                })
+        outcomes = await asyncio.gather(*(run(h) for h in hashes), return_exceptions=True)
 
-            except Exception as e:
-                logger.error(f"Claim verification error: {e}")
+        for canonical_hash, outcome in zip(hashes, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Claim verification error: {outcome}")
+                continue
+            entries[canonical_hash] = outcome
+        return entries
+
+    async def _verify_claims_pooled(
+        self, hashes: List[str], claim_by_hash: Dict[str, str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Verify many claims with one NLI call over all their evidence pairs
+
+        Retrieval still runs per claim on the executor; the stance pairs of
+        every claim are then classified together so the NLI batches fill up.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(settings.VERIFY_MAX_CLAIMS_IN_FLIGHT)
+
+        entries = await loop.run_in_executor(
+            get_executor(), self._reuse_near_duplicates, hashes, claim_by_hash
+        )
+        hashes = [h for h in hashes if h not in entries]
+
+        async def retrieve(canonical_hash: str):
+            async with semaphore:
+                return await loop.run_in_executor(
+                    get_executor(), self._retrieve_evidence, claim_by_hash[canonical_hash]
+                )
+
+        outcomes = await asyncio.gather(*(retrieve(h) for h in hashes), return_exceptions=True)
+
+        retrieved = {}
+        pairs = []
+        keys = []
+        for canonical_hash, outcome in zip(hashes, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Claim retrieval error: {outcome}")
+                continue
+            retrieved[canonical_hash] = (len(pairs), outcome)
+            claim_text = claim_by_hash[canonical_hash]
+            pairs.extend((claim_text, snippet["sentence_text"]) for snippet in outcome[0])
+            keys.extend(self._stance_keys(claim_text, outcome[0]) or [None] * len(outcome[0]))
+
+        stances = await self.nli_service.get_stance_batch_async(
+            pairs,
+            keys=keys if None not in keys else None,
+            executor=get_executor(),
+        )
+
+        for canonical_hash, (offset, (snippets, checked)) in retrieved.items():
+            entries[canonical_hash] = {
+                "result": self._build_claim_result(
+                    claim_by_hash[canonical_hash],
+                    snippets,
+                    stances[offset:offset + len(snippets)],
+                ),
+                "checked_sources": checked,
+            }
+        return entries
+
+    def _reuse_near_duplicates(
+        self, hashes: List[str], claim_by_hash: Dict[str, str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Results for claims that paraphrase an already verified claim
+
+        Claims whose nearest neighbour in the near-duplicate index clears
+        NEAR_DUP_THRESHOLD reuse that claim's stored claim_reports row
+        instead of running retrieval and NLI. The result has no evidence of
+        its own, so it is marked with the matched claim and kept out of the
+        verification cache; the next lookup re-checks the index.
+        """
+        index = self.near_duplicates if self.near_duplicates is not None else get_near_duplicate_index()
+        if index is None or not hashes:
+            return {}
+
+        matches = {}
+        for canonical_hash in hashes:
+            match = index.query(claim_by_hash[canonical_hash])
+            NEAR_DUP_LOOKUPS.labels(result="hit" if match else "miss").inc()
+            if match:
+                matches[canonical_hash] = match
+        if not matches:
+            return {}
+
+        try:
+            reports = fetch_claim_reports(db.get_client(), [claim_id for claim_id, _ in matches.values()])
+        except Exception as e:
+            logger.error(f"Near-duplicate report lookup error: {e}")
+            return {}
+
+        entries = {}
+        for canonical_hash, (claim_id, similarity) in matches.items():
+            report = reports.get(claim_id)
+            if report is None:
                 continue
+            entries[canonical_hash] = {
+                "result": {
+                    "cred_score": report["cred_score"],
+                    "label": report["label"],
+                    "explain_text": report["explain_text"],
+                    "evidence": [],
+                    "near_duplicate_of": {"claim_id": claim_id, "similarity": round(similarity, 3)},
+                },
+                "checked_sources": 0,
+                "cacheable": False,
+            }
+        return entries
+
+    def _retrieve_evidence(self, claim_text: str):
+        """Top evidence snippets for a claim and the number of sources checked"""
+        snippets = self.retriever.retrieve_hybrid(claim_text, top_k=20)
+        checked = len(set(s.get("source_id") for s in snippets))
+        return snippets[:10], checked
+
+    def _stance_keys(self, claim_text: str, snippets: List[Dict[str, Any]]) -> Optional[List[tuple]]:
+        """Stance cache keys for a claim's snippets, or None if any snippet lacks an id"""
+        if any(not snippet.get("snippet_id") for snippet in snippets):
+            return None
+        claim_hash = self.claim_extractor.compute_canonical_hash(claim_text)
+        return [(claim_hash, snippet["snippet_id"]) for snippet in snippets]
+
+    def _build_claim_result(
+        self,
+        claim_text: str,
+        snippets: List[Dict[str, Any]],
+        stances: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Score a claim from its snippets and their NLI stances"""
+        evidence_items = []
+        supporting = []
+        contradicting = []
+
+        for snippet, stance_result in zip(snippets, stances):
+            evidence_items.append({
+                "snippet": snippet["sentence_text"],
+                "source": snippet.get("source_name", "Unknown"),
+                "stance": stance_result["stance"],
+                "nli_conf": stance_result["score"],
+                "nli_tier": stance_result.get("tier"),
+                "url": snippet.get("url"),
+            })
+
+            if stance_result["stance"] == "support":
+                supporting.append({
+                    "stance": stance_result["stance"],
+                    "nli_conf": stance_result["score"],
+                    "source_trust": snippet.get("source_trust", 0.5),
+                })
+            elif stance_result["stance"] == "contradict":
+                contradicting.append({
+                    "stance": stance_result["stance"],
+                    "nli_conf": stance_result["score"],
+                    "source_trust": snippet.get("source_trust", 0.5),
+                })
+
+        score_result = self.scoring_service.compute_score(
+            supporting=supporting,
+            contradicting=contradicting,
+        )
 
         return {
-            "claims": results,
-            "processing_time": time.time() - start_time,
-            "checked_sources": checked_sources,
+            "id": hashlib.md5(claim_text.encode()).hexdigest(),
+            "claim_text": claim_text,
+            "cred_score": score_result["cred_score"],
+            "label": score_result["label"],
+            "explain_text": score_result["explanation"],
+            "evidence": evidence_items[:5],
         }
@@ -0,0 +1,281 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Executor
+from functools import lru_cache
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import uuid
+from prometheus_client import Counter
+from app.core.cache import RedisTier, optional_redis_client
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+VERIFY_CACHE_HITS = Counter(
+    "truthverse_verify_cache_hits_total",
+    "Per-claim verification results served from cache",
+    ["tier"],
+)
+VERIFY_CACHE_MISSES = Counter(
+    "truthverse_verify_cache_misses_total",
+    "Per-claim verification results that ran the pipeline",
+)
+VERIFY_CACHE_COALESCED = Counter(
+    "truthverse_verify_cache_coalesced_total",
+    "Per-claim lookups that waited on an in-flight verification",
+)
+
+# Delete the lock only while it still holds our token, in one round trip
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def pipeline_version() -> str:
+    """Version tag of everything that changes a verification result"""
+    parts = [
+        settings.nli_model_id,
+        settings.EMBEDDING_MODEL,
+        str(settings.SCORE_VERIFIED_MIN),
+        str(settings.SCORE_FAKE_MAX),
+    ]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+
+class LocalLRU:
+    """Thread-safe in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class VerificationCache:
+    """Two-tier (in-process LRU, then Redis) cache of per-claim verification results
+
+    Keys combine the claim canonical hash with pipeline_version(), so a model
+    or threshold change starts from an empty cache. Misses are single-flight:
+    concurrent lookups for the same claim wait for one computation, within a
+    process via shared futures and across processes via a Redis lock.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, redis_client=None, local_size: Optional[int] = None, ttl: Optional[int] = None):
+        self.redis = RedisTier(redis_client, "Verify cache")
+        self.ttl = ttl or settings.CACHE_TTL_VERIFY
+        self.local = LocalLRU(local_size or settings.VERIFY_CACHE_LOCAL_SIZE, self.ttl)
+        self.version = pipeline_version()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _key(self, canonical_hash: str) -> str:
+        return f"verify:{self.version}:{canonical_hash}"
+
+    def get(self, canonical_hash: str) -> Optional[Dict[str, Any]]:
+        """Cached result from the local tier, then Redis"""
+        key = self._key(canonical_hash)
+        value = self.local.get(key)
+        if value is not None:
+            VERIFY_CACHE_HITS.labels(tier="local").inc()
+            return value
+
+        value = self._redis_get(key)
+        if value is not None:
+            VERIFY_CACHE_HITS.labels(tier="redis").inc()
+            self.local.set(key, value)
+        return value
+
+    def set(self, canonical_hash: str, value: Dict[str, Any]):
+        key = self._key(canonical_hash)
+        self.local.set(key, value)
+        self.redis.call("set", lambda r: r.setex(key, self.ttl, json.dumps(value)))
+
+    async def get_or_compute_many(
+        self,
+        canonical_hashes: List[str],
+        compute: Callable[[List[str]], Awaitable[Dict[str, Dict[str, Any]]]],
+        executor: Optional[Executor] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve results for many claims, computing only true misses
+
+        `compute` receives the hashes this caller must verify and returns a
+        result per hash; hashes it omits are treated as failures and are not
+        cached. Results with ``"cacheable": False`` are returned to this call
+        and its waiters but not stored. Redis calls run on `executor`.
+        """
+        loop = asyncio.get_running_loop()
+        results: Dict[str, Dict[str, Any]] = {}
+        leading: List[str] = []
+        local_waits: Dict[str, asyncio.Future] = {}
+        remote_waits: List[str] = []
+        locks: Dict[str, str] = {}
+
+        unique = list(dict.fromkeys(canonical_hashes))
+        cached = await loop.run_in_executor(executor, self._get_many, unique)
+        misses = []
+        for canonical_hash in unique:
+            if canonical_hash in cached:
+                results[canonical_hash] = cached[canonical_hash]
+            elif canonical_hash in self._inflight:
+                VERIFY_CACHE_COALESCED.inc()
+                local_waits[canonical_hash] = self._inflight[canonical_hash]
+            else:
+                misses.append(canonical_hash)
+
+        tokens = await loop.run_in_executor(executor, self._acquire_locks, misses) if misses else {}
+        redundant: Dict[str, str] = {}
+        for canonical_hash in misses:
+            # Other lookups may have started or finished this claim while the locks were taken
+            value = self.local.get(self._key(canonical_hash))
+            token = tokens[canonical_hash]
+            if value is not None or canonical_hash in self._inflight:
+                if token is not None:
+                    redundant[canonical_hash] = token
+                if value is not None:
+                    results[canonical_hash] = value
+                else:
+                    VERIFY_CACHE_COALESCED.inc()
+                    local_waits[canonical_hash] = self._inflight[canonical_hash]
+            elif token is None:
+                VERIFY_CACHE_COALESCED.inc()
+                remote_waits.append(canonical_hash)
+            else:
+                locks[canonical_hash] = token
+                self._inflight[canonical_hash] = loop.create_future()
+                leading.append(canonical_hash)
+        if redundant:
+            await loop.run_in_executor(executor, self._publish, {}, redundant)
+
+        if leading:
+            VERIFY_CACHE_MISSES.inc(len(leading))
+            computed: Dict[str, Dict[str, Any]] = {}
+            try:
+                computed = await compute(leading)
+            except Exception as e:
+                logger.error(f"Verification compute error: {e}")
+            finally:
+                stored = {}
+                for canonical_hash in leading:
+                    value = computed.get(canonical_hash)
+                    if value is not None:
+                        if value.get("cacheable", True):
+                            self.local.set(self._key(canonical_hash), value)
+                            stored[canonical_hash] = value
+                        results[canonical_hash] = value
+                    future = self._inflight.pop(canonical_hash)
+                    if not future.done():
+                        future.set_result(value)
+                # Shielded so a cancelled request still publishes and unlocks
+                await asyncio.shield(loop.run_in_executor(executor, self._publish, stored, locks))
+
+        for canonical_hash, future in local_waits.items():
+            value = await asyncio.shield(future)
+            if value is not None:
+                results[canonical_hash] = value
+
+        for canonical_hash in remote_waits:
+            value = await self._wait_for_remote(canonical_hash, executor)
+            if value is None:
+                value = (await self.get_or_compute_many([canonical_hash], compute, executor)).get(canonical_hash)
+            if value is not None:
+                results[canonical_hash] = value
+
+        return results
+
+    def _get_many(self, canonical_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        values = {h: self.get(h) for h in canonical_hashes}
+        return {h: value for h, value in values.items() if value is not None}
+
+    def _acquire_locks(self, canonical_hashes: List[str]) -> Dict[str, Optional[str]]:
+        return {h: self._acquire_lock(h) for h in canonical_hashes}
+
+    def _publish(self, values: Dict[str, Dict[str, Any]], locks: Dict[str, str]):
+        """Write computed results to Redis, then release their locks"""
+        for canonical_hash, value in values.items():
+            key = self._key(canonical_hash)
+            self.redis.call("set", lambda r: r.setex(key, self.ttl, json.dumps(value)))
+        for canonical_hash, token in locks.items():
+            self._release_lock(canonical_hash, token)
+
+    def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
+        cached = self.redis.call("get", lambda r: r.get(key))
+        return json.loads(cached) if cached else None
+
+    def _acquire_lock(self, canonical_hash: str) -> Optional[str]:
+        """Take the cross-process compute lock; returns None if another process holds it"""
+        token = uuid.uuid4().hex
+        acquired = self.redis.call(
+            "lock",
+            lambda r: r.set(
+                f"{self._key(canonical_hash)}:lock",
+                token,
+                nx=True,
+                ex=settings.VERIFY_CACHE_LOCK_TTL,
+            ),
+            default=True,
+        )
+        return token if acquired else None
+
+    def _release_lock(self, canonical_hash: str, token: str):
+        lock_key = f"{self._key(canonical_hash)}:lock"
+        self.redis.call("unlock", lambda r: r.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token))
+
+    def _poll_remote(self, key: str):
+        """(cached value, whether the lock is still held)"""
+        value = self._redis_get(key)
+        if value is not None:
+            return value, True
+        return None, bool(self.redis.call("exists", lambda r: r.exists(f"{key}:lock")))
+
+    async def _wait_for_remote(self, canonical_hash: str, executor: Optional[Executor] = None) -> Optional[Dict[str, Any]]:
+        """Poll Redis while another process computes the result"""
+        loop = asyncio.get_running_loop()
+        key = self._key(canonical_hash)
+        deadline = time.monotonic() + settings.VERIFY_CACHE_LOCK_TTL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            value, locked = await loop.run_in_executor(executor, self._poll_remote, key)
+            if value is not None:
+                self.local.set(key, value)
+                return value
+            if not locked:
+                return None
+        return None
+
+
+@lru_cache()
+def get_verification_cache() -> VerificationCache:
+    """Process-wide verification cache"""
+    return VerificationCache(optional_redis_client("verification cache"))
@@ -0,0 +1,50 @@
+from celery import Celery
+from celery.signals import worker_ready
+from prometheus_client import start_http_server
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+celery_app = Celery(
+    "truthverse",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.workers.tasks"],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_eager_propagates=True,
+    task_routes={
+        "app.workers.tasks.embed_snippets": {"queue": "indexing"},
+    },
+    beat_schedule={
+        "ingest-recent": {
+            "task": "app.workers.tasks.ingest_recent",
+            "schedule": settings.INGEST_INTERVAL_SECONDS,
+        },
+        "index-new-reports": {
+            "task": "app.workers.tasks.index_new_reports",
+            "schedule": settings.NEAR_DUP_INDEX_INTERVAL_SECONDS,
+        },
+        "reconcile-report-counts": {
+            "task": "app.workers.tasks.reconcile_report_counts",
+            "schedule": settings.REPORT_COUNTS_RECONCILE_SECONDS,
+        },
+    },
+)
+
+
+@worker_ready.connect
+def start_metrics_server(**kwargs):
+    """Expose ingestion metrics from the worker process"""
+    if settings.PROMETHEUS_ENABLED and settings.WORKER_METRICS_PORT:
+        start_http_server(settings.WORKER_METRICS_PORT)
+        logger.info(f"Worker metrics on :{settings.WORKER_METRICS_PORT}/metrics")
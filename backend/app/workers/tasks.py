@@ -0,0 +1,267 @@
+from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+import asyncio
+import fcntl
+import json
+import os
+import time
+from prometheus_client import Counter, Histogram
+from app.core.config import settings
+from app.core.database import db
+from app.core.model_registry import ModelRegistry
+from app.connectors.base import ConnectorError
+from app.connectors.http import HTTPClient
+from app.connectors.newsapi_connector import NewsAPIConnector
+from app.connectors.google_factcheck_connector import GoogleFactCheckConnector
+from app.services.dense_index import DenseIndex, encode_texts
+from app.services.ingestion import IngestionWriter, chunked
+from app.services.near_duplicates import NearDuplicateIndex
+from app.services.report_counters import get_report_counters
+from .celery_app import celery_app
+import logging
+
+logger = logging.getLogger(__name__)
+
+CONNECTORS = {
+    "newsapi": NewsAPIConnector,
+    "google_factcheck": GoogleFactCheckConnector,
+}
+
+INGEST_ITEMS = Counter(
+    "truthverse_ingest_items_total",
+    "Items processed per ingestion stage",
+    ["stage"],
+)
+INGEST_STAGE_SECONDS = Histogram(
+    "truthverse_ingest_stage_seconds",
+    "Time spent per ingestion task, by stage",
+    ["stage"],
+)
+
+_registry: Optional[ModelRegistry] = None
+
+
+def get_worker_registry() -> ModelRegistry:
+    """Models for this worker process, loaded on first use"""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
+
+
+@contextmanager
+def _stage(name: str):
+    """Time a stage and log its throughput; callers add to `counter[0]`"""
+    counter = [0]
+    start = time.perf_counter()
+    try:
+        yield counter
+    finally:
+        elapsed = time.perf_counter() - start
+        INGEST_STAGE_SECONDS.labels(stage=name).observe(elapsed)
+        INGEST_ITEMS.labels(stage=name).inc(counter[0])
+        if counter[0]:
+            logger.info(f"{name}: {counter[0]} items in {elapsed:.2f}s ({counter[0] / elapsed:.1f}/s)")
+
+
+@contextmanager
+def _index_lock(index_dir: str):
+    """Serialise index appends across worker processes"""
+    os.makedirs(index_dir, exist_ok=True)
+    with open(os.path.join(index_dir, ".lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+async def _fetch_recent(connector_name: str, window_days: int, page: int) -> List[Dict[str, Any]]:
+    http_client = HTTPClient()
+    try:
+        connector = CONNECTORS[connector_name](http_client=http_client)
+        return await connector.fetch_recent(window_days=window_days, page=page)
+    finally:
+        await http_client.aclose()
+
+
+@celery_app.task(name="app.workers.tasks.ingest_recent")
+def ingest_recent(window_days: int = 1, max_pages: Optional[int] = None) -> int:
+    """Fan out one fetch task per connector page"""
+    max_pages = max_pages or settings.INGEST_MAX_PAGES
+    scheduled = 0
+    for connector_name in CONNECTORS:
+        for page in range(1, max_pages + 1):
+            fetch_page.delay(connector_name, window_days, page)
+            scheduled += 1
+    return scheduled
+
+
+@celery_app.task(
+    name="app.workers.tasks.fetch_page",
+    autoretry_for=(ConnectorError,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def fetch_page(connector_name: str, window_days: int, page: int) -> int:
+    """Pull one fetch_recent page and hand it to store_items"""
+    with _stage("fetch") as counter:
+        items = asyncio.run(_fetch_recent(connector_name, window_days, page))
+        counter[0] = len(items)
+
+    if items:
+        store_items.delay(items)
+    return len(items)
+
+
+@celery_app.task(
+    name="app.workers.tasks.store_items",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def store_items(items: List[Dict[str, Any]]) -> int:
+    """Dedupe by URL, store raw_items and snippets, enqueue embedding batches"""
+    with _stage("store") as counter:
+        snippet_ids = IngestionWriter().write_items(items)
+        counter[0] = len(snippet_ids)
+
+    for batch in chunked(snippet_ids, settings.INGEST_EMBED_BATCH_SIZE):
+        embed_snippets.delay(list(batch))
+    return len(snippet_ids)
+
+
+@celery_app.task(
+    name="app.workers.tasks.embed_snippets",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def embed_snippets(snippet_ids: List[str]) -> int:
+    """Encode snippets, append them to the dense index and record embeddings rows"""
+    client = db.get_service_client()
+
+    embedded = client.table("embeddings").select("snippet_id").in_("snippet_id", snippet_ids).execute()
+    done = {row["snippet_id"] for row in embedded.data}
+    pending = [snippet_id for snippet_id in snippet_ids if snippet_id not in done]
+    if not pending:
+        return 0
+
+    model = get_worker_registry().get("embedding")
+    if model is None:
+        raise RuntimeError("Embedding model unavailable")
+
+    with _stage("embed") as counter:
+        rows = client.table("snippets").select("id, sentence_text").in_("id", pending).execute().data
+        vectors = encode_texts(model, [row["sentence_text"] for row in rows])
+        counter[0] = len(rows)
+
+    with _stage("index") as counter, _index_lock(settings.DENSE_INDEX_DIR):
+        index = DenseIndex.load(settings.DENSE_INDEX_DIR, mmap=False)
+        ids = [row["id"] for row in rows]
+        if index is None:
+            index = DenseIndex.build(settings.DENSE_INDEX_DIR, ids, vectors)
+        else:
+            # A retry after a failed upsert finds its vectors already saved
+            indexed = index.positions(ids)
+            new = [offset for offset, snippet_id in enumerate(ids) if snippet_id not in indexed]
+            index.add([ids[offset] for offset in new], vectors[new])
+        positions = index.positions(ids)
+
+        client.table("embeddings").upsert(
+            [
+                {"snippet_id": snippet_id, "vector_path": index.vector_path(positions[snippet_id])}
+                for snippet_id in ids
+            ],
+            on_conflict="snippet_id",
+        ).execute()
+        counter[0] = len(ids)
+
+    return len(ids)
+
+
+NEAR_DUP_WATERMARK_FILE = "reports_indexed_until.json"
+
+
+def _read_watermark(index_dir: str) -> Optional[List[str]]:
+    """(created_at, id) of the newest claim report already handed to index_claims"""
+    try:
+        with open(os.path.join(index_dir, NEAR_DUP_WATERMARK_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_watermark(index_dir: str, watermark: List[str]):
+    os.makedirs(index_dir, exist_ok=True)
+    path = os.path.join(index_dir, NEAR_DUP_WATERMARK_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(watermark, f)
+    os.replace(f"{path}.tmp", path)
+
+
+@celery_app.task(name="app.workers.tasks.index_new_reports")
+def index_new_reports(page_size: int = 500) -> int:
+    """
+    Enqueue index_claims for claims whose reports landed since the last run
+
+    Reports are keyset-paged on (created_at, id) from a watermark kept next
+    to the index, which only advances once a page has been handed off.
+    """
+    client = db.get_service_client()
+    watermark = _read_watermark(settings.NEAR_DUP_INDEX_DIR)
+    scheduled = 0
+    while True:
+        query = client.table("claim_reports").select("id, claim_id, created_at")
+        if watermark:
+            created_at, report_id = watermark
+            query = query.or_(
+                f'created_at.gt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.gt.{report_id})'
+            )
+        rows = query.order("created_at").order("id").limit(page_size).execute().data
+        if not rows:
+            break
+
+        index_claims.delay(list(dict.fromkeys(row["claim_id"] for row in rows)))
+        scheduled += len(rows)
+        watermark = [rows[-1]["created_at"], rows[-1]["id"]]
+        _write_watermark(settings.NEAR_DUP_INDEX_DIR, watermark)
+        if len(rows) < page_size:
+            break
+    return scheduled
+
+
+@celery_app.task(
+    name="app.workers.tasks.index_claims",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def index_claims(claim_ids: List[str]) -> int:
+    """Add newly reported claims to the near-duplicate index"""
+    client = db.get_service_client()
+    rows = (
+        client.table("claims")
+        .select("id, claim_text, claim_reports!inner(id)")
+        .in_("id", claim_ids)
+        .execute()
+        .data
+    )
+    if not rows:
+        return 0
+
+    with _stage("near_dup_index") as counter, _index_lock(settings.NEAR_DUP_INDEX_DIR):
+        index = NearDuplicateIndex.load(settings.NEAR_DUP_INDEX_DIR) or NearDuplicateIndex(settings.NEAR_DUP_INDEX_DIR)
+        counter[0] = index.add([row["id"] for row in rows], [row["claim_text"] for row in rows])
+        if counter[0]:
+            index.save()
+    return counter[0]
+
+
+@celery_app.task(name="app.workers.tasks.reconcile_report_counts")
+def reconcile_report_counts() -> int:
+    """Rebuild the moderation queue's Redis report counters from the reports table"""
+    with _stage("report_counts") as counter:
+        counter[0] = get_report_counters().reconcile(db.get_service_client())
+    return counter[0]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark claim extraction: legacy per-pattern rules vs the single-pass matcher
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import random
+import re
+import time
+from app.services.claim_extraction import ClaimExtractor
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "study report data shows researchers found patients trial results nations "
+    "climate emissions vaccine health officials percent million increase decrease "
+    "according to government agency analysis evidence sources confirmed the a of "
+    "in and was were is said on with by COVID WHO 12 95% 3 2023"
+).split()
+
+LEGACY_PATTERNS = [
+    r'\b\d+%',
+    r'\b\d+\s+(percent|million|billion|thousand)',
+    r'\b(proven|shows|demonstrates|reveals|indicates|suggests|found)\b',
+    r'\b(increases|decreases|reduces|improves|causes|prevents)\b',
+    r'\b(according to|study|research|report|data)\b',
+]
+
+
+def legacy_extract_claims(text: str, max_claims: int) -> list:
+    """The extraction rules as they were before the single-pass matcher"""
+    text = text.replace('\n', ' ').strip()
+    sentences = [s.strip() for s in re.split(r'[.!?]+', text) if len(s.strip()) > 20]
+    claims = []
+    for sentence in sentences:
+        sentence_lower = sentence.lower()
+        if any(re.search(p, sentence_lower) for p in LEGACY_PATTERNS) or any(
+            entity in sentence for entity in ['COVID', 'WHO', 'FDA', 'UN']
+        ):
+            claims.append(re.sub(r'\s+', ' ', sentence.lower().strip()))
+        if len(claims) >= max_claims:
+            break
+    return claims
+
+
+def make_corpus(megabytes: float, seed: int = 7):
+    """Synthetic articles of 5-60 sentences until the corpus reaches `megabytes`"""
+    rng = random.Random(seed)
+    docs, size = [], 0
+    while size < megabytes * 1_000_000:
+        sentences = [
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 25)))
+            for _ in range(rng.randint(5, 60))
+        ]
+        doc = ". ".join(sentences) + ".\n"
+        docs.append(doc)
+        size += len(doc)
+    return docs
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, default=8.0, help="Corpus size")
+    parser.add_argument("--max-claims", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    docs = make_corpus(args.megabytes)
+    size_mb = sum(len(doc) for doc in docs) / 1_000_000
+    extractor = ClaimExtractor()
+
+    legacy, legacy_elapsed = timed(lambda: [legacy_extract_claims(d, args.max_claims) for d in docs])
+    single, single_elapsed = timed(lambda: [extractor.extract_claims(d, args.max_claims) for d in docs])
+    bulk, bulk_elapsed = timed(
+        lambda: extractor.extract_claims_bulk(docs, args.max_claims, processes=args.processes)
+    )
+    uncapped_legacy, uncapped_legacy_elapsed = timed(lambda: [legacy_extract_claims(d, 10**9) for d in docs])
+    uncapped, uncapped_elapsed = timed(lambda: [extractor.extract_claims(d, 10**9) for d in docs])
+
+    print(f"corpus:            {len(docs)} docs, {size_mb:.1f} MB")
+    print(f"legacy:            {size_mb / legacy_elapsed:8.2f} MB/sec")
+    print(f"single-pass:       {size_mb / single_elapsed:8.2f} MB/sec ({legacy_elapsed / single_elapsed:.1f}x)")
+    print(f"bulk ({args.processes} procs):    {size_mb / bulk_elapsed:8.2f} MB/sec ({legacy_elapsed / bulk_elapsed:.1f}x)")
+    print(f"no claim cap:      {uncapped_legacy_elapsed / uncapped_elapsed:8.1f}x over legacy")
+    print(f"identical output:  {legacy == single == bulk and uncapped_legacy == uncapped}")
+
+
+if __name__ == "__main__":
+    main()
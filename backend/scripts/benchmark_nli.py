@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-pair vs batched NLI stance inference
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import random
+import time
+from app.core.config import settings
+from app.services.nli import NLIService
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CLAIMS = [
+    "AI improves healthcare diagnostics by 95%",
+    "195 nations committed to emissions reductions",
+    "The new vaccine prevents severe illness in older adults",
+    "Unemployment fell to 3.5 percent last quarter",
+    "According to the WHO, malaria cases decreased in 2023",
+]
+
+WORDS = (
+    "study report data shows researchers found patients trial results nations "
+    "climate emissions vaccine health officials percent million increase decrease "
+    "according government agency analysis evidence sources confirmed"
+).split()
+
+
+def make_pairs(n_pairs: int, seed: int = 13):
+    """Build synthetic (claim, snippet) pairs of varying length"""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(n_pairs):
+        claim = rng.choice(CLAIMS)
+        snippet = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 60)))
+        pairs.append((claim, snippet))
+    return pairs
+
+
+def run_loop(service: NLIService, pairs):
+    return [service.get_stance(claim, evidence) for claim, evidence in pairs]
+
+
+def run_batch(service: NLIService, pairs, batch_size: int):
+    return service.get_stance_batch(pairs, batch_size=batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=50, help="Pairs per request")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed repetitions")
+    parser.add_argument("--batch-size", type=int, default=settings.NLI_BATCH_SIZE)
+    args = parser.parse_args()
+
+    service = NLIService()
+    if not service.model:
+        logger.error("NLI model not loaded; benchmark would only time the fallback")
+        sys.exit(1)
+
+    pairs = make_pairs(args.pairs)
+
+    run_batch(service, pairs[:2], args.batch_size)
+
+    loop_elapsed = 0.0
+    batch_elapsed = 0.0
+    mismatches = 0
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        loop_results = run_loop(service, pairs)
+        loop_elapsed += time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_results = run_batch(service, pairs, args.batch_size)
+        batch_elapsed += time.perf_counter() - start
+
+        mismatches += sum(
+            a["stance"] != b["stance"] for a, b in zip(loop_results, batch_results)
+        )
+
+    total = args.pairs * args.repeats
+    loop_rate = total / loop_elapsed
+    batch_rate = total / batch_elapsed
+
+    print(f"model:           {settings.NLI_MODEL}")
+    print(f"pairs/request:   {args.pairs}  batch_size: {args.batch_size}")
+    print(f"per-pair loop:   {loop_rate:8.1f} pairs/sec")
+    print(f"batched:         {batch_rate:8.1f} pairs/sec")
+    print(f"speedup:         {batch_rate / loop_rate:8.2f}x")
+    print(f"stance mismatches: {mismatches}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark the int8 ONNX Runtime NLI backend against the transformers pipeline
+
+Each backend runs in a fresh process so its peak resident memory is measured
+alone. Reports load time, batch latency, throughput, peak RSS (total, and the
+growth from loading and running the model) and how often the two backends
+agree on the stance label.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import multiprocessing
+import resource
+import statistics
+import time
+from app.core.config import settings
+from app.core.model_registry import ModelRegistry
+from app.services.nli import NLIService
+from app.services.onnx_nli import export_quantized_nli, load_onnx_nli
+from benchmark_nli import make_pairs
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_backend(backend: str, model_dir: str):
+    if backend == "onnx":
+        return load_onnx_nli(model_dir)
+    from transformers import pipeline
+    return pipeline("text-classification", model=settings.NLI_MODEL, device=-1)
+
+
+def run_backend(backend: str, model_dir: str, pairs, batch_size: int, repeats: int, results):
+    """Load one backend, time `repeats` batched passes and report back through `results`"""
+    base_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    model = load_backend(backend, model_dir)
+    load_time = time.perf_counter() - start
+    service = NLIService(ModelRegistry(loaders={"nli": lambda: model}))
+
+    service.get_stance_batch(pairs[:batch_size], batch_size=batch_size)
+
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        stances = service.get_stance_batch(pairs, batch_size=batch_size)
+        latencies.append(time.perf_counter() - start)
+
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put({
+        "backend": backend,
+        "load_time": load_time,
+        "latencies": latencies,
+        "max_rss_mb": max_rss_mb,
+        "model_rss_mb": max_rss_mb - base_rss_mb,
+        "stances": [s["stance"] for s in stances],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", default=settings.NLI_ONNX_DIR, help="ONNX export directory")
+    parser.add_argument("--export", action="store_true", help="Export and quantize NLI_MODEL first")
+    parser.add_argument("--pairs", type=int, default=64, help="Pairs per timed pass")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed passes per backend")
+    parser.add_argument("--batch-size", type=int, default=settings.NLI_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.export:
+        export_quantized_nli(settings.NLI_MODEL, args.model_dir)
+
+    pairs = make_pairs(args.pairs)
+    context = multiprocessing.get_context("spawn")
+    reports = {}
+    for backend in ("transformers", "onnx"):
+        results = context.Queue()
+        process = context.Process(
+            target=run_backend,
+            args=(backend, args.model_dir, pairs, args.batch_size, args.repeats, results),
+        )
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            logger.error(f"{backend} backend failed (exit code {process.exitcode})")
+            sys.exit(1)
+        reports[backend] = results.get()
+
+    print(f"model:          {settings.NLI_MODEL}")
+    print(f"pairs/pass:     {args.pairs}  batch_size: {args.batch_size}  repeats: {args.repeats}")
+    print(f"{'backend':<14}{'load s':>8}{'p50 ms':>10}{'p95 ms':>10}{'pairs/s':>10}{'max RSS MB':>12}{'model MB':>10}")
+    for backend, report in reports.items():
+        latencies = sorted(report["latencies"])
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        print(
+            f"{backend:<14}{report['load_time']:8.1f}{statistics.median(latencies) * 1000:10.1f}"
+            f"{p95 * 1000:10.1f}{args.pairs / statistics.median(latencies):10.1f}{report['max_rss_mb']:12.0f}"
+            f"{report['model_rss_mb']:10.0f}"
+        )
+
+    baseline, quantized = reports["transformers"], reports["onnx"]
+    agree = sum(a == b for a, b in zip(baseline["stances"], quantized["stances"]))
+    print(f"speedup:        {statistics.median(baseline['latencies']) / statistics.median(quantized['latencies']):.2f}x")
+    print(f"stance agreement: {agree}/{len(pairs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Build or extend the embedded BM25 index from the snippets table or a seed file
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+from app.core.config import settings
+from app.core.database import db
+from app.services.bm25_index import BM25Index
+from app.services.retrieval import SNIPPET_SELECT, flatten_snippet_row
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def iter_db_snippets(page_size: int):
+    """Page through snippets with their article and source"""
+    client = db.get_service_client()
+    start = 0
+    while True:
+        response = (
+            client.table("snippets")
+            .select(SNIPPET_SELECT)
+            .order("id")
+            .range(start, start + page_size - 1)
+            .execute()
+        )
+        if not response.data:
+            return
+        for item in response.data:
+            yield flatten_snippet_row(item)
+        if len(response.data) < page_size:
+            return
+        start += page_size
+
+
+def iter_seed_snippets(path: str):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--index-dir", default=settings.LOCAL_BM25_INDEX_DIR)
+    parser.add_argument("--seed", help="JSONL file of snippet documents (default: snippets table)")
+    parser.add_argument("--append", action="store_true", help="Add only snippets missing from an existing index")
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    index = BM25Index.load(args.index_dir) if args.append else None
+    if index is None:
+        index = BM25Index(args.index_dir)
+
+    known = {index.get(doc_id)["snippet_id"] for doc_id in range(len(index))}
+    docs = iter_seed_snippets(args.seed) if args.seed else iter_db_snippets(args.page_size)
+
+    before = len(index)
+    index.add(doc for doc in docs if doc["snippet_id"] not in known)
+    index.save(args.index_dir)
+
+    logger.info(f"Added {len(index) - before} snippets; index holds {len(index)} docs")
+
+
+if __name__ == "__main__":
+    main()
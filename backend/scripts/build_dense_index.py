@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Build or extend the FAISS dense index over the snippets table
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import numpy as np
+from app.core.config import settings
+from app.core.database import db
+from app.core.model_registry import ModelRegistry
+from app.services.dense_index import DenseIndex, encode_texts
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def iter_snippets(client, page_size: int):
+    """Page through all snippets ordered by id"""
+    start = 0
+    while True:
+        response = (
+            client.table("snippets")
+            .select("id, sentence_text")
+            .order("id")
+            .range(start, start + page_size - 1)
+            .execute()
+        )
+        if not response.data:
+            return
+        yield from response.data
+        if len(response.data) < page_size:
+            return
+        start += page_size
+
+
+def record_embeddings(client, index: DenseIndex, snippet_ids, first_position: int, batch_size: int):
+    """Upsert embeddings rows pointing at each snippet's vector"""
+    rows = [
+        {"snippet_id": snippet_id, "vector_path": index.vector_path(first_position + offset)}
+        for offset, snippet_id in enumerate(snippet_ids)
+    ]
+    for start in range(0, len(rows), batch_size):
+        client.table("embeddings").upsert(
+            rows[start:start + batch_size], on_conflict="snippet_id"
+        ).execute()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--index-dir", default=settings.DENSE_INDEX_DIR)
+    parser.add_argument("--append", action="store_true", help="Only index snippets missing from an existing index")
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    model = ModelRegistry().get("embedding")
+    if model is None:
+        logger.error(f"Embedding model {settings.EMBEDDING_MODEL} could not be loaded")
+        sys.exit(1)
+
+    client = db.get_service_client()
+
+    existing = DenseIndex.load(args.index_dir, mmap=False) if args.append else None
+    known = set()
+    if existing is not None:
+        known = {snippet_id.decode() for snippet_id in existing.snippet_ids}
+        logger.info(f"Existing index holds {len(existing)} vectors")
+
+    snippet_ids, texts = [], []
+    for row in iter_snippets(client, args.page_size):
+        if row["id"] in known:
+            continue
+        snippet_ids.append(row["id"])
+        texts.append(row["sentence_text"])
+
+    if not snippet_ids:
+        logger.info("No new snippets to index")
+        return
+
+    logger.info(f"Encoding {len(texts)} snippets with {settings.EMBEDDING_MODEL}")
+    vectors = np.vstack([
+        encode_texts(model, texts[start:start + args.page_size])
+        for start in range(0, len(texts), args.page_size)
+    ])
+
+    if existing is not None:
+        first_position = len(existing)
+        existing.add(snippet_ids, vectors)
+        index = existing
+    else:
+        first_position = 0
+        index = DenseIndex.build(args.index_dir, snippet_ids, vectors)
+
+    record_embeddings(client, index, snippet_ids, first_position, args.page_size)
+    logger.info(f"Dense index now holds {len(index)} vectors in {args.index_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Build or extend the near-duplicate claim index from the claims table
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from app.core.config import settings
+from app.core.database import db
+from app.services.near_duplicates import NearDuplicateIndex
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def iter_reported_claims(client, page_size: int):
+    """Page through claims that have at least one claim report"""
+    start = 0
+    while True:
+        response = (
+            client.table("claims")
+            .select("id, claim_text, claim_reports!inner(id)")
+            .order("id")
+            .range(start, start + page_size - 1)
+            .execute()
+        )
+        if not response.data:
+            return
+        yield from response.data
+        if len(response.data) < page_size:
+            return
+        start += page_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--index-dir", default=settings.NEAR_DUP_INDEX_DIR)
+    parser.add_argument("--append", action="store_true", help="Only index claims missing from an existing index")
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    client = db.get_service_client()
+
+    index = NearDuplicateIndex.load(args.index_dir) if args.append else None
+    if index is None:
+        index = NearDuplicateIndex(args.index_dir)
+    else:
+        logger.info(f"Existing index holds {len(index)} claims")
+
+    added = 0
+    for row in iter_reported_claims(client, args.page_size):
+        added += index.add([row["id"]], [row["claim_text"]])
+
+    index.save()
+    logger.info(f"Indexed {added} new claims; near-duplicate index now holds {len(index)} in {args.index_dir}")
+
+
+if __name__ == "__main__":
+    main()
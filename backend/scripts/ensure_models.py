@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 from sentence_transformers import SentenceTransformer
 from app.core.config import settings
+from app.services.onnx_nli import export_quantized_nli
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -38,12 +39,20 @@ def main():
     models = [
         (settings.EMBEDDING_MODEL, "sentence_transformer"),
         (settings.NLI_MODEL, "transformer"),
-        (settings.CLAIM_DETECTOR_MODEL, "transformer"),
     ]
+    if settings.CLAIM_DETECTOR_MODEL:
+        models.append((settings.CLAIM_DETECTOR_MODEL, "transformer"))
 
     for model_name, model_type in models:
         download_model(model_name, model_type)
 
+    if settings.NLI_BACKEND == "onnx":
+        try:
+            path = export_quantized_nli(settings.NLI_MODEL, settings.NLI_ONNX_DIR)
+            logger.info(f"Exported int8 ONNX NLI model to {path}")
+        except Exception as e:
+            logger.error(f"Failed to export {settings.NLI_MODEL} to ONNX: {e}")
+
     logger.info("All models downloaded successfully!")
 
 
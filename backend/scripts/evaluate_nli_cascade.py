@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Evaluate the two-tier NLI cascade against the full model on labelled pairs
+
+Reads JSONL or CSV rows with `claim`, `evidence` and `label` (support /
+entailment, contradict / contradiction or neutral) and reports accuracy and
+throughput of the full model alone, the fast model alone and the cascade,
+plus the cascade's escalation rate.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import csv
+import json
+import time
+from transformers import pipeline
+from app.core.config import settings
+from app.core.model_registry import ModelRegistry
+from app.services.nli import NLIService
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LABELS = {
+    "support": "support",
+    "entailment": "support",
+    "contradict": "contradict",
+    "contradiction": "contradict",
+    "neutral": "neutral",
+}
+
+
+def read_pairs(path: str):
+    """(claim, evidence) pairs and gold stances from a JSONL or CSV file"""
+    with open(path, newline="") as f:
+        rows = csv.DictReader(f) if path.endswith(".csv") else (json.loads(line) for line in f if line.strip())
+        pairs, gold = [], []
+        for row in rows:
+            label = LABELS.get(str(row.get("label", "")).strip().lower())
+            if label is None or not row.get("claim") or not row.get("evidence"):
+                continue
+            pairs.append((row["claim"], row["evidence"]))
+            gold.append(label)
+    return pairs, gold
+
+
+def evaluate(service: NLIService, pairs, gold, batch_size: int):
+    start = time.perf_counter()
+    results = service.get_stance_batch(pairs, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    correct = sum(result["stance"] == label for result, label in zip(results, gold))
+    return {
+        "accuracy": correct / len(gold),
+        "pairs_per_second": len(pairs) / elapsed,
+        "escalated": sum(result["tier"] == "full" for result in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pairs_file", help="Labelled pairs (.jsonl or .csv)")
+    parser.add_argument("--fast-model", default=settings.NLI_FAST_MODEL)
+    parser.add_argument("--batch-size", type=int, default=settings.NLI_BATCH_SIZE)
+    parser.add_argument("--support-threshold", type=float, default=settings.NLI_CASCADE_SUPPORT_THRESHOLD)
+    parser.add_argument("--neutral-threshold", type=float, default=settings.NLI_CASCADE_NEUTRAL_THRESHOLD)
+    parser.add_argument("--contradict-threshold", type=float, default=settings.NLI_CASCADE_CONTRADICT_THRESHOLD)
+    args = parser.parse_args()
+
+    if not args.fast_model:
+        logger.error("No fast model: pass --fast-model or set NLI_FAST_MODEL")
+        sys.exit(1)
+
+    settings.NLI_CASCADE_SUPPORT_THRESHOLD = args.support_threshold
+    settings.NLI_CASCADE_NEUTRAL_THRESHOLD = args.neutral_threshold
+    settings.NLI_CASCADE_CONTRADICT_THRESHOLD = args.contradict_threshold
+
+    pairs, gold = read_pairs(args.pairs_file)
+    if not pairs:
+        logger.error(f"No labelled pairs in {args.pairs_file}")
+        sys.exit(1)
+
+    full = pipeline("text-classification", model=settings.NLI_MODEL, device=-1)
+    fast = pipeline("text-classification", model=args.fast_model, device=-1)
+    runs = {
+        "full": NLIService(ModelRegistry(loaders={"nli": lambda: full})),
+        "fast": NLIService(ModelRegistry(loaders={"nli": lambda: fast})),
+        "cascade": NLIService(ModelRegistry(loaders={"nli": lambda: full, "nli_fast": lambda: fast})),
+    }
+
+    for service in runs.values():
+        service.get_stance_batch(pairs[:args.batch_size], batch_size=args.batch_size)
+    reports = {name: evaluate(service, pairs, gold, args.batch_size) for name, service in runs.items()}
+
+    print(f"pairs:            {len(pairs)}")
+    print(f"full model:       {settings.NLI_MODEL}")
+    print(f"fast model:       {args.fast_model}")
+    print(f"thresholds:       support {args.support_threshold}  neutral {args.neutral_threshold}  "
+          f"contradict {args.contradict_threshold}")
+    print(f"{'run':<10}{'accuracy':>10}{'pairs/s':>10}")
+    for name, report in reports.items():
+        print(f"{name:<10}{report['accuracy']:10.3f}{report['pairs_per_second']:10.1f}")
+
+    cascade, baseline = reports["cascade"], reports["full"]
+    print(f"escalation rate:  {cascade['escalated'] / len(pairs):.1%}")
+    print(f"accuracy delta:   {cascade['accuracy'] - baseline['accuracy']:+.3f}")
+    print(f"throughput gain:  {cascade['pairs_per_second'] / baseline['pairs_per_second']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@
     - claims: Extracted factual claims
     - evidence: Supporting/contradicting evidence for claims
     - claim_reports: Verification results with scores
+    - feed_items: Denormalised GET /feed rows, maintained from claim_reports
     - human_labels: Manual moderator reviews
     - reports: User-submitted reports on claims
     - embeddings: Vector embeddings for dense retrieval
@@ -72,6 +73,7 @@ CREATE TABLE IF NOT EXISTS raw_items (
   body_text TEXT NOT NULL,
   published_at TIMESTAMPTZ,
   fetched_at TIMESTAMPTZ DEFAULT now(),
+  category TEXT,
   raw_json JSONB
 );
 
@@ -85,6 +87,7 @@ CREATE POLICY "Raw items are publicly readable"
 CREATE INDEX idx_raw_items_source ON raw_items(source_id);
 CREATE INDEX idx_raw_items_published ON raw_items(published_at DESC);
 CREATE INDEX idx_raw_items_url ON raw_items(url);
+CREATE INDEX idx_raw_items_category ON raw_items(category, id);
 
 -- Snippets table
 CREATE TABLE IF NOT EXISTS snippets (
@@ -105,10 +108,49 @@ CREATE POLICY "Snippets are publicly readable"
 
 CREATE INDEX idx_snippets_raw_item ON snippets(raw_item_id);
 CREATE INDEX idx_snippets_embedding ON snippets(embedding_id);
+CREATE UNIQUE INDEX idx_snippets_item_sentence ON snippets(raw_item_id, sentence_idx);
 
 -- Full-text search index on snippets
 CREATE INDEX idx_snippets_fts ON snippets USING gin(to_tsvector('english', sentence_text));
 
+-- Ranked lexical search: any query term may match, ordered by ts_rank_cd
+CREATE OR REPLACE FUNCTION search_snippets(query_text TEXT, match_count INTEGER DEFAULT 50)
+RETURNS TABLE (
+  id UUID,
+  sentence_text TEXT,
+  raw_item_id UUID,
+  title TEXT,
+  url TEXT,
+  source_id UUID,
+  source_name TEXT,
+  source_domain TEXT,
+  trust_score FLOAT,
+  rank REAL
+)
+LANGUAGE sql STABLE
+AS $$
+  WITH q AS (
+    SELECT NULLIF(replace(plainto_tsquery('english', query_text)::text, '&', '|'), '')::tsquery AS query
+  )
+  SELECT
+    s.id,
+    s.sentence_text,
+    r.id,
+    r.title,
+    r.url,
+    src.id,
+    src.name,
+    src.domain,
+    src.trust_score,
+    ts_rank_cd(to_tsvector('english', s.sentence_text), q.query) AS rank
+  FROM q
+  JOIN snippets s ON to_tsvector('english', s.sentence_text) @@ q.query
+  JOIN raw_items r ON r.id = s.raw_item_id
+  JOIN sources src ON src.id = r.source_id
+  ORDER BY rank DESC
+  LIMIT match_count;
+$$;
+
 -- Claims table
 CREATE TABLE IF NOT EXISTS claims (
   id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -138,6 +180,7 @@ CREATE TABLE IF NOT EXISTS evidence (
   source_id UUID NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
   stance TEXT NOT NULL CHECK (stance IN ('support', 'contradict', 'neutral')),
   nli_conf FLOAT NOT NULL CHECK (nli_conf >= 0 AND nli_conf <= 1),
+  nli_model TEXT,
   created_at TIMESTAMPTZ DEFAULT now()
 );
 
@@ -150,6 +193,7 @@ CREATE POLICY "Evidence is publicly readable"
 
 CREATE INDEX idx_evidence_claim ON evidence(claim_id);
 CREATE INDEX idx_evidence_snippet ON evidence(snippet_id);
+CREATE INDEX idx_evidence_snippet_model ON evidence(snippet_id, nli_model);
 CREATE INDEX idx_evidence_stance ON evidence(stance);
 
 -- Claim reports table
@@ -175,6 +219,91 @@ CREATE INDEX idx_claim_reports_claim ON claim_reports(claim_id);
 CREATE INDEX idx_claim_reports_label ON claim_reports(label);
 CREATE INDEX idx_claim_reports_score ON claim_reports(cred_score DESC);
 
+-- Feed read model: one row per claim report holding exactly the GET /feed
+-- columns, so the feed is a single-table index range scan instead of a
+-- four-way join. Kept current by trigger; rebuild_feed_items() backfills.
+CREATE TABLE IF NOT EXISTS feed_items (
+  id UUID PRIMARY KEY REFERENCES claim_reports(id) ON DELETE CASCADE,
+  title TEXT NOT NULL,
+  summary TEXT NOT NULL,
+  cred_score FLOAT NOT NULL,
+  label TEXT NOT NULL,
+  source TEXT NOT NULL,
+  published_at TIMESTAMPTZ,
+  category TEXT NOT NULL,
+  confidence INTEGER NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL
+);
+
+ALTER TABLE feed_items ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Feed items are publicly readable"
+  ON feed_items FOR SELECT
+  TO authenticated
+  USING (true);
+
+-- Feed keyset pagination: ORDER BY created_at DESC, id DESC seeks past the cursor
+CREATE INDEX idx_feed_items_recent ON feed_items(created_at DESC, id DESC);
+CREATE INDEX idx_feed_items_category ON feed_items(category, created_at DESC, id DESC);
+
+-- The feed row each claim report projects to
+CREATE OR REPLACE VIEW feed_item_rows AS
+  SELECT
+    cr.id,
+    r.title,
+    LEFT(c.claim_text, 200) AS summary,
+    cr.cred_score,
+    cr.label,
+    src.name AS source,
+    r.published_at,
+    COALESCE(r.category, 'General') AS category,
+    FLOOR(cr.cred_score)::INTEGER AS confidence,
+    cr.created_at
+  FROM claim_reports cr
+  JOIN claims c ON c.id = cr.claim_id
+  JOIN raw_items r ON r.id = c.raw_item_id
+  JOIN sources src ON src.id = r.source_id;
+
+CREATE OR REPLACE FUNCTION sync_feed_item()
+RETURNS TRIGGER
+LANGUAGE plpgsql SECURITY DEFINER
+AS $$
+BEGIN
+  INSERT INTO feed_items
+  SELECT * FROM feed_item_rows WHERE id = NEW.id
+  ON CONFLICT (id) DO UPDATE SET
+    title = EXCLUDED.title,
+    summary = EXCLUDED.summary,
+    cred_score = EXCLUDED.cred_score,
+    label = EXCLUDED.label,
+    source = EXCLUDED.source,
+    published_at = EXCLUDED.published_at,
+    category = EXCLUDED.category,
+    confidence = EXCLUDED.confidence,
+    created_at = EXCLUDED.created_at;
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER claim_reports_sync_feed
+  AFTER INSERT OR UPDATE ON claim_reports
+  FOR EACH ROW EXECUTE FUNCTION sync_feed_item();
+
+-- Backfill: repopulate feed_items from every claim report, returns the row count
+CREATE OR REPLACE FUNCTION rebuild_feed_items()
+RETURNS INTEGER
+LANGUAGE plpgsql SECURITY DEFINER
+AS $$
+DECLARE
+  row_count INTEGER;
+BEGIN
+  DELETE FROM feed_items;
+  INSERT INTO feed_items SELECT * FROM feed_item_rows;
+  GET DIAGNOSTICS row_count = ROW_COUNT;
+  RETURN row_count;
+END;
+$$;
+
 -- Human labels table
 CREATE TABLE IF NOT EXISTS human_labels (
   id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -242,6 +371,60 @@ CREATE POLICY "Moderators can read reports"
 CREATE INDEX idx_reports_claim ON reports(claim_id);
 CREATE INDEX idx_reports_user ON reports(user_id);
 
+-- Report count per claim, keyset-paged on claim_id, for rebuilding the
+-- Redis report counters
+CREATE OR REPLACE FUNCTION report_counts(page_size INTEGER DEFAULT 10000, after_claim_id UUID DEFAULT NULL)
+RETURNS TABLE (
+  claim_id UUID,
+  report_count BIGINT
+)
+LANGUAGE sql STABLE
+AS $$
+  SELECT claim_id, COUNT(*) AS report_count
+  FROM reports
+  WHERE after_claim_id IS NULL OR claim_id > after_claim_id
+  GROUP BY claim_id
+  ORDER BY claim_id
+  LIMIT page_size;
+$$;
+
+-- Moderation queue: reported claims by report count, grouped and paged in the
+-- database, each with its latest claim report
+CREATE OR REPLACE FUNCTION reported_claims(page_size INTEGER DEFAULT 50, page_offset INTEGER DEFAULT 0)
+RETURNS TABLE (
+  id UUID,
+  claim_text TEXT,
+  report_count BIGINT,
+  cred_score FLOAT,
+  label TEXT
+)
+LANGUAGE sql STABLE
+AS $$
+  WITH counts AS (
+    SELECT claim_id, COUNT(*) AS report_count
+    FROM reports
+    GROUP BY claim_id
+    ORDER BY report_count DESC, claim_id
+    LIMIT page_size OFFSET page_offset
+  )
+  SELECT
+    c.id,
+    c.claim_text,
+    counts.report_count,
+    latest.cred_score,
+    latest.label
+  FROM counts
+  JOIN claims c ON c.id = counts.claim_id
+  LEFT JOIN LATERAL (
+    SELECT cr.cred_score, cr.label
+    FROM claim_reports cr
+    WHERE cr.claim_id = c.id
+    ORDER BY cr.created_at DESC
+    LIMIT 1
+  ) latest ON true
+  ORDER BY counts.report_count DESC, c.id;
+$$;
+
 -- Embeddings table (for FAISS indexing)
 CREATE TABLE IF NOT EXISTS embeddings (
   id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -257,4 +440,4 @@ CREATE POLICY "Embeddings are readable by system"
   TO authenticated
   USING (true);
 
-CREATE INDEX idx_embeddings_snippet ON embeddings(snippet_id);
+CREATE UNIQUE INDEX idx_embeddings_snippet ON embeddings(snippet_id);
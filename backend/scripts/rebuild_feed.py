@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Rebuild the feed_items read model from claim_reports
+
+The claim_reports trigger keeps feed_items current as reports are written;
+run this once after creating the table, or after editing article titles,
+categories or source names that existing feed rows copied.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from app.core.database import db
+from app.services.feed_cache import bump_feed_version
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    client = db.get_service_client()
+    rows = client.rpc("rebuild_feed_items", {}).execute().data
+    bump_feed_version()
+    logger.info(f"Rebuilt feed_items with {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
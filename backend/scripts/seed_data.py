@@ -9,13 +9,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from datetime import datetime, timedelta
 import json
 from app.core.database import db
+from app.services.feed_cache import bump_feed_version
+from app.services.ingestion import IngestionWriter
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def seed_sources():
+def seed_sources(client):
     """Create trusted sources"""
     sources = [
         {"name": "Reuters", "domain": "reuters.com", "trust_score": 0.95},
@@ -28,69 +30,48 @@ def seed_sources():
         {"name": "FactCheck.org", "domain": "factcheck.org", "trust_score": 0.90},
     ]
 
-    client = db.get_service_client()
+    client.table("sources").upsert(sources, on_conflict="domain").execute()
+    logger.info(f"Upserted {len(sources)} sources")
 
-    for source in sources:
-        try:
-            client.table("sources").insert(source).execute()
-            logger.info(f"Created source: {source['name']}")
-        except Exception as e:
-            logger.warning(f"Source may already exist: {source['name']}")
 
-
-def seed_sample_articles():
+def seed_sample_articles(client):
     """Create sample articles"""
-    client = db.get_service_client()
-
-    sources_response = client.table("sources").select("id, name").execute()
-    sources_map = {s["name"]: s["id"] for s in sources_response.data}
-
     articles = [
         {
-            "source_id": sources_map.get("Reuters"),
+            "source_name": "Reuters",
+            "source_domain": "reuters.com",
             "url": "https://reuters.com/article/ai-healthcare-breakthrough",
             "title": "AI Breakthrough in Healthcare Diagnostics",
             "body_text": "Scientists develop new AI system that can detect diseases 95% faster than traditional methods. The system has been tested across 15 countries with over 10,000 patient cases.",
             "published_at": (datetime.utcnow() - timedelta(hours=2)).isoformat(),
+            "category": "Health",
         },
         {
-            "source_id": sources_map.get("Nature Medicine"),
+            "source_name": "Nature Medicine",
+            "source_domain": "nature.com",
             "url": "https://nature.com/article/ai-diagnosis-study",
             "title": "Clinical Trials Show AI Diagnostic Accuracy",
             "body_text": "Clinical trials demonstrate 94.7% improvement in diagnostic speed with 98.2% accuracy rate across diverse patient populations.",
             "published_at": (datetime.utcnow() - timedelta(hours=5)).isoformat(),
+            "category": "Health",
         },
         {
-            "source_id": sources_map.get("BBC News"),
+            "source_name": "BBC News",
+            "source_domain": "bbc.com",
             "url": "https://bbc.com/news/climate-agreement",
             "title": "Global Climate Agreement Reaches Historic Milestone",
             "body_text": "195 nations commit to unprecedented emissions reductions, marking the most significant climate action in history.",
             "published_at": (datetime.utcnow() - timedelta(hours=4)).isoformat(),
+            "category": "Climate",
         },
     ]
 
-    for article in articles:
-        try:
-            response = client.table("raw_items").insert(article).execute()
-            article_id = response.data[0]["id"]
-            logger.info(f"Created article: {article['title']}")
-
-            sentences = article["body_text"].split(". ")
-            for idx, sentence in enumerate(sentences):
-                if sentence.strip():
-                    client.table("snippets").insert({
-                        "raw_item_id": article_id,
-                        "sentence_text": sentence.strip(),
-                        "sentence_idx": idx,
-                    }).execute()
-
-        except Exception as e:
-            logger.error(f"Error creating article: {e}")
+    snippet_ids = IngestionWriter(client=client).write_items(articles)
+    logger.info(f"Created {len(snippet_ids)} snippets from {len(articles)} articles")
 
 
-def seed_demo_claims():
+def seed_demo_claims(client):
     """Create demo claims with reports"""
-    client = db.get_service_client()
 
     snippets_response = client.table("snippets").select("*").limit(10).execute()
 
@@ -122,6 +103,7 @@ def seed_demo_claims():
         }
 
         client.table("claim_reports").insert(report_data).execute()
+        bump_feed_version()
         logger.info("Created demo claim report")
 
     except Exception as e:
@@ -132,9 +114,10 @@ def main():
     logger.info("Starting database seeding...")
 
     try:
-        seed_sources()
-        seed_sample_articles()
-        seed_demo_claims()
+        client = db.get_service_client()
+        seed_sources(client)
+        seed_sample_articles(client)
+        seed_demo_claims(client)
 
         logger.info("Database seeding completed successfully!")
 
@@ -0,0 +1,208 @@
+import re
+import uuid
+import pytest
+from app.core.config import settings
+from app.services.nli_cache import get_stance_cache
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """Chainable subset of the postgrest query builder backed by lists of dicts"""
+
+    KEYSET_RE = re.compile(r'(\w+)\.gt\."([^"]+)",and\(\1\.eq\."\2",(\w+)\.gt\.([\w-]+)\)')
+
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.columns = "*"
+        self.filters = []
+        self.payload = None
+        self.upsert_options = None
+        self.ordering = []
+        self.max_rows = None
+
+    def select(self, columns="*", **kwargs):
+        self.columns = columns
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) >= value)
+        return self
+
+    def or_(self, filters):
+        """Only the keyset form `a.gt."x",and(a.eq."x",b.gt.y)`"""
+        column, value, tie_column, tie_value = self.KEYSET_RE.fullmatch(filters).groups()
+        self.filters.append(lambda row: (row.get(column), row.get(tie_column)) > (value, tie_value))
+        return self
+
+    def order(self, column, desc=False):
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self.max_rows = count
+        return self
+
+    def upsert(self, rows, on_conflict="", ignore_duplicates=False, **kwargs):
+        self.payload = rows if isinstance(rows, list) else [rows]
+        self.upsert_options = (on_conflict, ignore_duplicates)
+        return self
+
+    def insert(self, rows, **kwargs):
+        self.payload = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def execute(self):
+        rows = self.db.tables.setdefault(self.table, [])
+        if self.payload is not None:
+            return FakeResponse(self._write(rows))
+
+        matched = [row for row in rows if all(f(row) for f in self.filters)]
+        for column, desc in reversed(self.ordering):
+            matched.sort(key=lambda row: row.get(column), reverse=desc)
+        return FakeResponse([self._project(row) for row in matched[:self.max_rows]])
+
+    def _write(self, rows):
+        self.db.writes.append((self.table, len(self.payload)))
+        conflict_cols, ignore = self.upsert_options or ("", False)
+        conflict_cols = [c for c in conflict_cols.split(",") if c]
+        written = []
+        for new_row in self.payload:
+            existing = None
+            if conflict_cols:
+                existing = next(
+                    (r for r in rows if all(r.get(c) == new_row.get(c) for c in conflict_cols)),
+                    None,
+                )
+            if existing is not None:
+                if not ignore:
+                    existing.update(new_row)
+                    written.append(existing)
+                continue
+            row = dict(new_row)
+            row.setdefault("id", str(uuid.uuid4()))
+            rows.append(row)
+            written.append(row)
+        return written
+
+    def _project(self, row):
+        if self.columns.strip() == "*":
+            return dict(row)
+        result = {}
+        for column in [c.strip() for c in self.columns.split(",")]:
+            count = re.match(r"(\w+)\(count\)", column)
+            if count:
+                child = count.group(1)
+                fk = f"{self.table.rstrip('s')}_id" if self.table != "raw_items" else "raw_item_id"
+                total = sum(1 for r in self.db.tables.get(child, []) if r.get(fk) == row["id"])
+                result[child] = [{"count": total}]
+            else:
+                result[column] = row.get(column)
+        return result
+
+
+class FakeRPC:
+    def __init__(self, fn, params):
+        self.fn = fn
+        self.params = params
+
+    def execute(self):
+        return FakeResponse(self.fn(self.params))
+
+
+class FakeSupabase:
+    """In-memory stand-in for the Supabase client used by ingestion tests
+
+    RPCs are served by the callables registered in `rpcs`, each taking the
+    call's params and returning rows.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.writes = []
+        self.rpcs = {}
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRPC(self.rpcs[name], params)
+
+
+class FakeRedis:
+    """Dict-backed Redis with the string, counter and sorted-set calls the caches use"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value).encode()
+        return True
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1).encode()
+        return int(self.data[key])
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def rename(self, key, new_key):
+        self.data[new_key] = self.data.pop(key)
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update({member: float(score) for member, score in mapping.items()})
+
+    def zincrby(self, key, amount, member):
+        zset = self.data.setdefault(key, {})
+        zset[member] = zset.get(member, 0.0) + amount
+        return zset[member]
+
+    def zrevrange(self, key, start, end, withscores=False):
+        ranked = sorted(self.data.get(key, {}).items(), key=lambda item: (item[1], item[0]), reverse=True)
+        page = ranked[start:end + 1]
+        if withscores:
+            return [(member.encode(), score) for member, score in page]
+        return [member.encode() for member, _ in page]
+
+
+@pytest.fixture
+def fake_supabase():
+    return FakeSupabase()
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture(autouse=True)
+def isolated_stance_cache(monkeypatch):
+    """Keep the process-wide NLI stance cache per test and off Supabase"""
+    monkeypatch.setattr(settings, "NLI_CACHE_EVIDENCE_LOOKUP", False)
+    get_stance_cache.cache_clear()
+    yield
+    get_stance_cache.cache_clear()
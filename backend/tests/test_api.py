@@ -0,0 +1,501 @@
+import bisect
+import json
+import re
+import statistics
+import time
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+from app import main
+from app.api import admin, feed, report, verify
+from app.core.config import settings
+from app.core.model_registry import ModelRegistry
+from app.services.feed_cache import FeedCache
+from app.services import nli as nli_module
+from app.services.verification import get_executor
+from app.services.report_counters import ReportCounters
+
+
+class FakeVerificationService:
+    """Replays fixed frames through the service's streaming interface"""
+
+    CLAIM = {
+        "id": "c1",
+        "claim_text": "A new study shows 95% of patients improved.",
+        "cred_score": 81.0,
+        "label": "verified",
+        "explain_text": "Supported by trusted sources.",
+        "evidence": [],
+    }
+
+    async def verify_text_stream(self, text):
+        yield {"type": "claims", "claims": [{"id": "c1", "claim_text": self.CLAIM["claim_text"]}]}
+        yield {"type": "claim", "index": 0, "claim": self.CLAIM}
+        yield {"type": "summary", "processing_time": 0.1, "checked_sources": 3}
+
+    async def verify_batch(self, documents):
+        return {
+            "results": [
+                {"claims": [self.CLAIM] if document["text"] else [], "checked_sources": 1}
+                for document in documents
+            ],
+            "unique_claims": 1,
+            "processing_time": 0.2,
+        }
+
+
+@pytest.fixture
+def verify_client():
+    app = FastAPI()
+    app.include_router(verify.router, prefix="/verify")
+    app.dependency_overrides[verify.get_verification_service] = FakeVerificationService
+    return TestClient(app)
+
+
+class TestLifecycle:
+    def test_restart_in_one_process_gets_fresh_executor_and_scheduler(self, monkeypatch):
+        """Test shutdown drops the closed pool and scheduler instead of caching them"""
+        monkeypatch.setattr(settings, "PRELOAD_MODELS", False)
+
+        for _ in range(2):
+            with TestClient(main.app):
+                assert get_executor().submit(lambda: 42).result() == 42
+                nli_module.get_nli_scheduler(ModelRegistry(loaders={}))
+
+            assert nli_module._schedulers == {}
+            assert get_executor.cache_info().currsize == 0
+
+
+class TestVerifyStream:
+    def test_streams_ndjson_frames(self, verify_client):
+        """Test claims, each result and the summary arrive as NDJSON lines"""
+        response = verify_client.post("/verify/stream", json={"text": "anything"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        assert [f["type"] for f in frames] == ["claims", "claim", "summary"]
+        assert frames[1]["claim"]["label"] == "verified"
+        assert frames[2]["checked_sources"] == 3
+
+    def test_streams_server_sent_events(self, verify_client):
+        """Test SSE framing when the client accepts text/event-stream"""
+        response = verify_client.post(
+            "/verify/stream", json={"text": "anything"}, headers={"Accept": "text/event-stream"}
+        )
+
+        events = [block for block in response.text.split("\n\n") if block]
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert events[0].startswith("event: claims\ndata: ")
+        assert json.loads(events[-1].split("data: ", 1)[1])["type"] == "summary"
+
+    def test_requires_url_or_text(self, verify_client):
+        """Test empty requests are rejected before streaming starts"""
+        assert verify_client.post("/verify/stream", json={}).status_code == 400
+
+
+class TestVerifyBatch:
+    def test_returns_results_per_document(self, verify_client):
+        """Test results are keyed by document position"""
+        response = verify_client.post("/verify/batch", json={"documents": [
+            {"text": "first document"},
+            {"url": "https://reuters.com/article"},
+        ]})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert set(body["results"]) == {"0", "1"}
+        assert body["results"]["0"]["claims"][0]["id"] == "c1"
+        assert body["results"]["1"]["claims"] == []
+
+    def test_near_duplicate_marker_reaches_the_client(self, verify_client, monkeypatch):
+        """Test a verdict reused from a paraphrase is labelled as such"""
+        claim = dict(FakeVerificationService.CLAIM, near_duplicate_of={"claim_id": "c0", "similarity": 0.91})
+        monkeypatch.setattr(FakeVerificationService, "CLAIM", claim)
+
+        response = verify_client.post("/verify/batch", json={"documents": [{"text": "first document"}]})
+
+        assert response.json()["results"]["0"]["claims"][0]["near_duplicate_of"] == {"claim_id": "c0", "similarity": 0.91}
+
+    def test_rejects_oversized_and_empty_documents(self, verify_client, monkeypatch):
+        """Test batch limits and per-document validation"""
+        monkeypatch.setattr(verify.settings, "VERIFY_BATCH_MAX_DOCUMENTS", 1)
+
+        too_many = verify_client.post("/verify/batch", json={"documents": [{"text": "a"}, {"text": "b"}]})
+        empty_document = verify_client.post("/verify/batch", json={"documents": [{}]})
+
+        assert too_many.status_code == 413
+        assert empty_document.status_code == 400
+
+
+class FakeFeedQuery:
+    """feed_items read the way Postgres serves it from idx_feed_items_recent
+
+    A keyset predicate on (created_at, id) seeks with bisect; rows are then
+    walked newest first until `limit` match, counting every row touched.
+    """
+
+    KEYSET_RE = re.compile(r'created_at\.lt\."([^"]+)",and\(created_at\.eq\."([^"]+)",id\.lt\.([\w-]+)\)')
+
+    def __init__(self, table):
+        self.table = table
+        self.min_score = 0
+        self.topic = None
+        self.before = None
+        self.max_rows = None
+
+    def select(self, columns):
+        return self
+
+    def gte(self, column, value):
+        assert column == "cred_score"
+        self.min_score = value
+        return self
+
+    def eq(self, column, value):
+        assert column == "category"
+        self.topic = value
+        return self
+
+    def or_(self, filters):
+        created_at, tie, report_id = self.KEYSET_RE.fullmatch(filters).groups()
+        assert created_at == tie
+        self.before = (created_at, report_id)
+        return self
+
+    def order(self, column, desc=False):
+        return self
+
+    def limit(self, count):
+        self.max_rows = count
+        return self
+
+    def execute(self):
+        start = bisect.bisect_left(self.table.keys, self.before) if self.before else len(self.table.keys)
+        rows = []
+        for position in range(start - 1, -1, -1):
+            row = self.table.rows[position]
+            self.table.scanned += 1
+            if row["cred_score"] < self.min_score:
+                continue
+            if self.topic and row["category"] != self.topic:
+                continue
+            rows.append(row)
+            if len(rows) == self.max_rows:
+                break
+        return type("Response", (), {"data": rows})()
+
+
+class FakeFeedTable:
+    def __init__(self, n, categories=("Health", "Climate", "Politics")):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        rows = []
+        for i in range(n):
+            rows.append({
+                "id": str(uuid.UUID(int=i + 1)),
+                # pairs of reports share a timestamp to exercise the id tie-break
+                "created_at": (start + timedelta(seconds=i // 2)).isoformat(),
+                "title": f"Article {i}",
+                "summary": f"claim number {i}",
+                "cred_score": 60 + i % 40,
+                "label": "verified",
+                "source": "Reuters",
+                "published_at": None,
+                "category": categories[i % len(categories)],
+                "confidence": 60 + i % 40,
+            })
+        rows.sort(key=lambda row: (row["created_at"], row["id"]))
+        self.rows = rows
+        self.keys = [(row["created_at"], row["id"]) for row in rows]
+        self.scanned = 0
+
+    def table(self, name):
+        assert name == "feed_items"
+        return FakeFeedQuery(self)
+
+
+@pytest.fixture
+def feed_cache(monkeypatch):
+    feed_cache = FeedCache(local_size=64)
+    monkeypatch.setattr(feed, "get_feed_cache", lambda: feed_cache)
+    return feed_cache
+
+
+@pytest.fixture
+def feed_table(monkeypatch, feed_cache):
+    table = FakeFeedTable(300)
+    monkeypatch.setattr(feed.db, "get_client", lambda: table)
+    return table
+
+
+@pytest.fixture
+def feed_client(feed_table):
+    app = FastAPI()
+    app.include_router(feed.router, prefix="/feed")
+    return TestClient(app)
+
+
+class TestFeed:
+    def _pages(self, client, **params):
+        cursor = None
+        while True:
+            query = dict(params, **({"cursor": cursor} if cursor else {}))
+            body = client.get("/feed", params=query).json()
+            yield body
+            cursor = body["cursor"]
+            if cursor is None:
+                return
+
+    def test_cursor_pages_through_every_item_once(self, feed_client):
+        """Test keyset pages cover all matching items newest first without repeats"""
+        pages = list(self._pages(feed_client, min_confidence=0, limit=40))
+        ids = [item["id"] for page in pages for item in page["items"]]
+
+        assert [page["total"] for page in pages] == [40] * 7 + [20]
+        assert len(ids) == len(set(ids)) == 300
+        assert ids == [str(uuid.UUID(int=i)) for i in range(300, 0, -1)]
+
+    def test_topic_filter_is_pushed_down(self, feed_client):
+        """Test only the requested topic is returned, with its own category"""
+        pages = list(self._pages(feed_client, topic="Climate", min_confidence=0, limit=100))
+        items = [item for page in pages for item in page["items"]]
+
+        assert len(items) == 100
+        assert {item["category"] for item in items} == {"Climate"}
+
+    def test_page_latency_is_flat(self, monkeypatch, feed_cache):
+        """Test deep pages scan and cost the same as the first page"""
+        table = FakeFeedTable(50_000)
+        monkeypatch.setattr(feed.db, "get_client", lambda: table)
+        app = FastAPI()
+        app.include_router(feed.router, prefix="/feed")
+        client = TestClient(app)
+
+        scanned, latencies = [], []
+        cursor = None
+        for _ in range(400):
+            params = {"min_confidence": 0, "limit": 100, **({"cursor": cursor} if cursor else {})}
+            table.scanned = 0
+            start = time.perf_counter()
+            cursor = client.get("/feed", params=params).json()["cursor"]
+            latencies.append(time.perf_counter() - start)
+            scanned.append(table.scanned)
+
+        assert set(scanned) == {101}
+        assert statistics.median(latencies[-20:]) < 3 * statistics.median(latencies[:20])
+
+    def test_rejects_tampered_cursor(self, feed_client):
+        """Test cursors that do not decode to a timestamp and uuid are rejected"""
+        tampered = feed.encode_cursor("2024-01-01T00:00:00+00:00", "x),cred_score.gte.0")
+
+        assert feed_client.get("/feed", params={"cursor": "not-a-cursor"}).status_code == 400
+        assert feed_client.get("/feed", params={"cursor": tampered}).status_code == 400
+
+    def test_repeat_poll_is_served_from_cache(self, feed_client, feed_table):
+        """Test an unchanged page is not queried again and keeps its ETag"""
+        first = feed_client.get("/feed", params={"limit": 10})
+        scanned = feed_table.scanned
+        second = feed_client.get("/feed", params={"limit": 10})
+
+        assert feed_table.scanned == scanned
+        assert second.content == first.content
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.headers["cache-control"].startswith("public, max-age=")
+        assert second.json()["total"] == 10
+
+    def test_if_none_match_returns_304(self, feed_client):
+        """Test a client holding the current ETag gets an empty 304"""
+        etag = feed_client.get("/feed", params={"limit": 10}).headers["etag"]
+
+        unchanged = feed_client.get("/feed", params={"limit": 10}, headers={"If-None-Match": f"W/{etag}"})
+        other_page = feed_client.get("/feed", params={"limit": 5}, headers={"If-None-Match": etag})
+
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+        assert unchanged.headers["etag"] == etag
+        assert other_page.status_code == 200
+
+    def test_report_write_invalidates_cached_pages(self, feed_client, feed_table, feed_cache):
+        """Test bumping the feed version serves the new report with a new ETag"""
+        before = feed_client.get("/feed", params={"min_confidence": 0, "limit": 10})
+        newest = dict(feed_table.rows[-1], id=str(uuid.UUID(int=10_000)), created_at="2030-01-01T00:00:00+00:00")
+        feed_table.rows.append(newest)
+        feed_table.keys.append((newest["created_at"], newest["id"]))
+
+        stale = feed_client.get("/feed", params={"min_confidence": 0, "limit": 10})
+        feed_cache.bump_version()
+        fresh = feed_client.get("/feed", params={"min_confidence": 0, "limit": 10})
+
+        assert stale.headers["etag"] == before.headers["etag"]
+        assert fresh.headers["etag"] != before.headers["etag"]
+        assert fresh.json()["items"][0]["id"] == newest["id"]
+
+    def test_failed_query_is_not_cached(self, feed_client, feed_table, monkeypatch):
+        """Test an empty error response is not stored in place of the page"""
+        def unavailable():
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(feed.db, "get_client", unavailable)
+        failed = feed_client.get("/feed", params={"limit": 10})
+        monkeypatch.setattr(feed.db, "get_client", lambda: feed_table)
+        recovered = feed_client.get("/feed", params={"limit": 10})
+
+        assert failed.json()["total"] == 0
+        assert recovered.json()["total"] == 10
+
+
+class FakeReportedClaimsRPC:
+    """reported_claims RPC over in-memory report rows, grouped and paged like the SQL"""
+
+    def __init__(self, reports, claim_reports):
+        self.reports = reports
+        self.claim_reports = claim_reports
+        self.calls = []
+
+    def rpc(self, name, params):
+        assert name == "reported_claims"
+        self.calls.append(params)
+        counts = {}
+        for claim_id in self.reports:
+            counts[claim_id] = counts.get(claim_id, 0) + 1
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        page = ranked[params["page_offset"]:params["page_offset"] + params["page_size"]]
+        rows = [
+            {"id": claim_id, "claim_text": f"text {claim_id}", "report_count": count, **self.claim_reports.get(claim_id, {})}
+            for claim_id, count in page
+        ]
+        return type("Query", (), {"execute": lambda _: type("Response", (), {"data": rows})()})()
+
+
+class TestReportedClaims:
+    @pytest.fixture
+    def rpc(self, monkeypatch):
+        reports = ["a"] * 5 + ["b"] * 9 + ["c"] * 2 + ["d"]
+        rpc = FakeReportedClaimsRPC(reports, {"b": {"cred_score": 12.0, "label": "fake"}})
+        monkeypatch.setattr(admin.db, "get_client", lambda: rpc)
+        monkeypatch.setattr(admin, "get_report_counters", lambda: ReportCounters())
+        return rpc
+
+    @pytest.fixture
+    def admin_client(self, rpc):
+        app = FastAPI()
+        app.include_router(admin.router, prefix="/admin")
+        return TestClient(app)
+
+    def test_pages_come_from_the_database_in_count_order(self, admin_client, rpc):
+        """Test each request fetches only its page, most reported first"""
+        first = admin_client.get("/admin/reported", params={"limit": 2}).json()
+        second = admin_client.get("/admin/reported", params={"limit": 2, "offset": 2}).json()
+
+        assert [(c["id"], c["report_count"]) for c in first + second] == [("b", 9), ("a", 5), ("c", 2), ("d", 1)]
+        assert rpc.calls == [{"page_size": 2, "page_offset": 0}, {"page_size": 2, "page_offset": 2}]
+
+    def test_claims_without_a_report_get_defaults(self, admin_client):
+        """Test claims never scored still list with score 0 and label unknown"""
+        claims = {c["id"]: c for c in admin_client.get("/admin/reported").json()}
+
+        assert (claims["b"]["cred_score"], claims["b"]["label"]) == (12.0, "fake")
+        assert (claims["a"]["cred_score"], claims["a"]["label"]) == (0, "unknown")
+
+
+class FakeClaimsTable:
+    """claims with embedded claim_reports, counting the batched lookups"""
+
+    def __init__(self, claims):
+        self.claims = claims
+        self.lookups = []
+
+    def table(self, name):
+        assert name == "claims"
+        return self
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        assert column == "id"
+        self.lookups.append(list(values))
+        self.wanted = set(values)
+        return self
+
+    def execute(self):
+        rows = [dict(claim, id=claim_id) for claim_id, claim in self.claims.items() if claim_id in self.wanted]
+        return type("Response", (), {"data": rows})()
+
+    def rpc(self, name, params):
+        raise AssertionError("counted in the database despite Redis counters")
+
+
+class TestReportCounterQueue:
+    @pytest.fixture
+    def counters(self, monkeypatch, fake_redis, fake_supabase):
+        fake_supabase.rpcs["report_counts"] = lambda params: []
+        counters = ReportCounters(fake_redis)
+        counters.reconcile(fake_supabase)
+        monkeypatch.setattr(admin, "get_report_counters", lambda: counters)
+        monkeypatch.setattr(report, "get_report_counters", lambda: counters)
+        return counters
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(admin.router, prefix="/admin")
+        app.include_router(report.router, prefix="/report")
+        return TestClient(app)
+
+    def _token(self, user_id, secret="test-secret"):
+        return jwt.encode({"sub": user_id, "aud": "authenticated"}, secret, algorithm="HS256")
+
+    def test_submitted_reports_reach_the_queue(self, client, counters, fake_supabase, monkeypatch):
+        """Test POST /report stores the report under the token's user and bumps its claim's counter"""
+        monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", "test-secret")
+        monkeypatch.setattr(report.db, "get_service_client", lambda: fake_supabase)
+        headers = {"Authorization": f"Bearer {self._token('u1')}"}
+
+        for claim_id in ["c1", "c2", "c2"]:
+            response = client.post(
+                "/report", json={"claim_id": claim_id, "user_id": "someone-else", "reason": "misleading"}, headers=headers
+            )
+            assert response.status_code == 201
+
+        assert {row["user_id"] for row in fake_supabase.tables["reports"]} == {"u1"}
+        assert len(fake_supabase.tables["reports"]) == 3
+        assert counters.top(10) == [("c2", 2), ("c1", 1)]
+        assert client.post("/report", json={"claim_id": "c1", "reason": " "}, headers=headers).status_code == 400
+
+    def test_reports_require_a_valid_token(self, client, counters, fake_supabase, monkeypatch):
+        """Test anonymous and forged reports are rejected before anything is stored"""
+        monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", "test-secret")
+        monkeypatch.setattr(report.db, "get_service_client", lambda: fake_supabase)
+        body = {"claim_id": "c1", "reason": "misleading"}
+
+        anonymous = client.post("/report", json=body)
+        forged = client.post("/report", json=body, headers={"Authorization": f"Bearer {self._token('u1', 'wrong')}"})
+
+        assert (anonymous.status_code, forged.status_code) == (401, 401)
+        assert "reports" not in fake_supabase.tables
+        assert counters.top(10) == []
+
+    def test_queue_hydrates_the_page_in_one_lookup(self, client, counters, monkeypatch):
+        """Test the top page is read from Redis and hydrated with one claims query"""
+        for claim_id, count in [("a", 3), ("b", 7), ("c", 1), ("gone", 5)]:
+            for _ in range(count):
+                counters.increment(claim_id)
+        claims = FakeClaimsTable({
+            "a": {"claim_text": "text a", "claim_reports": [
+                {"cred_score": 20.0, "label": "fake", "created_at": "2024-01-01T00:00:00+00:00"},
+                {"cred_score": 80.0, "label": "verified", "created_at": "2024-02-01T00:00:00+00:00"},
+            ]},
+            "b": {"claim_text": "text b", "claim_reports": []},
+            "c": {"claim_text": "text c", "claim_reports": []},
+        })
+        monkeypatch.setattr(admin.db, "get_client", lambda: claims)
+
+        page = client.get("/admin/reported", params={"limit": 3}).json()
+
+        assert [(c["id"], c["report_count"]) for c in page] == [("b", 7), ("a", 3)]
+        assert (page[1]["cred_score"], page[1]["label"]) == (80.0, "verified")
+        assert claims.lookups == [["b", "gone", "a"]]
@@ -1,9 +1,67 @@
+import asyncio
+import json
+import threading
 import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from app.connectors.newsapi_connector import NewsAPIConnector
 from app.connectors.google_factcheck_connector import GoogleFactCheckConnector
+from app.connectors.http import HTTPClient
+from prometheus_client import REGISTRY
 from datetime import datetime, timedelta
 
 
+class MockVendorHandler(BaseHTTPRequestHandler):
+    """Keep-alive HTTP/1.1 server answering NewsAPI and FactCheck paths"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests += 1
+        if "claims:search" in self.path:
+            payload = {"claims": [{
+                "text": "Claim text",
+                "claimReview": [{
+                    "publisher": {"name": "PolitiFact", "site": "politifact.com"},
+                    "url": "https://politifact.com/review",
+                    "title": "Review",
+                    "textualRating": "False",
+                }],
+            }]}
+        else:
+            payload = {"articles": [{
+                "url": "https://reuters.com/article/x",
+                "title": "Mock article",
+                "description": "Body",
+                "source": {"name": "Reuters"},
+                "publishedAt": "2024-01-15T10:30:00Z",
+            }]}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def mock_vendor():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockVendorHandler)
+    server.connections = 0
+    server.requests = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
 class TestNewsAPIConnector:
     def test_normalize_item(self):
         """Test item normalization"""
@@ -41,3 +99,113 @@ class TestGoogleFactCheckConnector:
         connector = GoogleFactCheckConnector()
         assert connector is not None
         assert connector.base_url is not None
+
+
+class TestAsyncHTTPConnectors:
+    @pytest.mark.asyncio
+    async def test_shared_client_reuses_connections(self, mock_vendor):
+        """Test repeated connector calls ride one keep-alive connection"""
+        base_url = f"http://127.0.0.1:{mock_vendor.server_address[1]}"
+        http_client = HTTPClient(http2=False, max_per_host=4)
+
+        news = NewsAPIConnector(http_client=http_client)
+        news.api_key = "test"
+        news.base_url = base_url
+        factcheck = GoogleFactCheckConnector(http_client=http_client)
+        factcheck.api_key = "test"
+        factcheck.base_url = base_url
+
+        try:
+            for page in range(1, 6):
+                items = await news.search("ai", page=page)
+                assert items[0]["source_name"] == "Reuters"
+            for _ in range(5):
+                reviews = await factcheck.search("ai")
+                assert reviews[0]["source_name"] == "PolitiFact"
+        finally:
+            await http_client.aclose()
+
+        assert mock_vendor.requests == 10
+        assert mock_vendor.connections == 1
+
+    def test_timeouts_are_split(self):
+        """Test connect and read timeouts are configured separately"""
+        http_client = HTTPClient(connect_timeout=2.0, read_timeout=9.0, http2=False)
+
+        timeout = http_client.client.timeout
+        assert timeout.connect == 2.0
+        assert timeout.read == 9.0
+
+
+class FakeRedis:
+    """Dict-backed stand-in exposing the get/setex calls connectors use"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode()
+        self.ttls[key] = ttl
+
+
+class TestConnectorCaching:
+    @pytest.fixture
+    def connector(self, monkeypatch):
+        connector = NewsAPIConnector(cache_client=FakeRedis())
+        connector.api_key = "test"
+        connector.upstream_calls = 0
+
+        async def get_json(url, params):
+            connector.upstream_calls += 1
+            await asyncio.sleep(0.05)
+            if params["q"] == "nothing":
+                return {"articles": []}
+            return {"articles": [{"url": "https://ap.org/a", "title": "A", "source": {"name": "AP"}}]}
+
+        monkeypatch.setattr(connector, "_get_json", get_json)
+        return connector
+
+    def test_cache_key_accepts_datetimes(self):
+        """Test datetime arguments serialise to a stable key"""
+        connector = NewsAPIConnector()
+        start = datetime(2024, 1, 15, 10, 30)
+
+        first = connector._get_cache_key("search", query="ai", start_date=start, page=1)
+        second = connector._get_cache_key("search", page=1, start_date=start, query="ai")
+
+        assert first == second
+        assert first != connector._get_cache_key("search", query="ai", start_date=None, page=1)
+
+    @pytest.mark.asyncio
+    async def test_results_and_empty_results_are_cached(self, connector):
+        """Test hits skip upstream and empty searches are negatively cached"""
+        start = datetime(2024, 1, 1)
+        hits_before = REGISTRY.get_sample_value(
+            "truthverse_connector_cache_requests_total",
+            {"connector": "NewsAPIConnector", "result": "hit"},
+        ) or 0
+
+        assert len(await connector.search("ai", start_date=start)) == 1
+        assert len(await connector.search("ai", start_date=start)) == 1
+        assert await connector.search("nothing") == []
+        assert await connector.search("nothing") == []
+
+        assert connector.upstream_calls == 2
+        assert min(connector.cache_client.ttls.values()) <= 300
+        hits_after = REGISTRY.get_sample_value(
+            "truthverse_connector_cache_requests_total",
+            {"connector": "NewsAPIConnector", "result": "hit"},
+        )
+        assert hits_after - hits_before == 2
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_searches_are_coalesced(self, connector):
+        """Test concurrent identical calls share one upstream fetch"""
+        results = await asyncio.gather(*[connector.search("ai") for _ in range(5)])
+
+        assert connector.upstream_calls == 1
+        assert all(r == results[0] for r in results)
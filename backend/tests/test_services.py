@@ -1,6 +1,48 @@
+import asyncio
+import os
+import threading
+import time
 import pytest
+import numpy as np
 from app.services.claim_extraction import ClaimExtractor
 from app.services.scoring import ScoringService
+from app.services import nli as nli_module
+from app.services.nli import NLIService
+from app.core.model_registry import ModelRegistry
+from app.services import dense_index as dense_index_module
+from app.services.dense_index import DenseIndex
+from app.services.retrieval import HybridRetriever
+from app.services import retrieval as retrieval_module
+from app.services.bm25_index import BM25Index
+from app.services.verify_cache import VerificationCache
+from app.services.verification import VerificationService
+from app.services.near_duplicates import NearDuplicateIndex
+from app.services.nli_cache import StanceCache
+from app.services.feed_cache import FeedCache, etag_matches
+from app.services.report_counters import ReportCounters
+from app.services.inference_scheduler import InferenceScheduler
+from app.core.cache import RedisTier
+from app.core.config import settings
+
+
+class FakeNLIPipeline:
+    """Deterministic stand-in for the transformers text-classification pipeline"""
+
+    def __init__(self):
+        self.calls = []
+
+    def _classify(self, text):
+        if "not" in text:
+            return {"label": "CONTRADICTION", "score": 0.91}
+        if "shows" in text:
+            return {"label": "ENTAILMENT", "score": 0.87}
+        return {"label": "NEUTRAL", "score": 0.55}
+
+    def __call__(self, inputs, **kwargs):
+        self.calls.append((inputs, kwargs))
+        if isinstance(inputs, str):
+            return [self._classify(inputs)]
+        return [self._classify(text) for text in inputs]
 
 
 class TestClaimExtractor:
@@ -32,6 +74,111 @@ class TestClaimExtractor:
         assert extractor._is_potential_claim("According to research, AI helps")
         assert not extractor._is_potential_claim("Hello world")
 
+    def test_matches_legacy_rules_on_edge_cases(self):
+        """Test the single-pass matcher keeps the original per-pattern results"""
+        extractor = ClaimExtractor()
+        text = (
+            "The REPORT was released to the press today.\n"
+            "Prices rose 12\npercent across the region last year!  "
+            "Officials said\tthe UNESCO panel will meet again soon? "
+            "Analysts were according\nto the briefing quite cautious. "
+            "The dataset covered hundreds of samples overall. "
+            "Short one. "
+            "The İstudy covered many towns across the region."
+        )
+
+        assert extractor.extract_claims(text) == [
+            "the report was released to the press today",
+            "prices rose 12 percent across the region last year",
+            "officials said the unesco panel will meet again soon",
+            "analysts were according to the briefing quite cautious",
+            "the i̇study covered many towns across the region",
+        ]
+        assert extractor.extract_claims(text, max_claims=2) == extractor.extract_claims(text)[:2]
+
+    def test_extract_claims_bulk_preserves_order(self, monkeypatch):
+        """Test bulk extraction across processes matches per-document extraction"""
+        from app.services import claim_extraction
+
+        monkeypatch.setattr(claim_extraction, "BULK_INLINE_THRESHOLD", 0)
+        extractor = ClaimExtractor()
+        docs = [f"Document {i} study shows {i}% of patients improved. Nothing else here to see today." for i in range(20)]
+
+        assert extractor.extract_claims_bulk(docs, processes=2) == [extractor.extract_claims(d) for d in docs]
+
+
+class FakeClaimDetector:
+    """Scores sentences mentioning 'vaccine' as check-worthy"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, inputs, **kwargs):
+        self.calls.append(list(inputs))
+        return [
+            [
+                {"label": "LABEL_1", "score": 0.9 if "vaccine" in text else 0.1},
+                {"label": "LABEL_0", "score": 0.1 if "vaccine" in text else 0.9},
+            ]
+            for text in inputs
+        ]
+
+
+class TestClaimCascade:
+    TEXT = (
+        "The weather was pleasant for the parade downtown. "
+        "Our research team enjoyed the conference lunch. "
+        "A new study shows 40% fewer hospital admissions. "
+        "Officials cited data on vaccine uptake among adults."
+    )
+
+    def test_only_ambiguous_sentences_reach_the_detector(self):
+        """Test the rules decide clear cases and the detector ranks the rest"""
+        detector = FakeClaimDetector()
+        extractor = ClaimExtractor(ModelRegistry(loaders={"claim_detector": lambda: detector}))
+
+        ranked = extractor.rank_claims(self.TEXT)
+
+        assert detector.calls == [[
+            "Our research team enjoyed the conference lunch",
+            "Officials cited data on vaccine uptake among adults",
+        ]]
+        assert [(c["claim_text"], c["stage"]) for c in ranked] == [
+            ("a new study shows 40% fewer hospital admissions", "rules"),
+            ("officials cited data on vaccine uptake among adults", "detector"),
+        ]
+        assert ranked[0]["score"] == 1.0
+
+    def test_rules_alone_without_detector(self):
+        """Test ambiguous sentences are kept on rule score when no detector loads"""
+        extractor = ClaimExtractor(ModelRegistry(loaders={}))
+
+        ranked = extractor.rank_claims(self.TEXT, max_claims=2)
+
+        assert [c["claim_text"] for c in ranked] == [
+            "a new study shows 40% fewer hospital admissions",
+            "our research team enjoyed the conference lunch",
+        ]
+        assert {c["claim_text"] for c in extractor.rank_claims(self.TEXT)} == set(extractor.extract_claims(self.TEXT))
+
+    def test_detector_disabled_unless_configured(self, monkeypatch):
+        """Test the default registry skips the detector when no fine-tuned model is set"""
+        monkeypatch.setattr(settings, "CLAIM_DETECTOR_MODEL", None)
+        assert "claim_detector" not in ModelRegistry().status()["models"]
+
+        monkeypatch.setattr(settings, "CLAIM_DETECTOR_MODEL", "org/check-worthiness")
+        assert "claim_detector" in ModelRegistry().status()["models"]
+
+    def test_detector_batches_across_documents(self):
+        """Test rank_claims_many sends all ambiguous sentences in one call"""
+        detector = FakeClaimDetector()
+        extractor = ClaimExtractor(ModelRegistry(loaders={"claim_detector": lambda: detector}))
+
+        ranked = extractor.rank_claims_many([self.TEXT, "Fresh data on vaccine safety arrived today.", ""])
+
+        assert len(detector.calls) == 1
+        assert [len(doc) for doc in ranked] == [2, 1, 0]
+
 
 class TestScoringService:
     def test_compute_score_verified(self):
@@ -73,3 +220,830 @@ class TestScoringService:
 
         assert 40 < result["cred_score"] < 70
         assert result["label"] == "needs_review"
+
+
+class TestNLIService:
+    @pytest.fixture
+    def service(self, monkeypatch):
+        monkeypatch.setattr(nli_module, "pipeline", lambda *args, **kwargs: FakeNLIPipeline())
+        return NLIService()
+
+    def test_get_stance_batch_matches_per_pair(self, service):
+        """Test batched stance results match the per-pair path"""
+        pairs = [
+            ("AI detects cancer", "Study shows AI detects cancer early"),
+            ("AI detects cancer", "AI does not detect cancer"),
+            ("AI detects cancer", "The weather was sunny"),
+            ("Vaccines are safe", "A long report about an unrelated topic entirely"),
+        ]
+
+        batched = service.get_stance_batch(pairs, batch_size=3)
+        single = [service.get_stance(claim, evidence) for claim, evidence in pairs]
+
+        assert batched == single
+        assert [r["stance"] for r in batched] == ["support", "contradict", "neutral", "neutral"]
+
+    def test_get_stance_batch_buckets_by_length(self, service):
+        """Test pairs are chunked into length-sorted batches"""
+        pairs = [("claim", "x" * n) for n in (50, 5, 30, 10, 40)]
+
+        service.get_stance_batch(pairs, batch_size=2)
+
+        batches = [inputs for inputs, _ in service.model.calls]
+        assert [len(b) for b in batches] == [2, 2, 1]
+        lengths = [len(text) for batch in batches for text in batch]
+        assert lengths == sorted(lengths)
+
+    def test_get_stance_batch_fallback_without_model(self, service):
+        """Test keyword fallback is used when no model is loaded"""
+        service.model = None
+
+        results = service.get_stance_batch([("ai improves care", "ai improves care a lot")])
+
+        assert results[0]["stance"] == "support"
+        assert service.get_stance_batch([]) == []
+
+
+class TestNLICascade:
+    class FastNLIPipeline(FakeNLIPipeline):
+        """Confident only on clear entailment; contradictions stay under their threshold"""
+
+        def _classify(self, text):
+            if "not" in text:
+                return {"label": "CONTRADICTION", "score": 0.93}
+            if "shows" in text:
+                return {"label": "ENTAILMENT", "score": 0.97}
+            return {"label": "NEUTRAL", "score": 0.6}
+
+    def test_only_unconfident_pairs_are_escalated(self):
+        """Test confident fast-tier stances are kept and the rest reach the full model"""
+        full, fast = FakeNLIPipeline(), self.FastNLIPipeline()
+        service = NLIService(ModelRegistry(loaders={"nli": lambda: full, "nli_fast": lambda: fast}))
+        pairs = [
+            ("AI detects cancer", "Study shows AI detects cancer early"),
+            ("AI detects cancer", "AI does not detect cancer"),
+            ("AI detects cancer", "The weather was sunny"),
+        ]
+
+        results = service.get_stance_batch(pairs)
+
+        assert [len(inputs) for inputs, _ in fast.calls] == [3]
+        assert sorted(text.split(" [SEP] ")[1] for inputs, _ in full.calls for text in inputs) == [
+            "AI does not detect cancer",
+            "The weather was sunny",
+        ]
+        assert [(r["stance"], r["tier"]) for r in results] == [
+            ("support", "fast"),
+            ("contradict", "full"),
+            ("neutral", "full"),
+        ]
+        assert results[0]["score"] == 0.97
+
+    def test_thresholds_are_configurable(self, monkeypatch):
+        """Test lowering a stance's threshold keeps more pairs in the fast tier"""
+        monkeypatch.setattr(settings, "NLI_CASCADE_CONTRADICT_THRESHOLD", 0.9)
+        monkeypatch.setattr(settings, "NLI_CASCADE_NEUTRAL_THRESHOLD", 0.5)
+        full = FakeNLIPipeline()
+        service = NLIService(ModelRegistry(loaders={"nli": lambda: full, "nli_fast": self.FastNLIPipeline}))
+
+        results = service.get_stance_batch([("c", "it does not work"), ("c", "unrelated text")])
+
+        assert [r["tier"] for r in results] == ["fast", "fast"]
+        assert full.calls == []
+
+    def test_without_fast_model_every_pair_uses_full_model(self):
+        """Test the cascade is off unless a fast model is registered"""
+        service = NLIService(ModelRegistry(loaders={"nli": FakeNLIPipeline}))
+
+        assert service.get_stance("AI detects cancer", "Study shows it")["tier"] == "full"
+
+
+class TestModelRegistry:
+    def test_models_load_once_and_are_shared(self):
+        """Test each model is constructed once and injected into services"""
+        loads = []
+
+        def load_nli():
+            loads.append("nli")
+            return FakeNLIPipeline()
+
+        registry = ModelRegistry(loaders={"nli": load_nli})
+        registry.load_all()
+
+        first = NLIService(registry)
+        second = NLIService(registry)
+
+        assert loads == ["nli"]
+        assert first.model is second.model
+        assert registry.status()["models"]["nli"]["state"] == "loaded"
+
+    def test_failed_load_is_recorded(self):
+        """Test a failing loader is reported and not retried per request"""
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise RuntimeError("no weights")
+
+        registry = ModelRegistry(loaders={"nli": broken})
+
+        assert registry.get("nli") is None
+        assert registry.get("nli") is None
+        assert len(calls) == 1
+        assert registry.status()["models"]["nli"]["state"] == "failed"
+        assert NLIService(registry).model is None
+
+
+class TestDenseIndex:
+    def _vectors(self, n, dim=16, seed=0):
+        return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+    def test_build_load_and_search(self, tmp_path):
+        """Test a persisted index maps FAISS hits back to snippet ids"""
+        ids = [f"00000000-0000-0000-0000-{i:012d}" for i in range(50)]
+        vectors = self._vectors(50)
+        DenseIndex.build(str(tmp_path), ids, vectors)
+
+        index = DenseIndex.load(str(tmp_path))
+        hits = index.search(vectors[7], top_k=3)[0]
+
+        assert index.read_only
+        assert hits[0][0] == ids[7]
+        assert hits[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert len(hits) == 3
+
+    def test_incremental_add(self, tmp_path):
+        """Test appending vectors to a memory-mapped index"""
+        ids = [f"00000000-0000-0000-0000-{i:012d}" for i in range(10)]
+        DenseIndex.build(str(tmp_path), ids, self._vectors(10))
+
+        index = DenseIndex.load(str(tmp_path))
+        new_vector = self._vectors(1, seed=42)
+        index.add(["00000000-0000-0000-0000-999999999999"], new_vector)
+
+        reloaded = DenseIndex.load(str(tmp_path))
+        assert len(reloaded) == 11
+        assert reloaded.search(new_vector, top_k=1)[0][0][0] == "00000000-0000-0000-0000-999999999999"
+
+    def test_get_dense_index_reloads_after_save(self, tmp_path, monkeypatch):
+        """Test the process-wide index picks up appends while old mappings stay readable"""
+        monkeypatch.setattr(settings, "DENSE_INDEX_DIR", str(tmp_path))
+        monkeypatch.setattr(dense_index_module, "_index_mtime", None)
+        ids = [f"00000000-0000-0000-0000-{i:012d}" for i in range(10)]
+        vectors = self._vectors(10)
+        DenseIndex.build(str(tmp_path), ids, vectors)
+
+        served = dense_index_module.get_dense_index()
+        assert len(served) == 10
+        DenseIndex.load(str(tmp_path), mmap=False).add(["00000000-0000-0000-0000-999999999999"], self._vectors(1, seed=42))
+
+        assert sorted(os.listdir(tmp_path)) == sorted([DenseIndex.INDEX_FILE, DenseIndex.IDS_FILE])
+        assert served.search(vectors[3], top_k=1)[0][0][0] == ids[3]
+        assert len(dense_index_module.get_dense_index()) == 11
+
+
+class TestHybridFusion:
+    @pytest.fixture
+    def retriever(self, monkeypatch):
+        retriever = HybridRetriever()
+        monkeypatch.setattr(retriever, "_bm25_search", lambda query, top_k: [
+            {"snippet_id": "a", "sentence_text": "a", "bm25_score": 0.9},
+            {"snippet_id": "b", "sentence_text": "b", "bm25_score": 0.5},
+            {"snippet_id": "c", "sentence_text": "c", "bm25_score": 0.1},
+        ][:top_k])
+        monkeypatch.setattr(retriever, "_dense_search", lambda query, top_k: [
+            {"snippet_id": "c", "sentence_text": "c", "dense_score": 0.95},
+            {"snippet_id": "d", "sentence_text": "d", "dense_score": 0.60},
+        ][:top_k])
+        return retriever
+
+    def test_rrf_prefers_snippets_found_by_both_stages(self, retriever, monkeypatch):
+        """Test reciprocal-rank fusion orders by combined rank"""
+        monkeypatch.setattr(settings, "RETRIEVAL_FUSION", "rrf")
+
+        results = retriever.retrieve_hybrid("query", top_k=4)
+
+        assert [r["snippet_id"] for r in results][:2] == ["c", "a"]
+        assert results[0]["bm25_score"] == 0.1
+        assert results[0]["dense_score"] == 0.95
+        scores = [r["retrieval_score"] for r in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_weighted_fusion_normalises_scores(self, retriever, monkeypatch):
+        """Test weighted min-max fusion"""
+        monkeypatch.setattr(settings, "RETRIEVAL_FUSION", "weighted")
+        monkeypatch.setattr(settings, "RETRIEVAL_DENSE_WEIGHT", 0.5)
+
+        results = retriever.retrieve_hybrid("query", top_k=4)
+
+        by_id = {r["snippet_id"]: r["retrieval_score"] for r in results}
+        assert by_id["a"] == pytest.approx(0.5)
+        assert by_id["c"] == pytest.approx(0.5)
+        assert by_id["d"] == pytest.approx(0.0)
+        assert by_id["b"] == pytest.approx(0.25)
+
+    def test_candidate_depths_are_configurable(self, retriever):
+        """Test per-stage candidate depth is passed to each stage"""
+        results = retriever.retrieve_hybrid("query", top_k=10, lexical_k=1, dense_k=1)
+
+        assert {r["snippet_id"] for r in results} == {"a", "c"}
+
+
+def _snippet(snippet_id, text):
+    return {"snippet_id": snippet_id, "sentence_text": text, "source_name": "Reuters", "source_trust": 0.9}
+
+
+class TestBM25Index:
+    @pytest.fixture
+    def index(self):
+        index = BM25Index()
+        index.add([
+            _snippet("s1", "The vaccine prevents severe illness in older adults"),
+            _snippet("s2", "Malaria deaths fell by 12% according to the WHO"),
+            _snippet("s3", "Vaccine uptake rose while vaccine hesitancy fell"),
+            _snippet("s4", "Emissions reductions agreed by 195 nations"),
+        ])
+        return index
+
+    def test_search_ranks_by_bm25(self, index):
+        """Test documents matching more query terms rank first"""
+        results = index.search("vaccine prevents illness", top_k=2)
+
+        assert [r["snippet_id"] for r in results] == ["s1", "s3"]
+        assert results[0]["bm25_score"] > results[1]["bm25_score"] > 0
+        assert index.search("unrelated words", top_k=5) == []
+
+    def test_save_load_roundtrip(self, index, tmp_path):
+        """Test a memory-mapped index returns the same results"""
+        expected = index.search("malaria deaths WHO", top_k=3)
+        index.save(str(tmp_path))
+
+        loaded = BM25Index.load(str(tmp_path))
+
+        assert len(loaded) == 4
+        assert loaded.search("malaria deaths WHO", top_k=3) == expected
+
+    def test_incremental_append(self, index, tmp_path):
+        """Test appended documents are searchable before and after save"""
+        index.save(str(tmp_path))
+        loaded = BM25Index.load(str(tmp_path))
+
+        loaded.add([_snippet("s5", "Flood warnings issued for coastal towns")])
+        assert loaded.search("flood warnings", top_k=1)[0]["snippet_id"] == "s5"
+
+        loaded.save()
+        reloaded = BM25Index.load(str(tmp_path))
+        assert len(reloaded) == 5
+        assert reloaded.search("flood warnings", top_k=1)[0]["snippet_id"] == "s5"
+        assert reloaded.get_by_snippet_id("s2")["sentence_text"].startswith("Malaria")
+
+    def test_save_leaves_existing_mappings_intact(self, index, tmp_path):
+        """Test a reader mapping the old files is unaffected by another instance's save"""
+        index.save(str(tmp_path))
+        reader = BM25Index.load(str(tmp_path))
+        writer = BM25Index.load(str(tmp_path))
+
+        writer.add([_snippet("s5", "Flood warnings issued for coastal towns")])
+        writer.save()
+
+        assert len(reader) == 4
+        assert reader.search("malaria deaths", top_k=1)[0]["snippet_id"] == "s2"
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    def test_demo_mode_retrieval_uses_local_index(self, index, monkeypatch):
+        """Test DEMO_MODE lexical search never touches Supabase"""
+        monkeypatch.setattr(settings, "DEMO_MODE", True)
+        monkeypatch.setattr(retrieval_module, "get_local_bm25_index", lambda: index)
+        monkeypatch.setattr(retrieval_module.db, "get_client", lambda: pytest.fail("Supabase used"))
+
+        results = HybridRetriever().retrieve_hybrid("vaccine illness", top_k=3)
+
+        assert results[0]["snippet_id"] == "s1"
+
+
+class TestVerificationCache:
+    @pytest.mark.asyncio
+    async def test_misses_are_computed_once_then_served_from_cache(self):
+        """Test results are cached per canonical hash"""
+        cache = VerificationCache(redis_client=None, local_size=8, ttl=60)
+        calls = []
+
+        async def compute(hashes):
+            calls.append(list(hashes))
+            return {h: {"result": {"label": "verified"}, "checked_sources": 1} for h in hashes}
+
+        first = await cache.get_or_compute_many(["h1", "h2", "h1"], compute)
+        second = await cache.get_or_compute_many(["h1", "h2"], compute)
+
+        assert calls == [["h1", "h2"]]
+        assert first == second
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_single_flight(self):
+        """Test concurrent lookups for one claim run the pipeline once"""
+        cache = VerificationCache(redis_client=None, local_size=8, ttl=60)
+        calls = []
+
+        async def compute(hashes):
+            calls.append(list(hashes))
+            await asyncio.sleep(0.05)
+            return {h: {"result": {"label": "fake"}, "checked_sources": 2} for h in hashes}
+
+        results = await asyncio.gather(*[
+            cache.get_or_compute_many(["viral"], compute) for _ in range(10)
+        ])
+
+        assert calls == [["viral"]]
+        assert all(r["viral"]["result"]["label"] == "fake" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_failed_claims_are_not_cached(self):
+        """Test a compute that omits a hash leaves it uncached"""
+        cache = VerificationCache(redis_client=None, local_size=8, ttl=60)
+
+        async def compute(hashes):
+            return {}
+
+        assert await cache.get_or_compute_many(["h1"], compute) == {}
+        assert cache.get("h1") is None
+
+    @pytest.mark.asyncio
+    async def test_redis_runs_off_the_event_loop_and_unlocks_atomically(self, fake_redis):
+        """Test Redis calls use the executor and the lock is released by compare-and-delete"""
+        threads = set()
+        evals = []
+
+        class RecordingRedis:
+            def __getattr__(self, name):
+                threads.add(threading.current_thread())
+                return getattr(fake_redis, name)
+
+            def eval(self, script, numkeys, key, token):
+                evals.append((key, token, fake_redis.get(key)))
+
+        cache = VerificationCache(redis_client=RecordingRedis(), local_size=8, ttl=60)
+
+        async def compute(hashes):
+            return {h: {"result": {"label": "verified"}, "checked_sources": 1} for h in hashes}
+
+        await cache.get_or_compute_many(["h1"], compute)
+
+        assert threads and threading.main_thread() not in threads
+        (key, token, held), = evals
+        assert key.endswith(":lock") and held == token.encode()
+
+
+class TestVerificationService:
+    @pytest.mark.asyncio
+    async def test_verify_text_reuses_cached_claim_results(self, monkeypatch):
+        """Test repeated claims skip retrieval and NLI"""
+        registry = ModelRegistry(loaders={"nli": FakeNLIPipeline})
+        service = VerificationService(registry, cache=VerificationCache(redis_client=None))
+        retrievals = []
+
+        def retrieve(query, top_k=50):
+            retrievals.append(query)
+            return [{"snippet_id": "s1", "sentence_text": "Study shows the drug works", "source_id": "src"}]
+
+        monkeypatch.setattr(service.retriever, "retrieve_hybrid", retrieve)
+
+        text = "A new study shows 95% of patients improved."
+        first = await service.verify_text(text)
+        second = await service.verify_text(text.replace("95", "80"))
+
+        assert len(retrievals) == 1
+        assert first["claims"][0]["label"] == second["claims"][0]["label"]
+        assert "80%" in second["claims"][0]["claim_text"]
+        assert second["checked_sources"] == 1
+
+    @pytest.mark.asyncio
+    async def test_claims_run_concurrently_in_order(self, monkeypatch):
+        """Test per-claim pipelines overlap and results keep claim order"""
+        monkeypatch.setattr(settings, "VERIFY_MAX_CLAIMS_IN_FLIGHT", 3)
+        registry = ModelRegistry(loaders={"nli": FakeNLIPipeline})
+        service = VerificationService(registry, cache=VerificationCache(redis_client=None))
+
+        def retrieve(query, top_k=50):
+            time.sleep(0.2 if "first" in query else 0.1)
+            return [{"snippet_id": query, "sentence_text": query, "source_id": "src"}]
+
+        monkeypatch.setattr(service.retriever, "retrieve_hybrid", retrieve)
+
+        text = (
+            "The first study shows vaccines work. "
+            "The second report shows emissions fell. "
+            "The third research paper shows malaria declined."
+        )
+        start = time.perf_counter()
+        result = await service.verify_text(text)
+        elapsed = time.perf_counter() - start
+
+        assert [c["claim_text"].split()[1] for c in result["claims"]] == ["first", "second", "third"]
+        assert elapsed < 0.35
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_claims_as_they_complete(self, monkeypatch):
+        """Test the fastest claim is streamed before slower ones finish"""
+        registry = ModelRegistry(loaders={"nli": FakeNLIPipeline})
+        service = VerificationService(registry, cache=VerificationCache(redis_client=None))
+
+        def retrieve(query, top_k=50):
+            time.sleep(0.3 if "first" in query else 0.02)
+            return [{"snippet_id": query, "sentence_text": query, "source_id": "src"}]
+
+        monkeypatch.setattr(service.retriever, "retrieve_hybrid", retrieve)
+
+        text = "The first study shows vaccines work. The second report shows emissions fell."
+        start = time.perf_counter()
+        frames = []
+        async for frame in service.verify_text_stream(text):
+            frames.append((frame, time.perf_counter() - start))
+
+        assert [f["type"] for f, _ in frames] == ["claims", "claim", "claim", "summary"]
+        assert len(frames[0][0]["claims"]) == 2
+        first_result, first_at = frames[1]
+        assert first_result["index"] == 1
+        assert first_at < 0.2
+        assert frames[-1][0]["checked_sources"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_dedupes_claims_and_pools_nli(self, monkeypatch):
+        """Test shared claims are verified once and NLI runs as one batch"""
+        nli = FakeNLIPipeline()
+        registry = ModelRegistry(loaders={"nli": lambda: nli})
+        service = VerificationService(registry, cache=VerificationCache(redis_client=None))
+        retrievals = []
+
+        def retrieve(query, top_k=50):
+            retrievals.append(query)
+            return [{"snippet_id": query, "sentence_text": "Study shows it works", "source_id": "src"}]
+
+        monkeypatch.setattr(service.retriever, "retrieve_hybrid", retrieve)
+
+        shared = "A new study shows 95% of patients improved."
+        result = await service.verify_batch([
+            {"text": shared},
+            {"text": f"{shared} The report shows emissions fell by 12%."},
+            {"text": "short"},
+        ])
+
+        assert result["unique_claims"] == 2
+        assert len(retrievals) == 2
+        assert len(nli.calls) == 1
+        assert [len(doc["claims"]) for doc in result["results"]] == [1, 2, 0]
+        assert result["results"][0]["claims"][0] == result["results"][1]["claims"][0]
+
+
+class TestInferenceScheduler:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_a_batch(self):
+        """Test items from concurrent callers are run as one batch"""
+        batches = []
+
+        def run_batch(items):
+            batches.append(list(items))
+            return [item * 10 for item in items]
+
+        scheduler = InferenceScheduler("test", run_batch, max_batch_size=16, max_wait=0.05)
+        results = await asyncio.gather(
+            scheduler.submit_many([1, 2]),
+            scheduler.submit(3),
+            scheduler.submit_many([4, 5, 6]),
+        )
+        await scheduler.close()
+
+        assert results == [[10, 20], 30, [40, 50, 60]]
+        assert batches == [[1, 2, 3, 4, 5, 6]]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_before_max_wait(self):
+        """Test a full batch does not wait out max_wait and oversize submissions are split"""
+        batches = []
+
+        def run_batch(items):
+            batches.append(len(items))
+            return items
+
+        scheduler = InferenceScheduler("test", run_batch, max_batch_size=4, max_wait=5.0)
+        start = time.perf_counter()
+        results = await scheduler.submit_many(list(range(8)))
+        elapsed = time.perf_counter() - start
+        await scheduler.close()
+
+        assert results == list(range(8))
+        assert batches == [4, 4]
+        assert elapsed < 1.0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_fails_its_callers_only(self):
+        """Test a batch error reaches its callers and later batches still run"""
+        def run_batch(items):
+            if "bad" in items:
+                raise RuntimeError("model crashed")
+            return items
+
+        scheduler = InferenceScheduler("test", run_batch, max_batch_size=8, max_wait=0.001)
+        with pytest.raises(RuntimeError):
+            await scheduler.submit("bad")
+        assert await scheduler.submit("good") == "good"
+        await scheduler.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_nli_batches(self, monkeypatch):
+        """Test NLI pairs from concurrent verifications reach the model together"""
+        monkeypatch.setattr(settings, "NLI_SCHEDULER_MAX_WAIT_MS", 200.0)
+        nli = FakeNLIPipeline()
+        registry = ModelRegistry(loaders={"nli": lambda: nli})
+
+        def retrieve(query, top_k=50):
+            return [{"snippet_id": query, "sentence_text": "Study shows it works", "source_id": "src"}]
+
+        services = [VerificationService(registry, cache=VerificationCache(redis_client=None)) for _ in range(2)]
+        for service in services:
+            monkeypatch.setattr(service.retriever, "retrieve_hybrid", retrieve)
+
+        results = await asyncio.gather(
+            services[0].verify_text("A new study shows 95% of patients improved."),
+            services[1].verify_text("The report shows emissions fell by 12% last year."),
+        )
+
+        assert [len(r["claims"]) for r in results] == [1, 1]
+        assert [len(inputs) for inputs, _ in nli.calls] == [2]
+        assert services[0].nli_service.scheduler is services[1].nli_service.scheduler
+
+
+class TestNearDuplicateIndex:
+    CLAIMS = {
+        "c1": "the vaccine causes autism in children",
+        "c2": "unemployment fell to 3.5 percent last quarter",
+        "c3": "global emissions increased by 12% in 2023",
+    }
+
+    def test_paraphrases_match_and_unrelated_claims_do_not(self, tmp_path):
+        """Test reordered and reinflected claims resolve to the same claim"""
+        index = NearDuplicateIndex.build(str(tmp_path), list(self.CLAIMS), list(self.CLAIMS.values()))
+
+        claim_id, similarity = index.query("Autism in children is caused by the vaccine")
+
+        assert claim_id == "c1"
+        assert similarity == 1.0
+        assert index.query("unemployment fell to 4.1 percent last quarter")[0] == "c2"
+        assert index.query("the vaccine reduces hospital admissions") is None
+
+    def test_negated_claim_does_not_match(self, tmp_path):
+        """Test a claim and its denial never resolve to each other"""
+        index = NearDuplicateIndex.build(str(tmp_path), ["c1"], ["Vaccines have caused autism in children"])
+        negated = NearDuplicateIndex.build(str(tmp_path / "neg"), ["n1"], ["Vaccines haven't caused autism in children"])
+
+        assert index.query("Vaccines have not caused autism in children") is None
+        assert index.query("Vaccines never caused autism in children") is None
+        assert negated.query("Vaccines have not caused autism in children")[0] == "n1"
+        assert negated.query("Vaccines have caused autism in children") is None
+
+    def test_incremental_inserts_survive_reload(self, tmp_path):
+        """Test appended claims are persisted and duplicates skipped"""
+        index = NearDuplicateIndex.build(str(tmp_path), ["c1"], [self.CLAIMS["c1"]])
+        assert index.add(["c1", "c2"], [self.CLAIMS["c1"], self.CLAIMS["c2"]]) == 1
+        signatures_path = tmp_path / NearDuplicateIndex.SIGNATURES_FILE
+        old_inode = os.stat(signatures_path).st_ino
+        index.save()
+
+        assert os.stat(signatures_path).st_ino != old_inode
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+        reloaded = NearDuplicateIndex.load(str(tmp_path))
+
+        assert len(reloaded) == 2
+        assert reloaded.query("last quarter unemployment fell to 3.5 percent")[0] == "c2"
+
+    @pytest.mark.asyncio
+    async def test_verification_reuses_near_duplicate_report(self, tmp_path, monkeypatch, fake_supabase):
+        """Test a paraphrased claim is answered from the stored report"""
+        from app.services import verification as verification_module
+
+        index = NearDuplicateIndex.build(str(tmp_path), ["c1"], ["A new study shows the vaccine causes autism"])
+        fake_supabase.tables["claim_reports"] = [
+            {"id": "r1", "claim_id": "c1", "cred_score": 8.0, "label": "fake",
+             "explain_text": "Contradicted by trusted sources.", "created_at": "2026-01-01"},
+        ]
+        monkeypatch.setattr(verification_module.db, "get_client", lambda: fake_supabase)
+
+        service = VerificationService(ModelRegistry(loaders={"nli": FakeNLIPipeline}), cache=VerificationCache(redis_client=None))
+        service.near_duplicates = index
+        monkeypatch.setattr(service.retriever, "retrieve_hybrid", lambda *a, **k: pytest.fail("pipeline ran"))
+
+        result = await service.verify_text("Autism is caused by the vaccine, a new study shows.")
+
+        assert result["claims"][0]["label"] == "fake"
+        assert result["claims"][0]["near_duplicate_of"]["claim_id"] == "c1"
+        assert len(service.cache.local) == 0
+
+    def test_explicit_zero_threshold_is_kept(self, tmp_path):
+        """Test threshold=0.0 is not replaced by the configured default"""
+        assert NearDuplicateIndex(str(tmp_path), threshold=0.0).threshold == 0.0
+
+
+class FakeEvidenceTable:
+    """Returns fixed evidence rows for any query chain"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def table(self, name):
+        self.queries += 1
+        return self
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return type("Response", (), {"data": self.rows})()
+
+
+class TestStanceCache:
+    PAIRS = [("the drug shows benefit", "Study shows the drug works"), ("the drug shows benefit", "It does not work")]
+    KEYS = [("h1", "s1"), ("h1", "s2")]
+
+    def test_only_misses_reach_the_model(self):
+        """Test a repeated candidate set is served from cache"""
+        nli = FakeNLIPipeline()
+        service = NLIService(ModelRegistry(loaders={"nli": lambda: nli}), cache=StanceCache(local_size=16))
+
+        first = service.get_stance_batch(self.PAIRS, keys=self.KEYS)
+        second = service.get_stance_batch(self.PAIRS + [("the drug shows benefit", "Unrelated")], keys=self.KEYS + [("h1", "s3")])
+
+        assert [len(inputs) for inputs, _ in nli.calls] == [2, 1]
+        assert second[:2] == first
+        assert [r["stance"] for r in first] == ["support", "contradict"]
+
+    def test_model_name_partitions_entries(self):
+        """Test entries cached for one NLI model are not served for another"""
+        old_model = StanceCache(local_size=16, model_name="old-nli")
+        old_model.set_many({("h1", "s1"): {"stance": "support", "score": 0.9}})
+        new_model = StanceCache(local_size=16, model_name="new-nli")
+        new_model.local = old_model.local
+
+        assert old_model.get_many([("h1", "s1")]) == {("h1", "s1"): {"stance": "support", "score": 0.9}}
+        assert new_model.get_many([("h1", "s1")]) == {}
+
+    def test_falls_back_to_evidence_table(self, monkeypatch):
+        """Test stored evidence rows answer misses and are promoted to the LRU"""
+        monkeypatch.setattr(settings, "NLI_CACHE_EVIDENCE_LOOKUP", True)
+        monkeypatch.setattr(settings, "DEMO_MODE", False)
+        client = FakeEvidenceTable([
+            {"snippet_id": "s1", "stance": "contradict", "nli_conf": 0.8, "claims": {"canonical_hash": "h1"}},
+            {"snippet_id": "s1", "stance": "support", "nli_conf": 0.7, "claims": {"canonical_hash": "other"}},
+        ])
+        stance_cache = StanceCache(client=client, local_size=16)
+
+        first = stance_cache.get_many(self.KEYS)
+        second = stance_cache.get_many([("h1", "s1")])
+
+        assert first == {("h1", "s1"): {"stance": "contradict", "score": 0.8}}
+        assert second == first
+        assert client.queries == 1
+
+    def test_fallback_stances_are_not_cached(self):
+        """Test results from a failed model call are not stored"""
+        class FailingPipeline:
+            def __call__(self, inputs, **kwargs):
+                raise RuntimeError("model crashed")
+
+        stance_cache = StanceCache(local_size=16)
+        service = NLIService(ModelRegistry(loaders={"nli": FailingPipeline}), cache=stance_cache)
+
+        service.get_stance_batch(self.PAIRS, keys=self.KEYS)
+
+        assert stance_cache.get_many(self.KEYS) == {}
+
+
+class TestRedisTier:
+    def test_failures_return_default_and_skip_the_tier(self):
+        """Test a failing Redis call returns the default and later calls skip Redis"""
+        calls = []
+
+        def failing(r):
+            calls.append(r)
+            raise ConnectionError("redis down")
+
+        tier = RedisTier(object(), "Test cache")
+
+        assert tier.call("get", failing, default="fallback") == "fallback"
+        assert tier.call("get", failing, default="fallback") == "fallback"
+        assert len(calls) == 1
+        assert RedisTier(None, "Test cache").call("get", failing) is None
+
+
+class TestFeedCache:
+    def test_pages_are_shared_through_redis(self, fake_redis):
+        """Test a page cached by one process is served to another with the same ETag"""
+        writer, reader = FeedCache(fake_redis, local_size=8), FeedCache(fake_redis, local_size=8)
+
+        body, etag = writer.set(writer.key("Health", 70, 20, None), b'{"items":[]}')
+
+        assert reader.get(reader.key("Health", 70, 20, None)) == (body, etag)
+        assert reader.get(reader.key("Climate", 70, 20, None)) is None
+
+    def test_version_bump_reaches_other_processes(self, monkeypatch, fake_redis):
+        """Test a report write in one process orphans pages cached in another"""
+        monkeypatch.setattr(settings, "FEED_CACHE_VERSION_REFRESH", 0.0)
+        writer, reader = FeedCache(fake_redis, local_size=8), FeedCache(fake_redis, local_size=8)
+        reader.set(reader.key(None, 70, 20, None), b'{"items":[]}')
+
+        writer.bump_version()
+
+        assert reader.get(reader.key(None, 70, 20, None)) is None
+
+    def test_etag_matching(self):
+        """Test If-None-Match lists, weak tags and the wildcard"""
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
+
+
+class TestReportCounters:
+    def test_top_reads_one_page_by_count(self, fake_redis, fake_supabase):
+        """Test increments rank claims and a read returns only the requested page"""
+        fake_supabase.rpcs["report_counts"] = lambda params: []
+        counters = ReportCounters(fake_redis)
+        counters.reconcile(fake_supabase)
+        for claim_id in ["a", "b", "b", "c", "b", "a"]:
+            counters.increment(claim_id)
+
+        assert counters.top(2) == [("b", 3), ("a", 2)]
+        assert counters.top(2, offset=2) == [("c", 1)]
+
+    def test_increment_before_reconcile_still_falls_back(self, fake_redis):
+        """Test a cold Redis does not serve a queue holding only new reports"""
+        counters = ReportCounters(fake_redis)
+        counters.increment("new-claim")
+
+        assert counters.top(10) is None
+        assert ReportCounters().top(10) is None
+
+
+class TestOnnxNLIBackend:
+    LABELS = {0: "CONTRADICTION", 1: "NEUTRAL", 2: "ENTAILMENT"}
+    WORDS = "the a drug vaccine study shows found not no does reduce increase cases patients report data".split()
+
+    @pytest.fixture(scope="class")
+    def tiny_model_dir(self, tmp_path_factory):
+        """A small randomly initialised BERT NLI classifier saved locally"""
+        torch = pytest.importorskip("torch")
+        pytest.importorskip("optimum.onnxruntime")
+        from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+        model_dir = tmp_path_factory.mktemp("tiny_nli")
+        vocab = model_dir / "vocab.txt"
+        vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + self.WORDS))
+        BertTokenizerFast(str(vocab)).save_pretrained(model_dir)
+
+        torch.manual_seed(0)
+        config = BertConfig(
+            vocab_size=len(self.WORDS) + 5,
+            hidden_size=32,
+            num_hidden_layers=2,
+            num_attention_heads=2,
+            intermediate_size=64,
+            initializer_range=0.5,
+            id2label=self.LABELS,
+            label2id={label: i for i, label in self.LABELS.items()},
+        )
+        BertForSequenceClassification(config).save_pretrained(model_dir)
+        return str(model_dir)
+
+    def test_quantized_model_agrees_on_stance_labels(self, tiny_model_dir, tmp_path):
+        """Test the int8 export picks the same stance as the PyTorch pipeline"""
+        from transformers import pipeline
+        from app.services.onnx_nli import export_quantized_nli, load_onnx_nli
+
+        export_quantized_nli(tiny_model_dir, str(tmp_path))
+        onnx_service = NLIService(ModelRegistry(loaders={"nli": lambda: load_onnx_nli(str(tmp_path), tiny_model_dir)}))
+        torch_service = NLIService(ModelRegistry(loaders={
+            "nli": lambda: pipeline("text-classification", model=tiny_model_dir, device=-1),
+        }))
+
+        rng = np.random.default_rng(3)
+        pairs = [
+            (" ".join(rng.choice(self.WORDS, 6)), " ".join(rng.choice(self.WORDS, rng.integers(4, 30))))
+            for _ in range(100)
+        ]
+        expected = [r["stance"] for r in torch_service.get_stance_batch(pairs, batch_size=8)]
+        actual = [r["stance"] for r in onnx_service.get_stance_batch(pairs, batch_size=8)]
+
+        assert len(set(expected)) > 1
+        assert sum(a == b for a, b in zip(expected, actual)) >= 0.9 * len(pairs)
+        assert onnx_service.get_stance(*pairs[0])["stance"] == actual[0]
+
+    def test_missing_export_falls_back_to_transformers(self, monkeypatch, tmp_path):
+        """Test the onnx backend falls back to the transformers pipeline"""
+        monkeypatch.setattr(settings, "NLI_BACKEND", "onnx")
+        monkeypatch.setattr(settings, "NLI_ONNX_DIR", str(tmp_path))
+        monkeypatch.setattr(nli_module, "pipeline", lambda *args, **kwargs: FakeNLIPipeline())
+
+        assert isinstance(NLIService().model, FakeNLIPipeline)
+
+        (tmp_path / "export.json").write_text('{"model": "some/other-model"}')
+        assert isinstance(NLIService().model, FakeNLIPipeline)
@@ -0,0 +1,228 @@
+import json
+import os
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.core.model_registry import ModelRegistry
+from app.services.dense_index import DenseIndex
+from app.services.ingestion import Checkpoint, IngestionWriter, bulk_ingest, read_articles, split_sentences
+from app.services.near_duplicates import NearDuplicateIndex
+from app.services.report_counters import ReportCounters
+from app.workers import tasks
+from app.workers.celery_app import celery_app
+
+
+class FakeEncoder:
+    def encode(self, texts, **kwargs):
+        rng = np.random.default_rng(len(texts))
+        return rng.standard_normal((len(texts), 8)).astype(np.float32)
+
+
+def _item(url, source="Reuters", domain="reuters.com"):
+    return {
+        "source_name": source,
+        "source_domain": domain,
+        "url": url,
+        "title": "Health officials report results",
+        "body_text": "The study shows 94.7% accuracy in trials. Researchers found fewer side effects than expected.",
+        "published_at": None,
+        "raw_json": {},
+    }
+
+
+class TestSentenceSplitting:
+    def test_split_sentences_keeps_decimals(self):
+        """Test splitting on sentence ends without breaking numbers"""
+        text = "The study shows 94.7% accuracy in trials. Short one. Researchers found fewer side effects!"
+
+        assert list(split_sentences(text)) == [
+            "The study shows 94.7% accuracy in trials.",
+            "Researchers found fewer side effects!",
+        ]
+
+
+class TestIngestionPipeline:
+    @pytest.fixture
+    def pipeline(self, fake_supabase, monkeypatch, tmp_path):
+        monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+        monkeypatch.setattr(settings, "DENSE_INDEX_DIR", str(tmp_path))
+        monkeypatch.setattr(tasks.db, "get_service_client", lambda: fake_supabase)
+        monkeypatch.setattr(tasks, "_registry", ModelRegistry(loaders={"embedding": FakeEncoder}))
+
+        pages = {
+            ("newsapi", 1): [_item("https://reuters.com/a"), _item("https://reuters.com/b")],
+            ("newsapi", 2): [_item("https://reuters.com/b"), _item("https://ap.org/c", "AP", "ap.org")],
+        }
+
+        async def fetch_recent(connector_name, window_days, page):
+            return pages.get((connector_name, page), [])
+
+        monkeypatch.setattr(tasks, "_fetch_recent", fetch_recent)
+        return fake_supabase
+
+    def test_end_to_end_in_eager_mode(self, pipeline, tmp_path):
+        """Test fetch, dedupe, snippet storage, embedding and indexing"""
+        tasks.ingest_recent.delay(window_days=1, max_pages=2)
+
+        assert len(pipeline.tables["raw_items"]) == 3
+        assert len(pipeline.tables["sources"]) == 2
+        snippets = pipeline.tables["snippets"]
+        assert len(snippets) == 9
+        assert len(pipeline.tables["embeddings"]) == 9
+        assert len(DenseIndex.load(str(tmp_path))) == 9
+
+    def test_replay_is_idempotent(self, pipeline, tmp_path):
+        """Test re-running ingestion writes no duplicates"""
+        tasks.ingest_recent.delay(window_days=1, max_pages=2)
+        tasks.ingest_recent.delay(window_days=1, max_pages=2)
+        tasks.embed_snippets.delay([row["id"] for row in pipeline.tables["snippets"]])
+
+        assert len(pipeline.tables["raw_items"]) == 3
+        assert len(pipeline.tables["snippets"]) == 9
+        assert len(DenseIndex.load(str(tmp_path))) == 9
+
+    def test_retry_after_failed_upsert_does_not_duplicate_vectors(self, pipeline, tmp_path, monkeypatch):
+        """Test re-running embed_snippets after the embeddings upsert failed"""
+        tasks.ingest_recent.delay(window_days=1, max_pages=2)
+        snippet_ids = [row["id"] for row in pipeline.tables["snippets"]]
+        pipeline.tables["embeddings"] = []
+        for name in os.listdir(tmp_path):
+            os.remove(tmp_path / name)
+        table = pipeline.table
+
+        def failing_upsert(*args, **kwargs):
+            raise ConnectionError("embeddings upsert failed")
+
+        def table_without_embedding_writes(name):
+            query = table(name)
+            if name == "embeddings":
+                query.upsert = failing_upsert
+            return query
+
+        monkeypatch.setattr(pipeline, "table", table_without_embedding_writes)
+        with pytest.raises(ConnectionError):
+            tasks.embed_snippets(snippet_ids)
+        assert len(DenseIndex.load(str(tmp_path))) == 9
+
+        monkeypatch.setattr(pipeline, "table", table)
+        assert tasks.embed_snippets(snippet_ids) == 9
+
+        index = DenseIndex.load(str(tmp_path))
+        assert len(index) == 9
+        assert {row["vector_path"] for row in pipeline.tables["embeddings"]} == {
+            index.vector_path(position) for position in range(9)
+        }
+
+    def test_writer_batches_writes(self, fake_supabase):
+        """Test rows are written in batches rather than one call per row"""
+        writer = IngestionWriter(client=fake_supabase, batch_size=500)
+
+        writer.write_items([_item(f"https://reuters.com/{i}") for i in range(50)])
+
+        snippet_writes = [n for table, n in fake_supabase.writes if table == "snippets"]
+        assert snippet_writes == [150]
+
+
+class TestBulkIngestion:
+    def _write_jsonl(self, path, count):
+        with open(path, "w") as f:
+            for i in range(count):
+                f.write(json.dumps({
+                    "url": f"https://www.reuters.com/{i}",
+                    "title": f"Article {i} about vaccine trials",
+                    "body_text": "Researchers found fewer side effects than expected in the trial.",
+                }) + "\n")
+            f.write("not json\n")
+
+    def test_reads_csv_and_jsonl(self, tmp_path):
+        """Test both input formats normalise to connector items"""
+        jsonl_path = tmp_path / "articles.jsonl"
+        self._write_jsonl(jsonl_path, 2)
+        csv_path = tmp_path / "articles.csv"
+        csv_path.write_text(
+            "url,title,body_text,source_name,trust_score\n"
+            "https://ap.org/x,Headline,\"Body, with comma.\",AP,0.9\n"
+        )
+
+        jsonl_items = list(read_articles(str(jsonl_path)))
+        csv_items = list(read_articles(str(csv_path)))
+
+        assert jsonl_items[0]["source_domain"] == "reuters.com"
+        assert jsonl_items[-1] is None
+        assert csv_items[0]["source_name"] == "AP"
+        assert csv_items[0]["trust_score"] == 0.9
+        assert csv_items[0]["body_text"] == "Body, with comma."
+
+    def test_batches_and_resumes_from_checkpoint(self, fake_supabase, tmp_path):
+        """Test batched writes and that a resumed run skips finished records"""
+        input_path = tmp_path / "articles.jsonl"
+        self._write_jsonl(input_path, 25)
+        checkpoint = Checkpoint(str(tmp_path / "ckpt"), str(input_path))
+        writer = IngestionWriter(client=fake_supabase)
+
+        stats = bulk_ingest(read_articles(str(input_path)), writer, batch_size=10, checkpoint=checkpoint)
+
+        assert stats["articles"] == 25
+        assert stats["skipped"] == 1
+        assert len(fake_supabase.tables["raw_items"]) == 25
+        assert [n for table, n in fake_supabase.writes if table == "raw_items"] == [10, 10, 5]
+        assert checkpoint.load() == 26
+
+        fake_supabase.writes.clear()
+        resumed = bulk_ingest(read_articles(str(input_path)), writer, batch_size=10, checkpoint=checkpoint)
+
+        assert resumed["articles"] == 0
+        assert fake_supabase.writes == []
+
+
+class TestNearDuplicateIndexing:
+    def test_new_reports_reach_the_index(self, fake_supabase, monkeypatch, tmp_path):
+        """Test scheduled runs index reported claims once and resume from the watermark"""
+        monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+        monkeypatch.setattr(settings, "NEAR_DUP_INDEX_DIR", str(tmp_path))
+        monkeypatch.setattr(tasks.db, "get_service_client", lambda: fake_supabase)
+        fake_supabase.tables["claims"] = [
+            {"id": "c1", "claim_text": "the vaccine causes autism in children"},
+            {"id": "c2", "claim_text": "unemployment fell to 3.5 percent last quarter"},
+            {"id": "c3", "claim_text": "global emissions increased by 12% in 2023"},
+        ]
+        fake_supabase.tables["claim_reports"] = [
+            {"id": "r1", "claim_id": "c1", "created_at": "2026-01-01T00:00:00+00:00"},
+            {"id": "r2", "claim_id": "c2", "created_at": "2026-01-01T00:00:00+00:00"},
+            {"id": "r3", "claim_id": "c1", "created_at": "2026-01-02T00:00:00+00:00"},
+        ]
+
+        first = tasks.index_new_reports(page_size=1)
+        fake_supabase.tables["claim_reports"].append(
+            {"id": "r4", "claim_id": "c3", "created_at": "2026-01-02T00:00:00+00:00"}
+        )
+        second = tasks.index_new_reports(page_size=10)
+
+        index = NearDuplicateIndex.load(str(tmp_path))
+        assert set(index.claim_ids) == {"c1", "c2", "c3"}
+        assert (first, second) == (3, 1)
+        assert index.query("Autism in children is caused by the vaccine")[0] == "c1"
+
+
+class TestReportCountReconciliation:
+    def test_rebuilds_counters_from_reports_table(self, fake_supabase, fake_redis, monkeypatch):
+        """Test reconciliation pages through report counts and replaces drifted counters"""
+        reports = ["a"] * 4 + ["b"] * 2 + ["c"] * 5
+
+        def report_counts(params):
+            counts = {}
+            for claim_id in reports:
+                if params["after_claim_id"] is None or claim_id > params["after_claim_id"]:
+                    counts[claim_id] = counts.get(claim_id, 0) + 1
+            return [{"claim_id": k, "report_count": v} for k, v in sorted(counts.items())][:params["page_size"]]
+
+        fake_supabase.rpcs["report_counts"] = report_counts
+        counters = ReportCounters(fake_redis)
+        counters.RECONCILE_PAGE_SIZE = 2
+        for claim_id in ["a", "deleted", "deleted"]:
+            counters.increment(claim_id)
+        monkeypatch.setattr(tasks.db, "get_service_client", lambda: fake_supabase)
+        monkeypatch.setattr(tasks, "get_report_counters", lambda: counters)
+
+        assert tasks.reconcile_report_counts() == 3
+        assert counters.top(10) == [("c", 5), ("a", 4), ("b", 2)]